@@ -1,38 +1,75 @@
-from tkinter import Tk, messagebox, simpledialog
-from urllib.request import urlopen
-import io, math, subprocess, sys
-try:
-    import pygame as pg
-except:
-    subprocess.call([sys.executable, "-m", "pip", "install", "pygame",
-                    "--break-system-packages"])
-    import pygame as pg
+from __future__ import annotations
+import io, math, os, sys
+
+pg = None  # pygame, imported by _pygame() on first use (see init_canvas)
 
 Point = tuple[float, float]
 Color = tuple[float, float, float]
 
-_tkmain = Tk()
-_tkmain.withdraw()  # hide the main window
-_ws, _hs = _tkmain.winfo_screenwidth(), _tkmain.winfo_screenheight()
-_tkmain.geometry(f"+{_ws // 2}+{_hs // 2}")
-
+_tkmain = None
 _canvas, _display, _tick = None, None, None
+_headless = False
+_area = None
 _size, _stroke = (640, 480), 0
 _color, _background = (127, 127, 127), (255, 255, 255)
 _mouse_pos, _mouse_down = (0, 0), 0
 _curr_keys, _prev_keys = set(), set()
 _loaded = {}
+_skipped_frames = 0
+_alerts = []
 
 def _tup(t: tuple, vmin=-math.inf, vmax=math.inf) -> tuple:
     return tuple(min(max(round(v), vmin), vmax) for v in t)
 
-def init_canvas(size: Point, scale=1):
-    """Set size of first CANVAS and return it"""
-    global _canvas, _display, _draw, _size
-    pg.init()
+def _pygame():
+    """pygame, imported on first use only: importing g2d costs nothing
+    for tools and tests that never draw"""
+    global pg
+    if pg is None:
+        os.environ.setdefault("PYGAME_HIDE_SUPPORT_PROMPT", "1")
+        try:
+            import pygame
+        except ImportError:
+            import subprocess  # same as before the lazy import: install pygame and retry
+            subprocess.call([sys.executable, "-m", "pip", "install", "pygame",
+                            "--break-system-packages"])
+            import pygame
+        pg = pygame
+    return pg
+
+def _urlopen(url: str):
+    from urllib.request import urlopen
+    return urlopen(url)
+
+def _tk():
+    """Tk root for dialogs, created (and tkinter imported) on first use only,
+    so the headless backend works on systems without tkinter"""
+    global _tkmain
+    if _tkmain is None:
+        from tkinter import Tk
+        _tkmain = Tk()
+        _tkmain.withdraw()  # hide the main window
+        _ws, _hs = _tkmain.winfo_screenwidth(), _tkmain.winfo_screenheight()
+        _tkmain.geometry(f"+{_ws // 2}+{_hs // 2}")
+    return _tkmain
+
+def init_canvas(size: Point, scale=1, backend: str=None):
+    """Set size of first CANVAS and return it.
+    backend is "window" (default) or "headless"; the G2D_BACKEND
+    environment variable, if set, takes precedence.
+    The headless backend draws on a plain Surface, with no window and no Tk"""
+    global _canvas, _display, _draw, _size, _headless
+    backend = os.environ.get("G2D_BACKEND") or backend or "window"
+    _headless = backend == "headless"
+    if _headless:
+        os.environ["SDL_VIDEODRIVER"] = "dummy"
+    _pygame().init()
     _size = _tup(size)
     w, h = _size
-    _display = pg.display.set_mode((w * scale, h * scale))
+    if _headless:
+        _display = pg.Surface((w * scale, h * scale), pg.SRCALPHA)
+    else:
+        _display = pg.display.set_mode((w * scale, h * scale))
     _canvas = pg.Surface(_size, pg.SRCALPHA) if scale != 1 else _display
     _draw = pg.Surface(_size, pg.SRCALPHA)
     clear_canvas()
@@ -57,33 +94,58 @@ def update_canvas() -> None:
     if _canvas is not _display:
         scaled = pg.transform.scale(_canvas, _display.get_size())
         _display.blit(scaled, (0, 0))
-    pg.display.update()
+    if not _headless:
+        pg.display.update()
     pg.time.wait(0)
 
-def drawing_surface() -> pg.Surface:
+def frame_buffer() -> memoryview:
+    """Copy of the canvas pixels, as an (height, width, 3) RGB buffer.
+    It is NumPy-compatible: numpy.asarray(frame_buffer())"""
+    w, h = _canvas.get_size()
+    return memoryview(pg.image.tobytes(_canvas, "RGB")).cast("B", (h, w, 3))
+
+def save_frame(path: str) -> None:
+    pg.image.save(_canvas, path)
+
+def _bounds(points: list[Point], pad: int=0) -> pg.Rect:
+    xs, ys = [p[0] for p in points], [p[1] for p in points]
+    x0, y0 = _tup((min(xs), min(ys)))
+    x1, y1 = _tup((max(xs), max(ys)))
+    return pg.Rect(x0 - pad, y0 - pad, x1 - x0 + 2 * pad + 1, y1 - y0 + 2 * pad + 1)
+
+def drawing_surface(area: pg.Rect=None) -> pg.Surface:
+    """Surface to draw on with the current color.
+    Translucent colors are drawn on a scratch surface, clipped to area
+    (the bounding box of the primitive), then blended on the canvas"""
+    global _area
     if len(_color) > 3 and _color[3] != 255:
-        _draw.fill((0, 0, 0, 0))
+        full = _draw.get_rect()
+        _area = full if area is None else area.clip(full)
+        _draw.set_clip(_area)
+        _draw.fill((0, 0, 0, 0), _area)
         return _draw
     return _canvas
 
 def blit_drawing_surface():
-    if len(_color) > 3 and _color[3] != 255:
-        _canvas.blit(_draw, (0, 0))
+    if len(_color) > 3 and _color[3] != 255 and _area:
+        _canvas.blit(_draw, _area.topleft, area=_area)
 
 def draw_line(pt1: Point, pt2: Point, width: float=1) -> None:
-    surf = drawing_surface()
-    pg.draw.line(surf, _color, _tup(pt1), _tup(pt2), width=max(int(width), _stroke, 1))
+    width = max(int(width), _stroke, 1)
+    surf = drawing_surface(_bounds([pt1, pt2], width))
+    pg.draw.line(surf, _color, _tup(pt1), _tup(pt2), width=width)
     blit_drawing_surface()
 
 def draw_circle(center: Point, radius: float) -> None:
-    surf = drawing_surface()
-    pg.draw.circle(surf, _color, _tup(center), int(radius), width=_stroke)
+    (x, y), r = _tup(center), int(radius)
+    surf = drawing_surface(pg.Rect(x - r - 1, y - r - 1, 2 * r + 3, 2 * r + 3))
+    pg.draw.circle(surf, _color, (x, y), r, width=_stroke)
     blit_drawing_surface()
 
 def draw_rect(pos: Point, size: Point) -> None:
-    surf = drawing_surface()
     rect = pg.Rect(*_tup(pos + size))
     rect.normalize()
+    surf = drawing_surface(rect)
     pg.draw.rect(surf, _color, rect, width=_stroke)
     blit_drawing_surface()
 
@@ -98,18 +160,19 @@ def draw_text(text: str, center: Point, size: int) -> None:
     _canvas.blit(surface, (x - w//2, y - h//2))
 
 def draw_polygon(points: list[Point]) -> None:
-    surf = drawing_surface()
+    surf = drawing_surface(_bounds(points, _stroke + 1))
     pg.draw.polygon(surf, _color, [_tup(p) for p in points], width=_stroke)
     blit_drawing_surface()
 
 def load_image(src: str) -> str:
     gh = "https://fondinfo.github.io/sprites/"
     if src not in _loaded:
+        _pygame()
         try:
             _loaded[src] = pg.image.load(src)
         except:
             url = src if src.startswith("http") else gh + src
-            image = io.BytesIO(urlopen(url).read())
+            image = io.BytesIO(_urlopen(url).read())
             _loaded[src] = pg.image.load(image)
     return src
 
@@ -122,10 +185,11 @@ def draw_image(src: str, pos: Point,
 
 def load_audio(src: str) -> str:
     if src not in _loaded:
+        _pygame()
         try:
             _loaded[src] = pg.mixer.Sound(src)
         except:
-            audio = io.BytesIO(urlopen(src).read())
+            audio = io.BytesIO(_urlopen(src).read())
             _loaded[src] = pg.mixer.Sound(audio)
     return src
 
@@ -138,17 +202,31 @@ def pause_audio(src: str) -> None:
 def alert(message: str) -> None:
     if _canvas:
         update_canvas()
-    messagebox.showinfo("", message)
+    if _headless:
+        _alerts.append(message)
+        return
+    from tkinter import messagebox
+    messagebox.showinfo("", message, parent=_tk())
+
+def alerts() -> list[str]:
+    """Messages passed to alert() in headless mode, oldest first"""
+    return list(_alerts)
 
 def confirm(message: str) -> bool:
     if _canvas:
         update_canvas()
-    return messagebox.askokcancel("", message)
+    if _headless:
+        return True
+    from tkinter import messagebox
+    return messagebox.askokcancel("", message, parent=_tk())
 
 def prompt(message: str) -> str:
     if _canvas:
         update_canvas()
-    return simpledialog.askstring("", message) or ""
+    if _headless:
+        return ""
+    from tkinter import simpledialog
+    return simpledialog.askstring("", message, parent=_tk()) or ""
 
 def mouse_pos() -> Point:
     return _mouse_pos
@@ -185,14 +263,36 @@ def key_pressed(key: str) -> bool:
 def key_released(key: str) -> bool:
     return key in _prev_keys and key not in _curr_keys
 
-def main_loop(tick=None, fps: int=30) -> None:
+def skipped_frames() -> int:
+    """Frames not rendered by main_loop while idle (see busy)"""
+    return _skipped_frames
+
+def _wait_events(fps: int, idle_wait: int) -> list:
+    global _skipped_frames
+    start = pg.time.get_ticks()
+    e = pg.event.wait(idle_wait)
+    waited = pg.time.get_ticks() - start
+    _skipped_frames += waited * fps // 1000 if fps else 1
+    return [] if e.type == pg.NOEVENT else [e] + pg.event.get()
+
+def main_loop(tick=None, fps: int=30, busy=None, idle_wait: int=250) -> None:
+    """Call tick and update the canvas at fps frames per second
+    (fps can also be a function, read again at every frame).
+    If busy is given and returns False, block until an event arrives
+    (or idle_wait ms pass) instead of ticking at a fixed rate."""
     global _mouse_pos, _tick
     _tick = tick
     clock = pg.time.Clock()
     update_canvas()
     running = True
     while running:
-        for e in pg.event.get():
+        events = pg.event.get()
+        rate = fps() if callable(fps) else fps
+        if not events and busy and not busy():
+            events = _wait_events(rate, idle_wait)
+            if not events:
+                continue
+        for e in events:
             if e.type == pg.QUIT:
                 running = False
                 break
@@ -208,9 +308,10 @@ def main_loop(tick=None, fps: int=30) -> None:
             _mouse_pos = pg.mouse.get_pos()
             _tick()
             update_canvas()
-        clock.tick(fps)
+        clock.tick(rate)
     close_canvas()
 
 def close_canvas() -> None:
-    pg.quit()
+    if pg is not None:
+        pg.quit()
     sys.exit()
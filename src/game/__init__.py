@@ -1,5 +1,31 @@
-from .core import *
+import importlib
+
 from .state import *
-from .board_game import *
-from .board_game_gui import *
-from .gui import *
\ No newline at end of file
+
+# -> import pigro (PEP 562): i nomi di core, gui e della GUI di gioco vengono caricati al primo accesso,
+#    così "import src.game.core.level" non si porta dietro pygame, Tkinter e il resto dell'interfaccia
+_LAZY = {
+    "BoardGame": ".board_game", "abstract": ".board_game", "print_game": ".board_game", "console_play": ".board_game",
+    "BoardGameGui": ".board_game_gui", "init_canvas": ".board_game_gui", "close_canvas": ".board_game_gui",
+    "clear_canvas": ".board_game_gui", "gui_get_current_keys": ".board_game_gui",
+    "gui_get_released_keys": ".board_game_gui", "gui_get_mouse_pos": ".board_game_gui",
+    "gui_get_previous_keys": ".board_game_gui",
+    "GUIComponent": ".gui", "Bar": ".gui", "Button": ".gui", "Text": ".gui", "Color": ".gui", "Board": ".gui",
+    "Viewport": ".gui",
+} | {name: ".core" for name in ("Game", "GENERATOR_VERSION", "GENERATOR_VERSIONS", "Level", "show_levels",
+                                "DEFAULT", "read_settings", "read_pack", "write_pack", "read_ratings", "write_ratings",
+                                "Settings", "get_settings", "App", "main", "MenuManager", "MenuWindow", "FrameGovernor")}
+
+__all__ = ["Action", "AppPhase", "CellState", "MenuPhase"] + list(_LAZY)
+
+
+def __getattr__(name: str):
+    if name not in _LAZY:
+        raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
+    value = getattr(importlib.import_module(_LAZY[name], __name__), name)
+    globals()[name] = value
+    return value
+
+
+def __dir__() -> list[str]:
+    return sorted(set(globals()) | set(_LAZY))
\ No newline at end of file
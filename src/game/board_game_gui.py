@@ -7,7 +7,7 @@ from typing import Any
 from .state import Action
 
 # GUI
-from .gui import Board, GUIComponent, Text, Bar
+from .gui import Board, GUIComponent, Text, Bar, Viewport
 
 # G2D
 from src.g2d_lib import g2d
@@ -16,23 +16,31 @@ from src.g2d_lib import g2d
 from .board_game import BoardGame
 
 # CORE
-from .core.file_management import read_settings
-
-
-settings = read_settings()
-SIZE = settings.get("size", 430)
+from .core.settings import get_settings
+from .core.startup_profile import span
 
 
 def init_canvas(
     tick: Callable[[], None],
     size: tuple[int, int] | None = None,
     scale: float = 1,
-    fps: int = 30
+    fps: int | Callable[[], int] = 30,
+    busy: Callable[[], bool] | None = None,
+    idle_wait: int = 250,
+    backend: str | None = None
 ) -> None:
-    """Inizializza il canvas e avvia il loop principale."""
-    g2d.init_canvas(size=size, scale=scale)
-    g2d.clear_canvas((0, 0, 0))
-    g2d.main_loop(tick=tick, fps=fps)
+    """
+        Inizializza il canvas e avvia il loop principale.
+
+        Se busy è passato il loop è "event-driven": quando busy() è False non esegue tick
+        e aspetta un evento (o idle_wait ms), invece di girare sempre a fps fissi.
+        backend sceglie il backend di g2d ("window" o "headless", senza finestra).
+        fps può essere anche una funzione (frame rate adattivo, vedi FrameGovernor).
+    """
+    with span("canvas"):
+        g2d.init_canvas(size=size, scale=scale, backend=backend)
+        g2d.clear_canvas((0, 0, 0))
+    g2d.main_loop(tick=tick, fps=fps, busy=busy, idle_wait=idle_wait)
 def close_canvas() -> None:
     g2d.close_canvas()
 def gui_get_current_keys():
@@ -53,13 +61,24 @@ class BoardGameGui:
     def __init__(
         self,
         game: BoardGame,
-        actions: dict[str, Any] | None = None
+        actions: dict[str, Any] | None = None,
+        allow_deferred: Callable[[str], bool] | None = None
     ):
-        global settings
-        clear_canvas(tuple(settings.get("board_game_gui", {}).get("background_color", [0,0,0]))) # type: ignore
+        """
+            GUI di gioco: board + barra di stato.
+
+            allow_deferred (opzionale) decide quando eseguire il lavoro non urgente
+            (ricalcolo di stato e indicatore): se ritorna False viene rimandato a un frame successivo.
+        """
+        clear_canvas(get_settings().board_game_gui.background_color) # type: ignore
 
         self.game = game
         self.actions = actions or {"LeftButton": ""}
+        self.allow_deferred = allow_deferred
+
+        self._gui_stats: Bar | None = None
+        self._stats_version: int | None = None
+        self._drawn_items = 0
 
     def tick(self) -> None:
         """
@@ -83,8 +102,27 @@ class BoardGameGui:
             if hasattr(component, "tick"):
                 component.tick(keys=keys, cursor_pos=pos)
 
+        self.update_stats()
         self.render_guis(clear_canvas_=False)
 
+    def update_stats(self) -> None:
+        """
+            Aggiorna testo e progresso della barra di stato, solo se il game è cambiato.
+
+            Usa game.version quando disponibile; un BoardGame senza version viene aggiornato a ogni frame.
+            Se la barra esiste già, l'aggiornamento può essere rimandato da allow_deferred.
+        """
+        version = getattr(self.game, "version", None)
+        if version is not None and version == self._stats_version:
+            return
+        if self._gui_stats is not None and self.allow_deferred is not None and not self.allow_deferred("stats"):
+            return
+
+        progress = self.game.progress()
+        self.gui_stats.text = self.game.status()
+        self.gui_stats.value = progress if progress is not None else 0
+        self._stats_version = version
+
     # ======== RENDERING ========
     def _render_item(self, item: dict[str, Any]) -> None:
         """Prende un singolo oggetto di render (un dizionario) e lo traduce in chiamate g2d."""
@@ -112,44 +150,62 @@ class BoardGameGui:
         if clear_canvas_:
             g2d.clear_canvas((0, 0, 0))
 
+        drawn = 0
         for gui_component in self.gui:
             info = gui_component.render_info()  # type: ignore
             for item in info:
                 self._render_item(item)
+            drawn += len(info)
+        self._drawn_items = drawn
+
+    @property
+    def idle(self) -> bool:
+        """True se l'ultimo render non ha disegnato niente (nessuna animazione o modifica in corso)."""
+        return self._drawn_items == 0
 
     # ======== PROPERTIES ========
     @property
     def gui_board(self) -> Board:
         """Crea (solo la prima volta) e ritorna la Board principale. È inizializzata in modo "lazy".
-        La board rappresenta l'intero campo di gioco effettivo."""
-        global settings, SIZE
-
+        La board rappresenta il campo di gioco: se è più grande di max_visible celle per lato
+        ne mostra solo una finestra (Viewport), da spostare con le frecce e zoomare con + e -."""
         if not hasattr(self, f"_{self.__class__.__name__}__gui_board"):
+            settings = get_settings()
+            gui_settings = settings.board_game_gui
+            max_visible = gui_settings.board.max_visible
+
             self.__gui_board = Board(
                 master=self.game,
                 x=0, y=0,
-                width=SIZE, height=SIZE*settings.get("board_game_gui", {}).get("board", {}).get("height%", 0.95),
-                padding=settings.get("board_game_gui", {}).get("board", {}).get("padding", 2),
+                width=settings.size, height=settings.size*gui_settings.board.height_ratio,
+                padding=gui_settings.board.padding,
+                allow_deferred=self.allow_deferred,
+                viewport=Viewport(self.game.cols(), self.game.rows(), visible_columns=max_visible, visible_rows=max_visible),
+                background_color=gui_settings.background_color
             )
         return self.__gui_board
     @property
     def gui_stats(self) -> Bar:
-        """Crea e ritorna la barra in basso con stato e progresso."""
-        global settings, SIZE
-        board_settings = settings.get("board_game_gui", {}).get("board", {})
-        stats_settings = settings.get("board_game_gui", {}).get("stats", {})
-
-        board_height = SIZE*board_settings.get("height%", 0.95)
-        background_color = tuple(settings.get("board_game_gui", {}).get("background_color", (0,0,0)))
-
-        return Bar(
-                   name_id="gui_stats",
-                   x=0, y=board_height, width=SIZE, height=SIZE-board_height,
-                   text=self.game.status(), text_size=stats_settings.get("text_size", 30), text_color=tuple(stats_settings.get("text_color", [248, 248, 248])), # type: ignore
-                   background_color=background_color, bar_color=tuple(stats_settings.get("progress_bar_color", (48,96,48))), # type: ignore
-                   max_value=1, value=lambda game=self.game: game.progress() if game.progress() is not None else 0,
-                   padding=stats_settings.get("progress_padding", 2), fixed=True
-        )
+        """Crea (solo la prima volta) e ritorna la barra in basso con stato e progresso.
+        Testo e valore vengono aggiornati da update_stats() quando il game cambia."""
+        if self._gui_stats is None:
+            settings = get_settings()
+            gui_settings = settings.board_game_gui
+            stats_settings = gui_settings.stats
+
+            size = settings.size
+            board_height = size*gui_settings.board.height_ratio
+
+            self._gui_stats = Bar(
+                       name_id="gui_stats",
+                       x=0, y=board_height, width=size, height=size-board_height,
+                       text="", text_size=stats_settings.text_size, text_color=stats_settings.text_color, # type: ignore
+                       background_color=gui_settings.background_color, bar_color=stats_settings.progress_bar_color, # type: ignore
+                       max_value=1, value=0,
+                       padding=stats_settings.progress_padding, fixed=True
+            )
+            self.update_stats()
+        return self._gui_stats
     @property
     def gui(self) -> list[GUIComponent]:
         return [self.gui_board, self.gui_stats]
@@ -163,6 +219,15 @@ class BoardGameGui:
             raise TypeError("game must be a BoardGame instance")
         self.__game = new
 
+    @property
+    def allow_deferred(self) -> Callable[[str], bool] | None:
+        return self.__allow_deferred
+    @allow_deferred.setter
+    def allow_deferred(self, value: Callable[[str], bool] | None) -> None:
+        if value is not None and not callable(value):
+            raise TypeError("allow_deferred must be a callable or None")
+        self.__allow_deferred = value
+
     @property
     def actions(self) -> dict[str, Action | str]:
         return self.__actions
@@ -0,0 +1,288 @@
+from __future__ import annotations
+
+from collections.abc import Callable
+from typing import Any
+import argparse
+
+# STATE
+from .state import Action, CellState
+
+# GAME
+from .board_game import BoardGame
+
+# GUI
+from .gui.viewport import Viewport
+
+
+# -> un carattere per stato, come nei file di livello (T albero, ^ tenda)
+GLYPHS = {str(CellState.EMPTY): ".", str(CellState.TREE): "T", str(CellState.TENT): "^", str(CellState.GRASS): ","}
+
+# -> nomi dei tasti come li ritorna curses getkey()
+MOVES = {
+    "KEY_LEFT": (-1, 0), "KEY_RIGHT": (1, 0), "KEY_UP": (0, -1), "KEY_DOWN": (0, 1),
+    "h": (-1, 0), "l": (1, 0), "k": (0, -1), "j": (0, 1),
+}
+PAGES = {"KEY_PPAGE": -1, "KEY_NPAGE": 1}
+CLICK_KEYS = {" ", "\n", "KEY_ENTER"}
+QUIT_KEYS = {"q", "\x1b"}
+ACTIONS = {"g": Action.PLACE_GRASS, "t": Action.PLACE_TENT, "s": Action.PLACE_SOLUTION, "a": Action.PLACE_HINT}
+
+HELP = "arrows/hjkl move  space click  t tents  g grass  a hint  s solution  q quit"
+FOOTER_LINES = 2
+
+
+class BoardGameTui:
+    """
+    Interfaccia da terminale (curses) per un BoardGame, pensata per board grandi e connessioni lente:
+    - legge con game.read() solo le celle visibili, e solo quando cambiano game.version o la finestra
+    - ricorda cosa ha già scritto in ogni posizione dello schermo e manda a curses solo le celle cambiate
+    - non ha un loop a frame fissi: ridisegna solo dopo un tasto (getkey bloccante)
+
+    Il cursore si muove con le frecce (o hjkl); la finestra visibile lo segue sulle board più grandi del terminale.
+    I tasti delle azioni sono gli stessi della GUI (t, g, a, s); spazio/invio è il click sulla cella.
+    screen è qualunque oggetto con addstr, getmaxyx, getkey, erase e refresh (la finestra curses, o un finto nei test).
+    """
+
+    def __init__(self,
+                 game: BoardGame,
+                 screen: Any = None,
+                 actions: dict[str, Action] | None = None,
+                 attrs: dict[str, int] | None = None,
+                 cursor_attr: int = 0) -> None:
+        self.game = game
+        self.screen = screen
+        self.actions = ACTIONS if actions is None else actions
+        self.attrs = attrs or {}
+        self.cursor_attr = cursor_attr
+
+        self.cursor = (0, 0)
+        self.viewport = Viewport(game.cols(), game.rows(), min_visible=1)
+        self.cell_width = 2
+        self.label_width = 0
+        self.errors: tuple[type[BaseException], ...] = ()
+
+        self.emitted = 0                                           # -> celle scritte su schermo in tutto
+        self._drawn: dict[tuple[int, int], tuple[str, int]] = {}   # -> (riga, colonna) schermo -> (testo, attr)
+        self._cells: list[list[str]] = []
+        self._cells_key: tuple | None = None
+        self._size: tuple[int, int] | None = None
+
+    # ======== INPUT ========
+    def handle_key(self, key: str) -> bool:
+        """Applica un tasto. Ritorna False se il tasto chiede di uscire."""
+        x, y = self.cursor
+        if key in QUIT_KEYS:
+            return False
+        if key in MOVES:
+            dx, dy = MOVES[key]
+            self.move_cursor(x + dx, y + dy)
+        elif key in PAGES:
+            self.move_cursor(x, y + PAGES[key] * self.viewport.visible_rows)
+        elif key in CLICK_KEYS:
+            self.game.play(x, y, None)
+        elif key in self.actions:
+            self.game.play(x, y, self.actions[key])
+        elif key == "KEY_RESIZE":
+            self.resize()
+        return True
+
+    def move_cursor(self, x: int, y: int) -> None:
+        """Sposta il cursore (dentro la board) e la finestra visibile, se il cursore ne esce."""
+        x = max(0, min(x, self.game.cols() - 1))
+        y = max(0, min(y, self.game.rows() - 1))
+        self.cursor = (x, y)
+
+        viewport = self.viewport
+        if x < viewport.first_column:
+            viewport.first_column = x
+        elif x >= viewport.first_column + viewport.visible_columns:
+            viewport.first_column = x - viewport.visible_columns + 1
+        if y < viewport.first_row:
+            viewport.first_row = y
+        elif y >= viewport.first_row + viewport.visible_rows:
+            viewport.first_row = y - viewport.visible_rows + 1
+
+    # ======== LAYOUT ========
+    def resize(self) -> None:
+        """Adatta finestra visibile e larghezze alla dimensione del terminale e forza un ridisegno completo."""
+        height, width = self.screen.getmaxyx()
+        self._size = height, width
+
+        columns_targets = getattr(self.game, "columns_targets", None) or []
+        rows_targets = getattr(self.game, "rows_targets", None) or []
+        # -> una colonna di spazio tra le celle; i target a più cifre allargano celle ed etichette
+        self.cell_width = max(2, len(str(max(columns_targets, default=0))) + 1)
+        self.label_width = len(str(max(rows_targets, default=0))) + 1 if rows_targets else 0
+
+        header = 1 if columns_targets else 0
+        self.viewport.visible_columns = max(1, (width - self.label_width) // self.cell_width)
+        self.viewport.visible_rows = max(1, height - header - FOOTER_LINES)
+        self.move_cursor(*self.cursor)
+
+        self._drawn.clear()
+        self._cells_key = None
+        self.screen.erase()
+
+    # ======== RENDERING ========
+    def render(self) -> int:
+        """
+            Aggiorna lo schermo: target, celle visibili, stato e aiuto.
+            Scrive solo le posizioni il cui contenuto è cambiato dall'ultima volta. Ritorna quante sono.
+        """
+        if self._size is None:
+            self.resize()
+        emitted = self.emitted
+
+        game, viewport = self.game, self.viewport
+        first_column, first_row, visible_columns, visible_rows = viewport.layout
+        columns_targets = getattr(game, "columns_targets", None) or []
+        rows_targets = getattr(game, "rows_targets", None) or []
+        top = 1 if columns_targets else 0
+
+        # -> glifi letti dal game solo se è cambiato qualcosa (version) o si è spostata la finestra
+        version = getattr(game, "version", None)
+        key = (version, viewport.layout)
+        if version is None or key != self._cells_key:
+            self._cells = [[GLYPHS.get(game.read(x, y), "?") for x in range(first_column, first_column + visible_columns)]
+                           for y in range(first_row, first_row + visible_rows)]
+            self._cells_key = key
+
+        width = self.cell_width
+        for j, x in enumerate(range(first_column, first_column + visible_columns)):
+            if columns_targets:
+                self._put(0, self.label_width + j * width, str(columns_targets[x]).ljust(width), 0)
+        cursor_x, cursor_y = self.cursor
+        for i, row in enumerate(self._cells):
+            y = first_row + i
+            if rows_targets:
+                self._put(top + i, 0, str(rows_targets[y]).ljust(self.label_width), 0)
+            for j, glyph in enumerate(row):
+                x = first_column + j
+                attr = self.cursor_attr if (x, y) == (cursor_x, cursor_y) else self.attrs.get(glyph, 0)
+                self._put(top + i, self.label_width + j * width, glyph.ljust(width), attr)
+
+        footer = top + visible_rows
+        self._put_line(footer, self.status_line())
+        self._put_line(footer + 1, HELP)
+        return self.emitted - emitted
+
+    def status_line(self) -> str:
+        """Stato del game, posizione del cursore e, se è un Game, se la board è risolta o sbagliata."""
+        state = ""
+        if self.game.finished():
+            state = "solved - "
+        elif getattr(self.game, "wrong", None) is not None and self.game.wrong():
+            state = "wrong - "
+        x, y = self.cursor
+        return f"{state}{self.game.status()} - ({x}, {y})"
+
+    def _put(self, y: int, x: int, text: str, attr: int) -> None:
+        if self._drawn.get((y, x)) == (text, attr):
+            return
+        self._drawn[(y, x)] = (text, attr)
+        self.emitted += 1
+        try:
+            self.screen.addstr(y, x, text, attr)
+        except self.errors:
+            # -> curses non può scrivere l'ultima cella in basso a destra: il resto è già stato scritto
+            pass
+
+    def _put_line(self, y: int, text: str) -> None:
+        """Riga di testo intera (tagliata alla larghezza del terminale e completata con spazi)."""
+        height, width = self._size
+        if y < height:
+            self._put(y, 0, text[:width - 1].ljust(width - 1), 0)
+
+    # ======== LOOP ========
+    def run(self, screen: Any, curses_module: Any = None) -> None:
+        """
+            Loop principale (da passare a curses.wrapper): disegna, aspetta un tasto, applica, ridisegna.
+            Con curses_module vengono attivati colori, cursore nascosto e la gestione di curses.error.
+        """
+        self.screen = screen
+        if curses_module is not None:
+            self._setup_curses(curses_module)
+        self._size = None
+
+        running = True
+        while running:
+            self.render()
+            screen.refresh()
+            try:
+                key = screen.getkey()
+            except self.errors:
+                continue
+            running = self.handle_key(key)
+
+    def _setup_curses(self, curses) -> None:
+        self.errors = (curses.error,)
+        self.cursor_attr = curses.A_REVERSE
+        try:
+            curses.curs_set(0)
+        except curses.error:
+            pass
+        if curses.has_colors():
+            curses.use_default_colors()
+            colors = {"T": curses.COLOR_GREEN, "^": curses.COLOR_YELLOW, ",": curses.COLOR_CYAN}
+            for pair, (glyph, color) in enumerate(colors.items(), start=1):
+                curses.init_pair(pair, color, -1)
+                self.attrs[glyph] = curses.color_pair(pair) | (curses.A_BOLD if glyph != "," else 0)
+
+    # ======== PROPERTIES ========
+    @property
+    def game(self) -> BoardGame:
+        return self.__game
+    @game.setter
+    def game(self, new: BoardGame) -> None:
+        if not isinstance(new, BoardGame):
+            raise TypeError("game must be a BoardGame instance")
+        self.__game = new
+
+    @property
+    def actions(self) -> dict[str, Action]:
+        return self.__actions
+    @actions.setter
+    def actions(self, value: dict[str, Action]) -> None:
+        if not isinstance(value, dict):
+            raise TypeError("actions must be a dictionary")
+        self.__actions = value
+
+
+def main(argv: list[str] | None = None, wrapper: Callable | None = None) -> None:
+    """
+        Entry point da terminale (python -m src.tui): gioca una board senza display.
+        Con --puzzle rigenera quella board, con --level carica un file di livello,
+        altrimenti genera una board casuale di --size celle per lato.
+    """
+    # -> import locali: curses manca su Windows (senza windows-curses), e il motore serve solo qui
+    from .core.game import Game
+    from .core.level import Level
+    from .core.puzzle_id import PuzzleId
+
+    parser = argparse.ArgumentParser(prog="tents_tui", description="Tents and Trees nel terminale (curses).")
+    source = parser.add_mutually_exclusive_group()
+    source.add_argument("--puzzle", type=PuzzleId.parse, default=None, metavar="ID", help="id di una board generata")
+    source.add_argument("--level", default=None, metavar="PATH", help="file di livello (.txt)")
+    parser.add_argument("--size", type=int, default=12, help="lato della board casuale (default: %(default)s)")
+    args = parser.parse_args(argv)
+
+    if args.puzzle is not None:
+        game = args.puzzle.generate()
+    elif args.level is not None:
+        game = Game.init_from_level(Level.from_file(args.level))
+    else:
+        game = PuzzleId.random(args.size, args.size).generate()
+
+    if wrapper is None:
+        try:
+            import curses
+        except ImportError as e:
+            raise SystemExit(f"curses is not available ({e}); on Windows: pip install windows-curses")
+        tui = BoardGameTui(game)
+        curses.wrapper(lambda screen: tui.run(screen, curses))
+    else:
+        tui = BoardGameTui(game)
+        wrapper(tui.run)
+
+    puzzle_id = PuzzleId.of(game)
+    print(f"{game.status()}" + (f" - puzzle id {puzzle_id}" if puzzle_id is not None else ""))
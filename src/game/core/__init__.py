@@ -1,4 +1,29 @@
-from .game import *
-from .file_management import *
-from .app import *
-from .menu_manager import *
\ No newline at end of file
+import importlib
+
+# -> import pigro (PEP 562): "from src.game.core import App" carica app.py (e con lui g2d, Tkinter, ...)
+#    solo quando serve, così il motore (game.py, level.py) si importa senza nessuna dipendenza grafica
+_LAZY = {
+    "Game": ".game", "GENERATOR_VERSION": ".game", "GENERATOR_VERSIONS": ".game",
+    "Level": ".level",
+    "show_levels": ".file_management", "DEFAULT": ".file_management", "read_settings": ".file_management", "read_pack": ".file_management",
+    "write_pack": ".file_management", "read_ratings": ".file_management", "write_ratings": ".file_management",
+    "Settings": ".settings", "get_settings": ".settings",
+    "App": ".app", "main": ".app",
+    "MenuManager": ".menu_manager",
+    "MenuWindow": ".menu_window",
+    "FrameGovernor": ".frame_governor",
+}
+
+__all__ = list(_LAZY)
+
+
+def __getattr__(name: str):
+    if name not in _LAZY:
+        raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
+    value = getattr(importlib.import_module(_LAZY[name], __name__), name)
+    globals()[name] = value
+    return value
+
+
+def __dir__() -> list[str]:
+    return sorted(set(globals()) | set(_LAZY))
\ No newline at end of file
@@ -1,17 +1,26 @@
 from __future__ import annotations
+import argparse
 import random
 from collections.abc import Callable
+from concurrent.futures import Future, ThreadPoolExecutor
 
 # G2D
 from src.g2d_lib import g2d
 
 # GAME
-from ..board_game_gui import BoardGameGui, gui_get_mouse_pos, gui_get_released_keys, init_canvas, clear_canvas
+from ..board_game_gui import BoardGameGui, gui_get_mouse_pos, gui_get_released_keys, init_canvas, clear_canvas, close_canvas
 
 # CORE
-from .game import Game
+from .game import Game, GENERATOR_VERSION
 from .file_management import *
 from .menu_manager import MenuManager
+from .frame_governor import FrameGovernor
+from .generator_pool import GeneratorPool
+from .puzzle_store import PuzzleStore, UNRATED
+from .puzzle_id import PuzzleId
+from .save_game import SaveWriter, Snapshot, restore
+from .settings import Settings, get_settings, poll_settings, subscribe
+from . import startup_profile
 
 # GUI
 from ..gui import GUIComponent
@@ -19,11 +28,6 @@ from ..gui import GUIComponent
 # STATE
 from ..state import *
 
-settings = read_settings()
-SCALE = settings.get("scale", 1)
-FPS = settings.get("fps", 30)
-SIZE = settings.get("size", 430)
-
 
 class App(object):
     def __init__(self,
@@ -35,28 +39,73 @@ class App(object):
 
         self.app_phase = AppPhase.MENU
 
+        # -> impostazioni lette una volta; con hot_reload un reload sostituisce self.settings (subscribe)
+        self.settings = get_settings()
+        self._unsubscribe = subscribe(self._on_settings)
+
         self.menu = MenuManager(self)
+        self.governor = FrameGovernor(fps=self.settings.fps, min_fps=self.settings.min_fps)
+        pool = self.settings.generator_pool
+        self.generator = GeneratorPool(
+            min_side=pool.min_side,
+            max_side=pool.max_side,
+            depth=pool.depth,
+            workers=pool.workers
+        ) if pool.enabled else None
+        self.puzzles = PuzzleStore() if self.settings.puzzle_pool.enabled else None
+        self._store_writer: ThreadPoolExecutor | None = None    # -> thread delle scritture del PuzzleStore
+        self._store_write: Future | None = None
+        self.puzzle_id: PuzzleId | None = None
+        self.saves = SaveWriter() if self.settings.save_game.enabled else None
+        self.source: Level | PuzzleId | None = None
 
     # ======= METHODS ========
-    def load_game(self, level: Level | None = None) -> None:
+    def load_game(self, level: Level | PuzzleId | Snapshot | None = None) -> None:
         """
             Prepara e avvia una nuova partita.
 
+            Se viene passato uno Snapshot (Resume dal menu), riprende la partita salvata.
+            Se viene passato un PuzzleId, rigenera esattamente quella board.
             Se viene passato un Level e quel livello esiste tra quelli caricati da disco, lo usa.
-            Altrimenti ne genera uno: sceglie una dimensione casuale e genera una board valida.
+            Altrimenti sceglie una dimensione casuale e usa, nell'ordine, la prima fonte che ha una board:
+            il pool di puzzle su disco (PuzzleStore), le code del GeneratorPool, e solo alla fine
+            la generazione sul momento (con un seed nuovo, così anche quella board ha un id).
+            L'id della board generata finisce in self.puzzle_id e viene stampato, per poterla ricaricare.
+            Da dove arriva la board (Level o PuzzleId) finisce in self.source, per i salvataggi.
 
             Crea:
             - self.game (logica)
             - self.gui (interfaccia g2d), con la mappa tasti/azioni
             Alla fine sposta l'app in AppPhase.PLAYING.
         """
-        levels = show_levels()
-
-        if level in levels:
-            self.game = Game.init_from_level(level)
+        debug_checks = self.settings.debug_checks
+        source = level
+        if isinstance(level, Snapshot):
+            try:
+                self.game, source = restore(level, debug_checks=debug_checks)
+            except ValueError as e:
+                print(f"<app.py | Cannot resume the saved game: {e}>")
+                self.app_phase = AppPhase.MENU
+                return
+        elif isinstance(level, PuzzleId):
+            self.game = level.generate(debug_checks=debug_checks)
+        elif level in show_levels():
+            self.game = Game.init_from_level(level, debug_checks=debug_checks)
         else:
             side = random.randint(8, 20)
-            self.game = Game(rows=side, columns=side)
+            game = None
+            if self.puzzles is not None:
+                game = self.puzzles.take(side, side, debug_checks=debug_checks)
+            if game is None and self.generator is not None:
+                game = self.generator.take(side, debug_checks=debug_checks)
+            if game is None:
+                game = PuzzleId.random(side, side).generate(debug_checks=debug_checks)
+            self.game = game
+
+        self.puzzle_id = PuzzleId.of(self.game)
+        self.source = source if isinstance(source, (Level, PuzzleId)) else self.puzzle_id
+        if self.puzzle_id is not None:
+            print(f"<app.py | puzzle id {self.puzzle_id}>")
 
         self.gui = BoardGameGui(game=self.game,
                                 actions={
@@ -65,7 +114,8 @@ class App(object):
                                     "t": Action.PLACE_TENT,
                                     "s": Action.PLACE_SOLUTION,
                                     "a": Action.PLACE_HINT
-                                })
+                                },
+                                allow_deferred=self.governor.allow_deferred)
 
         self.app_phase = AppPhase.PLAYING
 
@@ -73,28 +123,105 @@ class App(object):
         """
             Gestisce un frame di gioco quando in PLAYING.
 
-            - Escape -> torna al menu (senza chiudere il programma).
+            - Escape -> salva la partita (in background) e torna al menu (senza chiudere il programma).
             - Se per qualche motivo game/gui non esistono, rientra al menu per sicurezza.
-            - Se il livello è risolto, passa a GAME_OVER.
+            - Se il livello è risolto, cancella il salvataggio e passa a GAME_OVER.
             - Altrimenti delega tutto alla GUI (tick), che legge input e disegna.
         """
-        if "Escape" in keys:
+        if not (hasattr(self, "game") and hasattr(self, "gui")):
             self.app_phase = AppPhase.MENU
             return
 
-        if not (hasattr(self, "game") and hasattr(self, "gui")):
+        if "Escape" in keys:
+            self.save_game()
             self.app_phase = AppPhase.MENU
             return
 
         if self.game.finished():
+            if self.saves is not None:
+                self.saves.discard()
             self.app_phase = AppPhase.GAME_OVER
 
         self.gui.tick()
 
+    def save_game(self) -> bool:
+        """
+            Salva la partita in corso per il Resume del menu. La codifica costa pochi ms,
+            la scrittura su disco avviene nel thread del SaveWriter. Ritorna True se ha salvato.
+        """
+        if self.saves is None or self.source is None or self.game.finished():
+            return False
+        self.saves.save(self.game, self.source)
+        return True
+
     def load_menu(self, keys: list[str], pos: tuple[float, float]) -> None:
         """Gestisce un frame quando nel menu. In pratica delega al MenuManager."""
         self.menu.tick(keys=keys, cursor_pos=pos)
 
+    def busy(self) -> bool:
+        """
+            Dice al main_loop se serve continuare a fare tick a frame rate fisso.
+
+            Fuori da PLAYING (menu, cambi di fase) è sempre True; durante la partita è True
+            se l'ultimo frame della GUI ha dovuto ridisegnare qualcosa o se il governor ha ancora
+            lavoro rimandato (barra di stato, indicatore) da completare.
+            Quando ritorna False il loop va in attesa, e il governor non misura quella pausa come frame;
+            prima di attendere, le board già pronte vengono passate al thread che le salva su disco (store_ready).
+        """
+        if self.app_phase is not AppPhase.PLAYING or not hasattr(self, "gui"):
+            return True
+        if not self.gui.idle or self.governor.pending:
+            return True
+        self.store_ready()
+        self.governor.idle()
+        return False
+
+    def store_ready(self) -> bool:
+        """
+            Sposta le board pronte del GeneratorPool nel PuzzleStore, per i lati in cui il pool su disco
+            ha meno di puzzle_pool.keep puzzle. Qui le board vengono solo tolte dalle code in memoria:
+            la scrittura (fsync compreso) la fa il thread puzzle-store, con una sola add_many per gruppo.
+            Ritorna True se ha passato qualcosa al thread; False anche se la scrittura precedente non è finita.
+        """
+        if self.puzzles is None or self.generator is None:
+            return False
+        if self._store_write is not None and not self._store_write.done():
+            return False
+        keep = self.settings.puzzle_pool.keep
+        batch = []
+        for side in self.generator.sides:
+            ready = self.generator.depths.get(side, 0)
+            if not ready:
+                continue
+            for _ in range(min(ready, keep - self.puzzles.count(side, side))):
+                side, seed, trees, tents = self.generator.take_record(side)
+                batch.append((side, side, trees, tents, seed, UNRATED, GENERATOR_VERSION))
+        if not batch:
+            return False
+        if self._store_writer is None:
+            self._store_writer = ThreadPoolExecutor(max_workers=1, thread_name_prefix="puzzle-store")
+        self._store_write = self._store_writer.submit(self.puzzles.add_many, batch)
+        self._store_write.add_done_callback(_report_store_error)
+        return True
+
+    def close_puzzles(self) -> None:
+        """Aspetta che il thread puzzle-store finisca di scrivere e chiude il PuzzleStore."""
+        if self._store_writer is not None:
+            self._store_writer.shutdown(wait=True)
+            self._store_writer = None
+        if self.puzzles is not None:
+            self.puzzles.close()
+
+    def _on_settings(self, settings: Settings) -> None:
+        """
+            Subscriber dei reload di settings.json: le partite nuove usano subito le impostazioni nuove
+            (tema, layout, debug_checks, frame rate). Pool e salvataggi restano quelli creati all'avvio.
+        """
+        self.settings = settings
+        self.governor.target_fps = settings.fps
+        self.governor.min_fps = min(settings.min_fps, settings.fps)
+        self.governor.fps = min(self.governor.fps, settings.fps)
+
     def tick(self) -> None:
         """
             Viene chiamato a ogni frame dal main_loop di g2d.
@@ -105,7 +232,16 @@ class App(object):
             - PLAYING: fa avanzare la partita
             - GAME_OVER: resetta il menu e torna alla home
             - QUIT: esce dal processo
+
+            Il costo del frame viene misurato dal governor, che adatta il frame rate.
+            Prima di tutto il GeneratorPool (se attivo) raccoglie le board pronte e riempie le code.
+            Con hot_reload attivo, settings.json viene ricontrollato (al massimo una volta al secondo).
         """
+        self.governor.begin_frame()
+        if self.settings.hot_reload:
+            poll_settings()
+        if self.generator is not None:
+            self.generator.service()
         match self.app_phase:
             case AppPhase.MENU:
                 self.load_menu(self.keys, self.mouse_pos)
@@ -117,9 +253,16 @@ class App(object):
                 self.menu.set_home()
                 self.app_phase = AppPhase.MENU
             case AppPhase.QUIT:
+                if self.generator is not None:
+                    self.generator.close()
+                if self.saves is not None:
+                    self.saves.close()
+                self.close_puzzles()
+                self._unsubscribe()
                 exit()
             case _:
                 self.app_phase = AppPhase.MENU
+        self.governor.end_frame()
 
     # ======== PROPERTIES ========
     @property
@@ -165,8 +308,58 @@ class App(object):
         self.__app_status = new
 
 
-def main() -> None:
-    """Entry point"""
-    global SCALE, FPS
-    app = App(get_keys_from=gui_get_released_keys, get_mouse_pos_from=gui_get_mouse_pos)
-    init_canvas(tick=app.tick, size=(SIZE, SIZE), scale=SCALE, fps=FPS)
+def _report_store_error(write: Future) -> None:
+    """Callback delle scritture del thread puzzle-store: un errore non ferma il gioco, ma va segnalato."""
+    error = write.exception()
+    if error is not None:
+        print(f"<app.py | Cannot store generated puzzles: {error}>")
+
+
+def profile_first_frame(app: App, output: str) -> Callable[[], None]:
+    """
+        tick per --profile-startup: il primo frame viene misurato (tick dell'App + aggiornamento del canvas),
+        poi report e JSON del profilo vengono scritti e il programma esce.
+    """
+    def tick() -> None:
+        with startup_profile.span("first_frame"):
+            app.tick()
+            g2d.update_canvas()
+        profile = startup_profile.stop()
+        print(profile.report())
+        print(f"<app.py | startup profile written to {profile.write(output)}>")
+        if app.generator is not None:
+            app.generator.close()
+        if app.saves is not None:
+            app.saves.close()
+        app.close_puzzles()
+        close_canvas()
+    return tick
+
+
+def main(argv: list[str] | None = None) -> None:
+    """
+        Entry point. Con --puzzle ID parte subito dalla board di quell'id invece che dal menu.
+        Con --profile-startup misura l'avvio fino al primo frame, stampa il report, salva il JSON ed esce
+        (per misurare anche gli import va passato a src/main.py, che avvia il profilo prima di importare il gioco).
+    """
+    parser = argparse.ArgumentParser(prog="TentsAndTrees")
+    parser.add_argument("--puzzle", type=PuzzleId.parse, default=None, metavar="ID",
+                        help="rigenera e gioca la board con questo id (es. 1-12x12-3KZ8Q1)")
+    parser.add_argument("--profile-startup", action="store_true",
+                        help="misura import e fasi dell'avvio fino al primo frame, poi esce")
+    parser.add_argument("--profile-output", default=startup_profile.DEFAULT_REPORT, metavar="PATH",
+                        help="file JSON del profilo (default: %(default)s)")
+    args = parser.parse_args(argv)
+    if args.profile_startup:
+        startup_profile.start()
+
+    with startup_profile.span("app"):
+        app = App(get_keys_from=gui_get_released_keys, get_mouse_pos_from=gui_get_mouse_pos)
+    settings = app.settings
+    if args.puzzle is not None:
+        app.menu.selected_level_data = args.puzzle
+        app.app_phase = AppPhase.START_GAME
+    tick = profile_first_frame(app, args.profile_output) if args.profile_startup else app.tick
+    init_canvas(tick=tick, size=(settings.size, settings.size), scale=settings.scale,
+                fps=app.governor.frame_rate if settings.adaptive_fps else settings.fps,
+                busy=app.busy if settings.idle_loop else None, idle_wait=settings.idle_wait, backend=settings.backend)
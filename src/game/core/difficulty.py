@@ -0,0 +1,861 @@
+from __future__ import annotations
+from collections.abc import Iterable, Sequence
+from typing import NamedTuple
+import bisect
+import os
+import pathlib
+import time
+
+
+UNKNOWN, TENT, GRASS, TREE = 0, 1, 2, 3
+_UNKNOWN, _TENT, _GRASS = bytes([UNKNOWN]), bytes([TENT]), bytes([GRASS])
+# -> tutto quello che non è libero diventa prato: restano i tratti di celle libere separati da prato
+_DECIDED_AS_GRASS = bytes([UNKNOWN, GRASS, GRASS, GRASS]) + bytes(252)
+_NONZERO = bytes([0]) + bytes([1]) * 255
+_HALF_UP = [(n + 1) // 2 for n in range(256)]     # -> tende che stanno in n celle libere in fila
+
+# -> livelli di deduzione, dal più semplice al più costoso (l'ordine conta: si usa sempre il primo che avanza)
+TIERS = ("lines", "n8", "trees", "probe", "search")
+MAX_NODES = 2000
+MAX_SECONDS = 1.0
+# -> finestre di nearby(): lato, passo e nodi di ricerca per finestra
+WINDOW, WINDOW_STEP, WINDOW_NODES = 6, 3, 20
+WEIGHTS = {"lines": 1, "n8": 1, "trees": 2, "probe": 10, "search": 30}
+LABELS = {"lines": "easy", "n8": "easy", "trees": "medium", "probe": "hard", "search": "expert"}
+
+
+class Rating(NamedTuple):
+    """
+        Risultato di rate(): quanto è difficile un puzzle per chi usa solo le deduzioni del motore.
+
+        - score: somma pesata (WEIGHTS) delle applicazioni di ogni livello; più alto = più difficile
+        - label: easy / medium / hard / expert, dal livello più alto che è servito (LABELS)
+        - fires / deductions: per livello, quante volte è servito e quante celle ha deciso
+        - nodes: nodi esplorati dalla ricerca (0 se bastano le deduzioni)
+        - solved / unique: risolto entro i limiti, e con una sola soluzione
+        - seconds: tempo impiegato
+        - decided: False se la ricerca si è fermata su un limite (nodi o tempo) prima di finire:
+          in quel caso solved/unique dicono solo quello che ha trovato, non che la soluzione manca o non è unica
+    """
+    score: float
+    label: str
+    fires: dict[str, int]
+    deductions: dict[str, int]
+    nodes: int
+    solved: bool
+    unique: bool
+    seconds: float
+    decided: bool = True
+
+    @property
+    def max_tier(self) -> str | None:
+        used = [tier for tier in TIERS if self.fires.get(tier)]
+        return used[-1] if used else None
+
+
+def _indices(cells: bytearray, value: int) -> Iterable[int]:
+    """Indici delle celle con quel valore, in ordine (la ricerca la fa bytearray.find, in C)."""
+    i = cells.find(value)
+    while i >= 0:
+        yield i
+        i = cells.find(value, i + 1)
+
+
+def _components(graph: dict[int, list[int]]) -> dict[int, int]:
+    """Componenti fortemente connesse (Tarjan, iterativo): nodo -> id della sua componente."""
+    index: dict[int, int] = {}
+    low: dict[int, int] = {}
+    component: dict[int, int] = {}
+    stack: list[int] = []
+    on_stack: set[int] = set()
+    counter = 0
+    for root in graph:
+        if root in index:
+            continue
+        work = [(root, iter(graph[root]))]
+        index[root] = low[root] = counter
+        counter += 1
+        stack.append(root)
+        on_stack.add(root)
+        while work:
+            node, edges = work[-1]
+            for nxt in edges:
+                if nxt not in index:
+                    index[nxt] = low[nxt] = counter
+                    counter += 1
+                    stack.append(nxt)
+                    on_stack.add(nxt)
+                    work.append((nxt, iter(graph.get(nxt, ()))))
+                    break
+                if nxt in on_stack and index[nxt] < low[node]:
+                    low[node] = index[nxt]
+            else:
+                work.pop()
+                if work and low[node] < low[work[-1][0]]:
+                    low[work[-1][0]] = low[node]
+                if low[node] == index[node]:
+                    while True:
+                        other = stack.pop()
+                        on_stack.discard(other)
+                        component[other] = node
+                        if other == node:
+                            break
+    return component
+
+
+class _Puzzle:
+    """Dati fissi del puzzle (vicini, alberi, righe e colonne) precalcolati per indice di cella."""
+
+    def __init__(self, columns: int, rows: int, trees: Iterable[tuple[int, int]],
+                 columns_targets: Sequence[int], rows_targets: Sequence[int]) -> None:
+        self.columns, self.rows = columns, rows
+        self.size = columns * rows
+        self.columns_targets = list(columns_targets)
+        self.rows_targets = list(rows_targets)
+        self.trees = sorted(y * columns + x for x, y in trees)
+
+        def neighbours(i: int, diagonal: bool) -> list[int]:
+            y, x = divmod(i, columns)
+            out = []
+            for dy in (-1, 0, 1):
+                for dx in (-1, 0, 1):
+                    if (dx, dy) == (0, 0) or (not diagonal and dx and dy):
+                        continue
+                    nx, ny = x + dx, y + dy
+                    if 0 <= nx < columns and 0 <= ny < rows:
+                        out.append(ny * columns + nx)
+            return out
+
+        self.n4 = [neighbours(i, False) for i in range(self.size)]
+        self.n8 = [neighbours(i, True) for i in range(self.size)]
+        self.row_cells = [range(y * columns, (y + 1) * columns) for y in range(rows)]
+        self.column_cells = [range(x, self.size, columns) for x in range(columns)]
+        # -> (slice della linea dentro cells, indici delle sue celle, target): i conteggi si fanno sulla slice, in C
+        self.lines = ([(slice(y * columns, (y + 1) * columns), self.row_cells[y], target)
+                       for y, target in enumerate(self.rows_targets)] +
+                      [(slice(x, self.size, columns), self.column_cells[x], target)
+                       for x, target in enumerate(self.columns_targets)])
+        # -> per cella, gli indici in lines della sua riga e della sua colonna
+        self.cell_lines = [(i // columns, rows + i % columns) for i in range(self.size)]
+
+        # -> coppie di linee vicine (due righe o due colonne) con la somma dei target, per la regola bands
+        self.bands = [(self.lines[k][0], self.lines[k + 1][0], self.lines[k][1], self.lines[k + 1][1],
+                       self.lines[k][2] + self.lines[k + 1][2])
+                      for first, count in ((0, rows), (rows, columns)) for k in range(first, first + count - 1)]
+
+        tree_set = set(self.trees)
+        self.adjacent_trees = [[n for n in self.n4[i] if n in tree_set] for i in range(self.size)]
+        self.tree_n4 = [self.n4[tree] for tree in self.trees]
+        self.treeless = [i for i in range(self.size) if not self.adjacent_trees[i] and i not in tree_set]
+
+    def initial(self) -> bytearray:
+        cells = bytearray(self.size)
+        for tree in self.trees:
+            cells[tree] = TREE
+        return cells
+
+
+class _Rater:
+    def __init__(self, puzzle: _Puzzle, max_nodes: int, deadline: float = float("inf"),
+                 guide: Iterable[int] = ()) -> None:
+        self.puzzle = puzzle
+        self.max_nodes = max_nodes
+        self.deadline = deadline
+        self.guide = frozenset(guide)   # -> tende di una soluzione nota: la ricerca prova prima quelle
+        self.fires = dict.fromkeys(TIERS, 0)
+        self.deductions = dict.fromkeys(TIERS, 0)
+        self.nodes = 0
+        self.exhausted = False      # -> True se probe o ricerca si sono fermati su max_nodes o deadline
+        self.probe_from = 0         # -> probe riparte dalla cella dopo l'ultima che ha deciso qualcosa
+
+    # ======== LIVELLI DI DEDUZIONE ========
+    # -> ognuno fa un passaggio sulla board: ritorna quante celle ha deciso, -1 se trova una contraddizione
+
+    def lines(self, cells: bytearray) -> int:
+        """Righe/colonne: target raggiunto -> il resto è prato; tende + libere == target -> le libere sono tende."""
+        changed = 0
+        for part, _, target in self.puzzle.lines:
+            values = cells[part]
+            tents = values.count(TENT)
+            unknown = values.count(UNKNOWN)
+            if tents > target or tents + unknown < target:
+                return -1
+            if not unknown or (tents != target and tents + unknown != target):
+                continue
+            cells[part] = values.replace(_UNKNOWN, _GRASS if tents == target else _TENT)
+            changed += unknown
+        return changed
+
+    def n8(self, cells: bytearray) -> int:
+        """Celle n8 attorno a una tenda e celle senza alberi n4 -> prato."""
+        p = self.puzzle
+        changed = 0
+        for i in _indices(cells, TENT):
+            for n in p.n8[i]:
+                if cells[n] == UNKNOWN:
+                    cells[n] = GRASS
+                    changed += 1
+        for i in p.treeless:
+            if cells[i] == UNKNOWN:
+                cells[i] = GRASS
+                changed += 1
+        return changed
+
+    def trees(self, cells: bytearray) -> int:
+        """
+            Regole sugli alberi (come _auto_tents / _forced_assignments del Game):
+            - albero senza tende attorno con una sola cella libera n4 -> quella è tenda
+            - una tenda con un solo albero libero attorno lo "prende"; le celle attorno solo ad alberi presi -> prato
+        """
+        p = self.puzzle
+        changed = 0
+        for around in p.tree_n4:
+            free, last = 0, -1
+            for n in around:
+                value = cells[n]
+                if value == TENT:
+                    break
+                if value == UNKNOWN:
+                    free += 1
+                    last = n
+            else:
+                if not free:
+                    return -1
+                if free == 1:
+                    cells[last] = TENT
+                    changed += 1
+        if changed:
+            return changed
+        return self._pairs(cells)
+
+    def _pairs(self, cells: bytearray) -> int:
+        """Abbinamenti obbligati: una tenda con un solo albero non ancora preso lo prende."""
+        p = self.puzzle
+        changed = 0
+        taken: set[int] = set()
+        paired: set[int] = set()
+        tents = list(_indices(cells, TENT))
+        progress = True
+        while progress:
+            progress = False
+            for tent in tents:
+                if tent in paired:
+                    continue
+                options = [tree for tree in p.adjacent_trees[tent] if tree not in taken]
+                if not options:
+                    return -1
+                if len(options) == 1:
+                    taken.add(options[0])
+                    paired.add(tent)
+                    progress = True
+
+        # -> solo le celle attorno agli alberi presi possono avere tutti gli alberi vicini presi
+        for tree in taken:
+            for i in p.n4[tree]:
+                if cells[i] == UNKNOWN and all(other in taken for other in p.adjacent_trees[i]):
+                    cells[i] = GRASS
+                    changed += 1
+        return changed
+
+    def segments(self, cells: bytearray) -> int:
+        """
+            Regola usata solo dalla ricerca: in una riga/colonna n celle libere consecutive ospitano al massimo
+            (n+1)//2 tende. Se la capienza totale è minore delle tende mancanti la board è sbagliata; se è
+            uguale ogni tratto è pieno: nei tratti dispari le tende sono obbligate (posizioni pari), in quelli
+            pari ogni coppia di celle ha una tenda, quindi le celle n8 comuni alla coppia fuori dalla linea sono prato.
+        """
+        p = self.puzzle
+        changed = 0
+        for part, line, target in p.lines:
+            values = cells[part]
+            unknown = values.count(UNKNOWN)
+            missing = target - values.count(TENT)
+            # -> la capienza è almeno (libere+1)//2: se basta già quella la linea non dice niente
+            if not unknown or missing <= 0 or (unknown + 1) // 2 > missing:
+                continue
+            runs: list[list[int]] = []
+            previous = False
+            for i in line:
+                if cells[i] == UNKNOWN:
+                    if previous:
+                        runs[-1].append(i)
+                    else:
+                        runs.append([i])
+                    previous = True
+                else:
+                    previous = False
+            capacity = sum((len(run) + 1) // 2 for run in runs)
+            if capacity < missing:
+                return -1
+            if capacity > missing:
+                continue
+            for run in runs:
+                if len(run) % 2:
+                    for k, i in enumerate(run):
+                        cells[i] = GRASS if k % 2 else TENT
+                    changed += len(run)
+                    continue
+                for a, b in zip(run[::2], run[1::2]):
+                    for n in set(p.n8[a]).intersection(p.n8[b]).difference(line):
+                        if cells[n] == UNKNOWN:
+                            cells[n] = GRASS
+                            changed += 1
+        return changed
+
+    def bands(self, cells: bytearray) -> int:
+        """
+            Regola usata solo dalla ricerca: in due linee vicine ogni blocco 2x2 ha al massimo una tenda, quindi
+            n posizioni consecutive (colonne per due righe, righe per due colonne) con almeno una cella libera
+            ospitano al massimo (n+1)//2 tende. Capienza minore delle tende mancanti -> board sbagliata;
+            uguale -> nei tratti dispari le posizioni dispari restano senza tenda (prato in entrambe le linee).
+        """
+        changed = 0
+        for part_a, part_b, line_a, line_b, target in self.puzzle.bands:
+            a, b = cells[part_a], cells[part_b]
+            missing = target - a.count(TENT) - b.count(TENT)
+            if missing <= 0:
+                continue
+            # -> UNKNOWN è 0: il minimo della posizione è 0 se almeno una delle due celle è libera
+            open_ = bytes(map(min, a, b))
+            if (open_.count(UNKNOWN) + 1) // 2 > missing:
+                continue
+            runs: list[list[int]] = []
+            previous = False
+            for k, value in enumerate(open_):
+                if value == UNKNOWN:
+                    if previous:
+                        runs[-1].append(k)
+                    else:
+                        runs.append([k])
+                    previous = True
+                else:
+                    previous = False
+            capacity = sum((len(run) + 1) // 2 for run in runs)
+            if capacity < missing:
+                return -1
+            if capacity > missing:
+                continue
+            for run in runs:
+                if len(run) % 2:
+                    for k in run[1::2]:
+                        for i in (line_a[k], line_b[k]):
+                            if cells[i] == UNKNOWN:
+                                cells[i] = GRASS
+                                changed += 1
+        return changed
+
+    def matching(self, cells: bytearray) -> int:
+        """
+            Regola usata solo dalla ricerca: filtra l'abbinamento alberi-tende. Le soluzioni abbinano ogni albero
+            a una sua cella n4 (tenda o libera), diversa per ogni albero, usando tutte le tende già messe.
+            Trova un abbinamento così (altrimenti la board è sbagliata) e, con le componenti fortemente connesse
+            del grafo dei cammini alternanti, decide:
+            - cella libera che nessun abbinamento valido usa -> prato
+            - cella libera che ogni abbinamento valido usa -> tenda
+        """
+        p = self.puzzle
+        size = p.size
+        owner: dict[int, int] = {}      # -> cella -> albero
+        partner: dict[int, int] = {}    # -> albero -> cella
+
+        # -> coppie obbligate: una tenda con un solo albero vicino ancora disponibile lo prende in ogni
+        #    abbinamento; toglierle prima rimpicciolisce il grafo (nelle ricerche profonde circa metà degli alberi)
+        trees = set(p.trees)
+        tents = set(_indices(cells, TENT))
+        pending = list(tents)
+        while pending:
+            tent = pending.pop()
+            if tent not in tents:
+                continue
+            available = [tree for tree in p.adjacent_trees[tent] if tree in trees]
+            if not available:
+                return -1
+            if len(available) == 1:
+                tents.discard(tent)
+                trees.discard(available[0])
+                pending.extend(n for n in p.n4[available[0]] if n in tents)
+
+        def usable(cell: int) -> bool:
+            return cells[cell] == UNKNOWN or cell in tents
+
+        def augment(tree: int, seen: set[int]) -> bool:
+            for cell in p.n4[tree]:
+                if cell not in seen and usable(cell):
+                    seen.add(cell)
+                    if cell not in owner or augment(owner[cell], seen):
+                        owner[cell], partner[tree] = tree, cell
+                        return True
+            return False
+
+        def claim(tent: int, seen: set[int]) -> bool:
+            # -> cammino aumentante che parte da una tenda: la tenda resta abbinata a un albero suo
+            for tree in p.adjacent_trees[tent]:
+                if tree in trees and tree not in seen:
+                    seen.add(tree)
+                    if tree not in partner or claim(partner[tree], seen):
+                        owner[tent], partner[tree] = tree, tent
+                        return True
+            return False
+
+        if not all(claim(tent, set()) for tent in tents):
+            return -1
+        if not all(tree in partner or augment(tree, set()) for tree in trees):
+            return -1
+
+        # -> grafo: albero -> cella (non abbinata), cella -> suo albero; S = size collega le celle libere:
+        #    libere non abbinate -> S -> libere abbinate (un cammino alternante può scambiarle)
+        graph: dict[int, list[int]] = {size: []}
+        for tree in trees:
+            graph[tree] = [cell for cell in p.n4[tree] if partner[tree] != cell and usable(cell)]
+        for cell, tree in owner.items():
+            graph[cell] = [tree]
+            if cells[cell] == UNKNOWN:
+                graph[size].append(cell)
+        for tree in trees:
+            for cell in graph[tree]:
+                if cell not in owner:
+                    graph[cell] = [size]
+        component = _components(graph)
+
+        changed = 0
+        for cell in {cell for tree in p.trees for cell in p.n4[tree] if cells[cell] == UNKNOWN}:
+            if cell in owner:
+                if component[cell] != component[size]:
+                    cells[cell] = TENT
+                    changed += 1
+            elif cell not in graph or not any(tree in trees and component[tree] == component[cell]
+                                              for tree in p.adjacent_trees[cell]):
+                # -> (fuori dal grafo: i suoi alberi sono tutti presi dalle coppie obbligate)
+                cells[cell] = GRASS
+                changed += 1
+        return changed
+
+    # ======== CONTROLLI ========
+    def contradiction(self, cells: bytearray) -> bool:
+        """Come Game.wrong: tende adiacenti, tende senza albero, alberi senza posto, conteggi impossibili."""
+        p = self.puzzle
+        tents = 0
+        for i in _indices(cells, TENT):
+            tents += 1
+            if not p.adjacent_trees[i]:
+                return True
+            for n in p.n8[i]:
+                if cells[n] == TENT:
+                    return True
+        if tents > len(p.trees):
+            return True
+        for around in p.tree_n4:
+            for n in around:
+                if cells[n] <= TENT:        # -> UNKNOWN o TENT
+                    break
+            else:
+                return True
+        return False
+
+    def complete(self, cells: bytearray) -> bool:
+        """True se non ci sono celle da decidere (la correttezza la controlla solved)."""
+        return UNKNOWN not in cells
+
+    def solved(self, cells: bytearray) -> bool:
+        """Board completa, conteggi esatti e un abbinamento 1 a 1 tende-alberi (n4)."""
+        p = self.puzzle
+        for part, _, target in p.lines:
+            if cells[part].count(TENT) != target:
+                return False
+
+        owner: dict[int, int] = {}
+
+        def assign(tent: int, seen: set[int]) -> bool:
+            for tree in p.adjacent_trees[tent]:
+                if tree not in seen:
+                    seen.add(tree)
+                    if tree not in owner or assign(owner[tree], seen):
+                        owner[tree] = tent
+                        return True
+            return False
+
+        tents = list(_indices(cells, TENT))
+        return len(tents) == len(p.trees) and all(assign(tent, set()) for tent in tents)
+
+    # ======== PROPAGAZIONE ========
+    def propagate(self, cells: bytearray, tiers: Sequence[str], record: bool = True) -> bool:
+        """
+            Applica i livelli in ordine, ripartendo dal primo dopo ogni progresso, finché nessuno avanza.
+            Ritorna False se lo stato è contraddittorio. Serve al conteggio dei livelli (fires/deductions):
+            per le ipotesi di probe e per la ricerca c'è settle, che arriva allo stesso punto fisso più in fretta.
+        """
+        while True:
+            if self.contradiction(cells):
+                return False
+            if self.complete(cells):
+                return self.solved(cells)
+            for tier in tiers:
+                changed = getattr(self, tier)(cells)
+                if changed < 0:
+                    return False
+                if changed:
+                    if record:
+                        self.fires[tier] += 1
+                        self.deductions[tier] += changed
+                    break
+            else:
+                return True
+
+    def counts(self, cells: bytearray) -> tuple[list[int], list[int]]:
+        """Tende e celle libere di ogni linea (indici di puzzle.lines), per settle."""
+        lines = self.puzzle.lines
+        return [cells[part].count(TENT) for part, _, _ in lines], [cells[part].count(UNKNOWN) for part, _, _ in lines]
+
+    def settle(self, cells: bytearray, moves: Iterable[tuple[int, int]], rules: Sequence[str] = (),
+               counts: tuple[list[int], list[int]] | None = None,
+               decided: list[int] | None = None) -> bool:
+        """
+            Applica le mosse (cella, valore) e propaga in modo incrementale i livelli semplici (lines, n8, trees),
+            su uno stato che prima delle mosse era già a punto fisso (dopo propagate o un altro settle).
+            Invece di ripassare tutta la board a ogni deduzione guarda solo la riga, la colonna, le celle n8
+            e gli alberi delle celle appena decise, con i conteggi delle linee (counts) tenuti aggiornati.
+            A punto fisso applica gli abbinamenti obbligati e le regole globali rules (segments, bands, matching),
+            ripartendo dalle celle che decidono.
+            Le celle decise finiscono in decided (se c'è). Ritorna False se lo stato è contraddittorio.
+        """
+        p = self.puzzle
+        lines, cell_lines, n8, n4, adjacent_trees = p.lines, p.cell_lines, p.n8, p.n4, p.adjacent_trees
+        tents_in, free_in = self.counts(cells) if counts is None else (list(counts[0]), list(counts[1]))
+        queue: list[int] = []
+        if decided is None:
+            decided = []
+
+        def decide(j: int, value: int) -> None:
+            cells[j] = value
+            for k in cell_lines[j]:
+                free_in[k] -= 1
+                if value == TENT:
+                    tents_in[k] += 1
+            queue.append(j)
+            decided.append(j)
+
+        for i, value in moves:
+            decide(i, value)
+
+        while True:
+            while queue:
+                i = queue.pop()
+                for k in cell_lines[i]:
+                    tents, free = tents_in[k], free_in[k]
+                    _, line, target = lines[k]
+                    if tents > target or tents + free < target:
+                        return False
+                    if free and (tents == target or tents + free == target):
+                        value = GRASS if tents == target else TENT
+                        for j in line:
+                            if cells[j] == UNKNOWN:
+                                decide(j, value)
+                if cells[i] == TENT:
+                    if not adjacent_trees[i]:
+                        return False
+                    for n in n8[i]:
+                        value = cells[n]
+                        if value == TENT:
+                            return False
+                        if value == UNKNOWN:
+                            decide(n, GRASS)
+                    continue
+                for tree in adjacent_trees[i]:
+                    free, last = 0, -1
+                    for n in n4[tree]:
+                        value = cells[n]
+                        if value == TENT:
+                            break
+                        if value == UNKNOWN:
+                            free += 1
+                            last = n
+                    else:
+                        if not free:
+                            return False
+                        if free == 1:
+                            decide(last, TENT)
+
+            if sum(tents_in[:p.rows]) > len(p.trees):
+                return False
+            if UNKNOWN not in cells:
+                return self.solved(cells)
+
+            # -> punto fisso delle regole locali: regole globali, una alla volta, finché una decide qualcosa
+            before = bytes(cells)
+            for rule in ("_pairs",) + tuple(rules):
+                result = getattr(self, rule)(cells)
+                if result < 0:
+                    return False
+                if result:
+                    break
+            else:
+                return True
+            # -> le regole cambiano solo celle libere: le celle cambiate sono i byte diversi da before (xor, in C)
+            diff = (int.from_bytes(before, "big") ^ int.from_bytes(cells, "big")).to_bytes(p.size, "big")
+            for j in _indices(diff.translate(_NONZERO), 1):
+                value = cells[j]
+                cells[j] = UNKNOWN
+                decide(j, value)
+
+    def probe(self, cells: bytearray) -> int:
+        """
+            Come hint(): per ogni cella libera prova tenda e prato, propagando con i livelli semplici.
+            Se un'ipotesi porta a contraddizione vale l'altra; altrimenti vale ciò che segue da entrambe.
+            Si ferma alla prima cella che permette di decidere qualcosa; la volta dopo riprende dalla cella
+            successiva (in ordine di riga, ricominciando da capo), così le celle che non decidevano niente non
+            vengono riprovate a ogni passo: ritorna 0 solo dopo un giro completo senza deduzioni.
+        """
+        counts = self.counts(cells)
+        free = list(_indices(cells, UNKNOWN))
+        start = bisect.bisect_left(free, self.probe_from)
+        for i in free[start:] + free[:start]:
+            if time.perf_counter() > self.deadline:
+                self.exhausted = True
+                return 0
+            as_tent, as_grass = bytearray(cells), bytearray(cells)
+            decided: list[int] = []
+            tent_ok = self.settle(as_tent, ((i, TENT),), counts=counts, decided=decided)
+            grass_ok = self.settle(as_grass, ((i, GRASS),), counts=counts)
+
+            if not tent_ok and not grass_ok:
+                return -1
+            self.probe_from = i + 1
+            if not tent_ok or not grass_ok:
+                cells[i] = GRASS if not tent_ok else TENT
+                return 1
+
+            common = 0
+            for j in decided:
+                if cells[j] == UNKNOWN and as_tent[j] == as_grass[j]:
+                    cells[j] = as_tent[j]
+                    common += 1
+            if common:
+                return common
+        return 0
+
+    def search(self, cells: bytearray, limit: int = 2, budget: int | None = None) -> list[bytearray]:
+        """
+            Ricerca con backtracking: ritorna fino a limit soluzioni.
+            Ogni nodo propaga con i livelli semplici più segments, bands e matching, poi sceglie l'albero ancora
+            senza tenda più vincolato (_branch_cells) e prova, una alla volta, ognuna delle sue celle libere come
+            sua tenda (con le precedenti a prato), così i rami non si sovrappongono e le soluzioni si contano una volta sola.
+            Si ferma (exhausted) dopo max_nodes nodi o alla scadenza di deadline.
+            Con budget si ferma dopo budget nodi senza segnare exhausted (le ricerche di prova di nearby).
+        """
+        solutions: list[bytearray] = []
+        rules = ("segments", "bands", "matching")
+        stop = self.max_nodes if budget is None else self.nodes + budget
+        stopped = False
+
+        def visit(state: bytearray, moves: Sequence[tuple[int, int]]) -> None:
+            nonlocal stopped
+            if len(solutions) >= limit or self.exhausted or stopped:
+                return
+            if time.perf_counter() > self.deadline:
+                self.exhausted = True
+                return
+            if self.nodes >= stop:
+                stopped = True
+                self.exhausted = budget is None
+                return
+            self.nodes += 1
+            if not self.settle(state, moves, rules):
+                return
+            if self.complete(state):
+                solutions.append(state)
+                return
+            free = self._branch_cells(state)
+            for k, i in enumerate(free):
+                visit(bytearray(state), [(j, GRASS) for j in free[:k]] + [(i, TENT)])
+            if len(free) == 1:
+                # -> nessun albero senza tenda: cella qualsiasi, a tenda (sopra) o a prato
+                visit(bytearray(state), [(free[0], GRASS)])
+
+        visit(bytearray(cells), ())
+        return solutions
+
+    def nearby(self, cells: bytearray) -> list[bytearray]:
+        """
+            Cerca una seconda soluzione vicina a quella nota (guide), prima della ricerca completa: nei puzzle
+            generati le soluzioni in più sono quasi sempre scambi di poche tende in un angolo della board.
+            Per ogni finestra WINDOW x WINDOW (a passi di WINDOW_STEP) fissa fuori dalla finestra la soluzione nota
+            e cerca dentro con al massimo WINDOW_NODES nodi: ogni soluzione trovata è una soluzione di tutta la board.
+            Ritorna le due soluzioni se ne trova un'altra, altrimenti [] (e la risposta la dà search).
+            I nodi usati qui non contano nel punteggio.
+        """
+        p = self.puzzle
+        known = bytearray(cells)
+        for i in _indices(cells, UNKNOWN):
+            known[i] = TENT if i in self.guide else GRASS
+        if not self.guide or not self.solved(known):
+            return []
+
+        nodes = self.nodes
+        starts = [sorted({min(k, max(side - WINDOW, 0)) for k in range(0, side, WINDOW_STEP)})
+                  for side in (p.columns, p.rows)]
+        for y0 in starts[1]:
+            for x0 in starts[0]:
+                state = bytearray(known)
+                for y in range(y0, min(y0 + WINDOW, p.rows)):
+                    for i in range(y * p.columns + x0, y * p.columns + min(x0 + WINDOW, p.columns)):
+                        if cells[i] == UNKNOWN:
+                            state[i] = UNKNOWN
+                if not self.propagate(state, TIERS[:3], record=False):
+                    continue
+                other = [found for found in self.search(state, budget=WINDOW_NODES) if found != known]
+                if other or self.exhausted:
+                    self.nodes = nodes
+                    return [known] + other[:1] if other else []
+        self.nodes = nodes
+        return []
+
+    def _free_around(self, cells: bytearray) -> Iterable[list[int]]:
+        """Per ogni albero senza tende attorno, le sue celle libere n4."""
+        for around in self.puzzle.tree_n4:
+            free = []
+            for n in around:
+                value = cells[n]
+                if value == TENT:
+                    break
+                if value == UNKNOWN:
+                    free.append(n)
+            else:
+                yield free
+
+    def _slack(self, cells: bytearray) -> list[int]:
+        """
+            Margine di ogni linea (indici di puzzle.lines): quante tende ci stanno ancora nei suoi tratti liberi
+            (come in segments) meno quante ne mancano. 0 vuol dire che ogni tratto libero è già pieno.
+        """
+        slack = []
+        for part, _, target in self.puzzle.lines:
+            values = cells[part]
+            runs = values.translate(_DECIDED_AS_GRASS).split(_GRASS)
+            slack.append(sum(map(_HALF_UP.__getitem__, map(len, runs))) - target + values.count(TENT))
+        return slack
+
+    def _branch_cells(self, cells: bytearray) -> list[int]:
+        """
+            Celle libere dell'albero senza tende attorno più vincolato (una di queste è la sua tenda):
+            quello con una cella sulla riga/colonna con meno margine (_slack), a parità quello con meno alternative.
+            Le celle che sono tende nella soluzione nota (guide) vengono prima: la ricerca arriva subito a quella
+            soluzione e cerca la seconda tra le sue varianti vicine, dove di solito sta.
+            Se ogni albero ha già una tenda vicina ritorna una sola cella libera, da provare a tenda e a prato.
+        """
+        cell_lines = self.puzzle.cell_lines
+        slack = self._slack(cells)
+        best: list[int] = []
+        score: tuple[int, int] | None = None
+        for free in self._free_around(cells):
+            if len(free) < 2:
+                continue
+            key = (min(slack[k] for i in free for k in cell_lines[i]), len(free))
+            if score is None or key < score:
+                best, score = free, key
+        if not best:
+            return [cells.index(UNKNOWN)]
+        return sorted(best, key=lambda i: i not in self.guide)
+
+
+def rate(columns: int,
+         rows: int,
+         trees: Iterable[tuple[int, int]],
+         columns_targets: Sequence[int],
+         rows_targets: Sequence[int],
+         max_nodes: int = MAX_NODES,
+         max_seconds: float = MAX_SECONDS,
+         solution: Iterable[tuple[int, int]] = ()) -> Rating:
+    """
+        Risolve il puzzle usando, nell'ordine, i livelli di deduzione TIERS:
+        conteggi di righe/colonne, prato attorno alle tende (n8), regole sugli alberi,
+        ipotesi alla hint() e, solo se tutto il resto non basta, la ricerca.
+        Si ferma dopo max_nodes nodi di ricerca o max_seconds secondi: in quel caso Rating.decided è False.
+        solution (le tende di una soluzione nota, se c'è) cambia solo l'ordine della ricerca, non il risultato.
+    """
+    start = time.perf_counter()
+    puzzle = _Puzzle(columns, rows, trees, columns_targets, rows_targets)
+    rater = _Rater(puzzle, max_nodes, start + max_seconds, (y * columns + x for x, y in solution))
+    cells = puzzle.initial()
+
+    solved = unique = False
+    if rater.propagate(cells, TIERS[:4]):
+        if rater.complete(cells):
+            # -> solo deduzioni certe: la soluzione è anche l'unica
+            solved = unique = True
+        elif not rater.exhausted:
+            rater.fires["search"] = 1
+            solutions = rater.nearby(cells) or rater.search(cells)
+            rater.deductions["search"] = cells.count(UNKNOWN) if solutions else 0
+            solved = bool(solutions)
+            unique = len(solutions) == 1 and not rater.exhausted
+
+    fires = rater.fires
+    score = sum(WEIGHTS[tier] * fires[tier] for tier in TIERS[:4]) + WEIGHTS["search"] * rater.nodes
+    used = [tier for tier in TIERS if fires[tier]]
+    label = LABELS[used[-1]] if used else "easy"
+    return Rating(
+        score=float(score),
+        label=label,
+        fires=dict(fires),
+        deductions=dict(rater.deductions),
+        nodes=rater.nodes,
+        solved=solved,
+        unique=unique,
+        seconds=time.perf_counter() - start,
+        decided=not rater.exhausted
+    )
+
+
+def rate_level(level, max_seconds: float = MAX_SECONDS) -> Rating:
+    """rate() per un Level (o qualsiasi oggetto con columns, lines, trees e target); le sue tende guidano la ricerca."""
+    return rate(level.columns, level.lines, level.trees, level.columns_targets, level.rows_targets,
+                max_seconds=max_seconds, solution=getattr(level, "correct_tents", ()))
+
+
+def rate_game(game) -> Rating:
+    """rate() per un Game: usa alberi e target della soluzione, ignora quello che ha piazzato il giocatore."""
+    return rate(game.columns, game.lines, game.trees, game.columns_targets, game.rows_targets,
+                solution=game.correct_tents)
+
+
+def rate_many(levels: Iterable, workers: int | None = None, max_seconds: float = MAX_SECONDS) -> list[Rating]:
+    """Valuta molti livelli in parallelo (un processo per worker); l'ordine del risultato è quello dei livelli."""
+    levels = list(levels)
+    if workers == 1 or len(levels) < 2:
+        return [rate_level(level, max_seconds) for level in levels]
+    # -> import locale: level.py importa questo modulo, e il motore non deve caricare multiprocessing
+    from concurrent.futures import ProcessPoolExecutor
+    with ProcessPoolExecutor(max_workers=workers) as executor:
+        return list(executor.map(rate, *zip(*((lv.columns, lv.lines, set(lv.trees), list(lv.columns_targets),
+                                               list(lv.rows_targets), MAX_NODES, max_seconds,
+                                               set(getattr(lv, "correct_tents", ()))) for lv in levels))))
+
+
+def main(argv: list[str] | None = None) -> None:
+    """Comando offline (python -m src.rate_levels): valuta tutti i livelli di una cartella e salva ratings.json."""
+    # -> import locale: file_management (tramite Level) importa già questo modulo
+    import argparse
+    from .file_management import DEFAULT, show_levels, write_ratings
+
+    parser = argparse.ArgumentParser(prog="rate_levels", description="Valuta la difficoltà dei livelli.")
+    parser.add_argument("folder", nargs="?", default=str(DEFAULT), help="cartella dei livelli")
+    parser.add_argument("--workers", type=int, default=os.cpu_count() or 1)
+    parser.add_argument("--max-seconds", type=float, default=MAX_SECONDS,
+                        help="tempo massimo per livello, poi la valutazione resta undecided (default: %(default)s)")
+    parser.add_argument("--dry-run", action="store_true", help="stampa le valutazioni senza salvare ratings.json")
+    args = parser.parse_args(argv)
+
+    folder = pathlib.Path(args.folder)
+    levels = show_levels(folder)
+    for level, rating in zip(levels, rate_many(levels, args.workers, args.max_seconds)):
+        level.rating = rating
+
+    for level in sorted(levels, key=lambda lv: lv.rating.score):
+        rating = level.rating
+        profile = " ".join(f"{tier}={rating.fires[tier]}/{rating.deductions[tier]}" for tier in TIERS)
+        status = "undecided" if not rating.decided else \
+            "unique" if rating.unique else ("solved" if rating.solved else "unsolved")
+        print(f"{level.path.name}\t{rating.label}\t{rating.score:.0f}\t{status}\t{rating.seconds:.2f}s\t{profile}")
+
+    if not args.dry_run and levels:
+        print(f"saved {write_ratings(levels, folder)}")
@@ -1,14 +1,23 @@
+from collections.abc import Iterable
 import pathlib
 import json
 
 from .level import Level
+from .difficulty import Rating
 
 
 DEFAULT = pathlib.Path(__file__).resolve().parent.parent.parent / "data" / "levels"
+SETTINGS = pathlib.Path(__file__).resolve().parents[2] / "data" / "settings.json"
+RATINGS = "ratings.json"
+PACK_SUFFIX = ".pack"
 
 
 def show_levels(path: pathlib.Path | str = DEFAULT) -> list[Level]:
-    """Scansiona la cartella dei livelli e carica tutti i file .txt come oggetti Level."""
+    """
+        Scansiona la cartella dei livelli e carica tutti i file .txt come oggetti Level.
+        Carica anche i livelli contenuti nei pack (*.pack, vedi read_pack).
+        Se nella cartella c'è ratings.json (scritto da write_ratings), i livelli ricevono già la loro valutazione.
+    """
     folder = pathlib.Path(path) if isinstance(path, str) else path
     if not folder.exists():
         return []
@@ -19,19 +28,118 @@ def show_levels(path: pathlib.Path | str = DEFAULT) -> list[Level]:
             levels.append(Level.from_file(file))
         except Exception as e:
             print(f"[skip] {file.name}: {e}")
+    for file in sorted(folder.glob(f"*{PACK_SUFFIX}")):
+        levels.extend(read_pack(file))
 
+    ratings = read_ratings(folder)
+    for level in levels:
+        entry = ratings.get(level.path.name)
+        # -> valutazione vecchia (il file è cambiato dopo): la si ignora e verrà ricalcolata
+        if entry is not None and entry.get("fingerprint") == level.fingerprint:
+            try:
+                level.rating = Rating(**entry["rating"])
+            except (KeyError, TypeError):
+                pass
+
+    return levels
+
+
+def library_files(paths: Iterable[pathlib.Path | str]) -> list[pathlib.Path]:
+    """File di livello da leggere: per le cartelle i .txt e poi i pack (in ordine di nome), gli altri path così come sono."""
+    files: list[pathlib.Path] = []
+    for path in map(pathlib.Path, paths):
+        if path.is_dir():
+            files.extend(sorted(path.glob("*.txt")))
+            files.extend(sorted(path.glob(f"*{PACK_SUFFIX}")))
+        else:
+            files.append(path)
+    return files
+
+
+def read_pack(path: pathlib.Path | str) -> list[Level]:
+    """
+        Legge un pack: più livelli nello stesso file, ognuno preceduto da una riga "@ nome".
+        Ogni blocco è nel formato di Level.from_file; il path dei livelli è "cartella del pack / nome".
+    """
+    file = pathlib.Path(path)
+    levels: list[Level] = []
+    for name, text in pack_blocks(file.read_text(encoding="utf-8")):
+        if not name:
+            print(f"[skip] {file.name}: data before the first '@' line")
+            continue
+        try:
+            levels.append(Level.from_text(text, file.parent / name))
+        except Exception as e:
+            print(f"[skip] {file.name}/{name}: {e}")
     return levels
 
 
-def read_settings():
-    """Legge il file data/settings.json e ritorna un dizionario con le impostazioni."""
-    path = pathlib.Path(__file__).resolve().parents[2] / "data" / "settings.json"
+def pack_blocks(text: str) -> list[tuple[str, str]]:
+    """Divide il testo di un pack in (nome, testo del livello). Righe non vuote prima del primo "@" -> blocco senza nome."""
+    blocks: list[tuple[str, list[str]]] = []
+    for line in text.splitlines():
+        if line.startswith("@"):
+            blocks.append((line[1:].strip(), []))
+        elif blocks:
+            blocks[-1][1].append(line)
+        elif line.strip():
+            blocks.append(("", [line]))
+    return [(name, "\n".join(lines)) for name, lines in blocks]
+
+
+def write_pack(levels: list[Level], path: pathlib.Path | str) -> pathlib.Path:
+    """Scrive i livelli in un unico pack (formato di read_pack) e ritorna il percorso scritto."""
+    file = pathlib.Path(path)
+    with open(file, "w", encoding="utf-8", newline="\n") as f:
+        for level in levels:
+            f.write(f"@ {level.path.name}\n")
+            f.write(level.to_text())
+    return file
+
+
+def read_ratings(path: pathlib.Path | str = DEFAULT) -> dict[str, dict]:
+    """Legge ratings.json della cartella dei livelli: nome file -> {fingerprint, rating}. Vuoto se manca."""
+    file = pathlib.Path(path) / RATINGS
+    try:
+        with open(file, "r", encoding="utf-8") as f:
+            data = json.load(f)
+    except FileNotFoundError:
+        return {}
+    except json.JSONDecodeError as e:
+        print(f"<file_management.py | Error parsing JSON: {e}>")
+        return {}
+    return data if isinstance(data, dict) else {}
+
+
+def write_ratings(levels: list[Level], path: pathlib.Path | str = DEFAULT) -> pathlib.Path:
+    """Salva le valutazioni dei livelli in ratings.json (nella cartella path), così il menu non le ricalcola."""
+    file = pathlib.Path(path) / RATINGS
+    data = read_ratings(path)
+    for level in levels:
+        data[level.path.name] = {"fingerprint": level.fingerprint, "rating": level.rating._asdict()}
+    with open(file, "w", encoding="utf-8") as f:
+        json.dump(dict(sorted(data.items())), f, indent=2)
+        f.write("\n")
+    return file
+
+
+def read_settings(path: pathlib.Path | str = SETTINGS, strict: bool = False) -> dict:
+    """
+        Legge il file data/settings.json e ritorna un dizionario con le impostazioni.
+        Il gioco non lo chiama direttamente: usa get_settings() di core/settings.py, che lo legge una volta sola.
+        Se il file manca o non è JSON valido ritorna {} (tutti i default); con strict solleva invece
+        OSError / ValueError, così chi ha già delle impostazioni può tenerle.
+    """
     try:
         with open(path, "r", encoding="utf-8") as file:
             return json.load(file)
     except FileNotFoundError:
+        if strict:
+            raise
         print(f"<file_management.py | File not found {path}>")
         return {}
     except json.JSONDecodeError as e:
+        if strict:
+            raise
         print(f"<file_management.py | Error parsing JSON: {e}>")
         return {}
\ No newline at end of file
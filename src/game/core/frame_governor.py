@@ -0,0 +1,146 @@
+from collections.abc import Callable
+import time
+
+
+class FrameGovernor:
+    """
+    Governatore del frame rate:
+    - misura il costo reale di ogni frame (begin_frame / end_frame attorno a App.tick)
+    - abbassa il frame rate quando i frame sforano il budget, e lo rialza quando c'è margine
+    - decide quando il lavoro non urgente può essere fatto (allow_deferred)
+    - espone i contatori: frame persi (missed_frames) e FPS ottenuti (achieved_fps)
+    - tiene conto del lavoro rimandato ancora da fare (pending), così il loop non va in attesa con dati vecchi
+    """
+
+    def __init__(self,
+                 fps: int = 30,
+                 min_fps: int = 15,
+                 step: int = 5,
+                 patience: int = 10,
+                 max_defer: int = 15,
+                 clock: Callable[[], float] = time.perf_counter) -> None:
+        self.target_fps = fps
+        self.min_fps = min(min_fps, fps)
+        self.step = step
+        self.patience = patience
+        self.max_defer = max_defer
+        self.clock = clock
+
+        self.fps = fps
+        self.frames = 0
+        self.missed_frames = 0
+        self.achieved_fps = 0.0
+        self.last_cost = 0.0
+
+        self._frame_start: float | None = None
+        self._last_start: float | None = None
+        self._overruns = 0
+        self._underruns = 0
+        self._deferred: dict[str, int] = {}
+
+    # ======== FRAME ========
+    def begin_frame(self) -> None:
+        """
+            Segna l'inizio di un frame e aggiorna la stima degli FPS ottenuti.
+            L'intervallo che segue una pausa (idle) non viene contato: misura solo i frame eseguiti di fila.
+        """
+        now = self.clock()
+        if self._last_start is not None and now > self._last_start:
+            current = 1 / (now - self._last_start)
+            self.achieved_fps = current if self.achieved_fps == 0 else 0.9 * self.achieved_fps + 0.1 * current
+        self._last_start = now
+        self._frame_start = now
+
+    def end_frame(self) -> None:
+        """
+            Segna la fine del frame e adatta il frame rate.
+
+            - costo > budget: frame perso; dopo `patience` frame persi di fila il rate scende di `step`
+            - costo < metà budget per 3 * `patience` frame di fila: il rate risale verso quello richiesto
+        """
+        if self._frame_start is None:
+            return
+
+        self.last_cost = self.clock() - self._frame_start
+        self._frame_start = None
+        self.frames += 1
+
+        if self.last_cost > self.budget:
+            self.missed_frames += 1
+            self._overruns += 1
+            self._underruns = 0
+            if self._overruns >= self.patience:
+                self.fps = max(self.min_fps, self.fps - self.step)
+                self._overruns = 0
+        elif self.last_cost < self.budget / 2:
+            self._underruns += 1
+            self._overruns = 0
+            if self._underruns >= 3 * self.patience:
+                self.fps = min(self.target_fps, self.fps + self.step)
+                self._underruns = 0
+        else:
+            self._overruns = 0
+            self._underruns = 0
+
+    def idle(self) -> None:
+        """Il loop sta per aspettare un input: il prossimo intervallo tra frame non va misurato."""
+        self._last_start = None
+
+    def frame_rate(self) -> int:
+        """Frame rate corrente, da passare al main_loop di g2d."""
+        return self.fps
+
+    # ======== LAVORO NON URGENTE ========
+    def spare(self) -> bool:
+        """True se l'ultimo frame ha lasciato almeno metà del budget libero."""
+        return self.last_cost < self.budget / 2
+
+    def allow_deferred(self, key: str) -> bool:
+        """
+            Dice se il lavoro non urgente identificato da key può essere fatto in questo frame.
+
+            Viene concesso nei frame con margine (spare); altrimenti viene rimandato, ma mai per più
+            di max_defer richieste di fila, così il risultato non resta indietro all'infinito.
+        """
+        if self.spare():
+            self._deferred.pop(key, None)
+            return True
+
+        waited = self._deferred.get(key, 0) + 1
+        if waited > self.max_defer:
+            self._deferred.pop(key, None)
+            return True
+
+        self._deferred[key] = waited
+        return False
+
+    # ======== PROPERTIES ========
+    @property
+    def pending(self) -> bool:
+        """True se c'è lavoro non urgente rimandato e non ancora eseguito."""
+        return bool(self._deferred)
+
+    @property
+    def budget(self) -> float:
+        """Tempo a disposizione per un frame (secondi) al frame rate corrente."""
+        return 1 / self.fps
+
+    @property
+    def fps(self) -> int:
+        return self.__fps
+    @fps.setter
+    def fps(self, value: int) -> None:
+        if not isinstance(value, int):
+            raise TypeError("fps must be an int")
+        if value <= 0:
+            raise ValueError("fps must be > 0")
+        self.__fps = value
+
+    @property
+    def clock(self) -> Callable[[], float]:
+        return self.__clock
+    @clock.setter
+    def clock(self, value: Callable[[], float]) -> None:
+        if not callable(value):
+            raise TypeError("clock must be a callable")
+        self.__clock = value
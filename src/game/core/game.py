@@ -5,7 +5,15 @@ from ..board_game import BoardGame
 
 from ..state import Action, CellState
 
+# -> versione dell'algoritmo di generate_board: va aumentata se, a parità di seed, la board generata cambia
+GENERATOR_VERSION = 2
+# -> versioni che generate_board sa ancora riprodurre (per i puzzle id già in giro)
+GENERATOR_VERSIONS = (1, 2)
+
 class Game(BoardGame):
+    # -> default per tutti i Game; il singolo Game può sovrascriverlo con il parametro debug_checks
+    debug_checks: bool = False
+
     def __init__(self,
                  columns: int = 5,
                  rows: int = 5,
@@ -13,7 +21,8 @@ class Game(BoardGame):
                  trees: Collection[tuple[int, int]] | None = None,
                  tents: Collection[tuple] | None = None,
                  rows_targets: list[int] | None = None,
-                 columns_targets: list[int] | None = None) -> None:
+                 columns_targets: list[int] | None = None,
+                 debug_checks: bool | None = None) -> None:
         """
             Crea una nuova partita/board di TentsAndTrees.
 
@@ -23,8 +32,20 @@ class Game(BoardGame):
 
             Nota: se passi alberi/tende ma la configurazione non rispetta i vincoli del gioco,
             qui viene rigenerata automaticamente una board valida.
+
+            debug_checks (se non None) vale solo per questo Game: con True anche il percorso
+            interno (_store) rivalida le coordinate, come i setter pubblici.
             """
 
+        if debug_checks is not None:
+            self.debug_checks = debug_checks
+
+        self.__version = 0
+        self.__cache: dict[str, tuple[int, object]] = {}
+        self.seed = None
+        self.generator_version = GENERATOR_VERSION
+        self.journal = []
+
         self.columns = columns
         self.lines = rows
 
@@ -78,10 +99,13 @@ class Game(BoardGame):
             - Action.PLACE_TENT: esegue le regole automatiche che piazzano tende certe.
             - Action.PLACE_SOLUTION: piazza tutta la soluzione (se disponibile) e riempie il resto di prato.
             - Action.SKIP: non fa niente.
+
+            Ogni azione (tranne SKIP) finisce in journal come (x, y, action), per i salvataggi.
         """
 
         if action is Action.SKIP:
             return
+        self.journal.append((x, y, action))
 
         if action is None or action == Action.NONE:
             pos = (x, y)
@@ -95,7 +119,7 @@ class Game(BoardGame):
                 self.grass.remove(pos)
             else:
                 self.tents.add(pos)
-
+            self._touch()
 
         elif action is Action.PLACE_GRASS:
             self._auto_grass()
@@ -104,13 +128,15 @@ class Game(BoardGame):
         elif action is Action.PLACE_SOLUTION:
             if not self.correct_tents: return
 
-            self.tents = self.correct_tents
+            self._store(tents=self.correct_tents)
 
             for i in range(self.lines):
                 for j in range(self.columns):
                     self.grass.add((j, i)) if (j, i) not in self.trees and (j, i) not in self.tents else None
+            self._touch()
         elif action is Action.PLACE_HINT:
             self.hint()
+            self._touch()
 
     def finished(self) -> bool:
         """
@@ -200,22 +226,24 @@ class Game(BoardGame):
         base_trees = set(self.trees or ())
 
         def restore() -> None:
-            self.tents = set(base_tents)
-            self.grass = set(base_grass)
+            self._store(tents=base_tents, grass=base_grass)
 
+        # -> modificano i set direttamente: _touch() tiene version (e le cache di progress/status) allineata
         def force_tent(x: int, y: int) -> None:
             pos = (x, y)
-            if pos in base_trees:
+            if pos in base_trees or pos in self.tents:
                 return
             self.grass.discard(pos)
             self.tents.add(pos)
+            self._touch()
 
         def force_grass(x: int, y: int) -> None:
             pos = (x, y)
-            if pos in base_trees:
+            if pos in base_trees or pos in self.grass:
                 return
             self.tents.discard(pos)
             self.grass.add(pos)
+            self._touch()
 
         def apply_automatism() -> None:
             # applica automatismi finché cambia qualcosa
@@ -295,7 +323,11 @@ class Game(BoardGame):
             - il valore viene normalizzato sul numero totale di tende corrette
 
             Torna None se non c'è una soluzione nota.
+            Il risultato è memorizzato e ricalcolato solo quando cambia version.
         """
+        return self._cached("progress", self._progress)
+
+    def _progress(self) -> float | None:
         if self.correct_tents:
             solution = 0
             for tent in self.tents:
@@ -316,10 +348,15 @@ class Game(BoardGame):
             - numero di tende piazzate rispetto al numero di alberi
 
             È pensata per essere leggibile durante il gioco.
+            Come progress(), viene ricalcolata solo quando cambia version.
         """
+        return self._cached("status", self._status)
+
+    def _status(self) -> str:
         strings = []
 
-        if self.progress() is not None: strings.append(f"Solution: {self.progress()*100:.2f}%")
+        progress = self.progress()
+        if progress is not None: strings.append(f"Solution: {progress*100:.2f}%")
 
         strings.append(f"Tents placed: {len(self.tents)}/{len(self.trees)}")
 
@@ -379,21 +416,46 @@ class Game(BoardGame):
                 if self.inside(nx, ny):
                     yield nx, ny
 
-    def generate_board(self, seed: int | None = None) -> None:
+    def generate_board(self, seed: int | None = None, version: int = GENERATOR_VERSION) -> None:
         """
             Genera una board casuale valida.
 
-            - prova a mettere un certo numero di tende in posizioni che NON si toccano (n8)
+            - mette tende in posizioni che NON si toccano (n8), puntando a 0.25 * colonne * righe coppie
             - per ogni tenda trova un albero adiacente (n4), 1 a 1, senza sovrapposizioni
             - salva la soluzione in correct_tents e gli alberi in trees
             - resetta i target così vengono ricalcolati dalla soluzione
 
-            Se non riesce a generare con la densità desiderata, abbassa gradualmente il numero
-            di coppie tenda-albero finché non trova qualcosa.
+            version sceglie l'algoritmo (vedi GENERATOR_VERSIONS): 2 (default) lavora in tempo lineare
+            ed è adatto anche a board enormi o rettangolari; 1 è il generatore originale, tenuto solo per
+            rigenerare le board dei vecchi puzzle id.
+
+            Con lo stesso seed e la stessa version la board è sempre la stessa; seed e version usati
+            restano in self.seed e self.generator_version (seed None se la generazione non era riproducibile).
         """
-        cols, rows = self.columns, self.lines
+        if version not in GENERATOR_VERSIONS:
+            raise ValueError(f"< Unknown generator version: {version} >")
         rng = random.Random() if seed is None else random.Random(seed)
 
+        tents, trees = self._generate_v1(rng) if version == 1 else self._generate_v2(rng)
+
+        # -> la board generata entra nel Game qui: validata una volta, poi salvata senza altri controlli
+        self._check_positions("correct_tents", tents)
+        self._check_positions("trees", trees, tuples_only=False)
+        self._store(correct_tents=tents, trees=trees)
+        self.seed = seed
+        self.generator_version = version
+
+        # -> obbliga il ricalcolo di __columns_targets e di __rows_targets
+        self.reset_targets()
+
+    def _generate_v1(self, rng: random.Random) -> tuple[set[tuple[int, int]], set[tuple[int, int]]]:
+        """
+            Generatore originale: mescola tutte le celle, piazza le tende e poi gli alberi; se un albero
+            non trova posto ricomincia da capo (fino a 400 volte), abbassando poi il numero di coppie.
+            Va bene solo per board piccole: già a 20x20 può richiedere decine di secondi.
+        """
+        cols, rows = self.columns, self.lines
+
         # -> coppie tenda-albero da generare
         desired_pairs = max(1, round(cols * rows * 0.25))
 
@@ -449,12 +511,70 @@ class Game(BoardGame):
         if tents is None or trees is None:
             raise RuntimeError("< Impossible to generate a board with input data >")
 
+        return tents, trees
 
-        self.correct_tents = sorted(tents)
-        self.trees = sorted(trees)
+    def _generate_v2(self, rng: random.Random) -> tuple[set[tuple[int, int]], set[tuple[int, int]]]:
+        """
+            Generatore lineare, un solo passaggio sulla board:
 
-        # -> obbliga il ricalcolo di __columns_targets e di __rows_targets
-        self.reset_targets()
+            - la board è divisa in blocchi 2x2 (in ognuno ci sta al massimo una tenda, per il vincolo n8),
+              visitati in ordine casuale
+            - due bytearray con un bordo di una cella fanno da griglia di occupazione: blocked (celle n8 di
+              una tenda) e taken (tende, alberi e bordo), quindi ogni controllo è una lettura per indice
+            - quando una tenda viene piazzata le viene subito assegnato un albero n4 libero; se non ce n'è,
+              si prova un'altra cella dello stesso blocco invece di ricominciare (riparazione locale)
+
+            Ogni blocco costa O(1), quindi il tempo è lineare nel numero di celle (a parte l'ordinamento
+            casuale dei blocchi, fatto con sort in C). La densità ottenuta è circa 0.19-0.23 coppie per cella.
+        """
+        cols, rows = self.columns, self.lines
+        width = cols + 2
+        desired_pairs = max(1, round(cols * rows * 0.25))
+
+        # -> bordo: né tende né alberi
+        blocked = bytearray(b"\x01" * width) + bytearray(width * rows) + bytearray(b"\x01" * width)
+        for y in range(1, rows + 1):
+            blocked[y * width] = blocked[y * width + width - 1] = 1
+        taken = bytearray(blocked)
+
+        rand = rng.random
+        blocks = [y * width + x for y in range(1, rows + 1, 2) for x in range(1, cols + 1, 2)]
+        keys = [rand() for _ in blocks]
+        corners = (0, 1, width, width + 1)
+        n4 = (-1, 1, -width, width)
+        ones = b"\x01\x01\x01"
+
+        tent_cells: list[int] = []
+        tree_cells: list[int] = []
+        for block in sorted(range(len(blocks)), key=keys.__getitem__):
+            # -> i bit bassi della chiave scelgono da quale cella del blocco e da quale direzione partire
+            bits = int(keys[block] * (1 << 24))
+            base = blocks[block]
+            for k in range(4):
+                cell = base + corners[(bits + k) & 3]
+                if blocked[cell] or taken[cell]:
+                    continue
+                for d in range(4):
+                    tree = cell + n4[((bits >> 2) + d) & 3]
+                    if not taken[tree]:
+                        break
+                else:
+                    continue
+                taken[cell] = taken[tree] = 1
+                tent_cells.append(cell)
+                tree_cells.append(tree)
+                blocked[cell - width - 1:cell - width + 2] = ones
+                blocked[cell - 1:cell + 2] = ones
+                blocked[cell + width - 1:cell + width + 2] = ones
+                break
+            if len(tent_cells) >= desired_pairs:
+                break
+
+        if not tent_cells:
+            raise RuntimeError("< Impossible to generate a board with input data >")
+
+        return ({(cell % width - 1, cell // width - 1) for cell in tent_cells},
+                {(cell % width - 1, cell // width - 1) for cell in tree_cells})
 
     def is_valid_board(self, trees: Collection[tuple[int, int]] | None = None,
                        tents: Collection[tuple[int, int]] | None = None) -> bool:
@@ -524,15 +644,77 @@ class Game(BoardGame):
     def _mark_grass(self, x: int, y: int) -> bool:
         if self._is_free(x, y):
             self.grass.add((x, y))
+            self._touch()
             return True
         return False
 
     def _mark_tent(self, x: int, y: int) -> bool:
         if self._can_place_tent(x, y):
             self.tents.add((x, y))
+            self._touch()
             return True
         return False
 
+    def _touch(self) -> None:
+        """Segnala che lo stato del gioco è cambiato (invalida i valori memorizzati)."""
+        self.__version += 1
+
+    def _cached(self, key: str, compute):
+        """Ritorna il valore memorizzato per key se è della version corrente, altrimenti lo ricalcola."""
+        hit = self.__cache.get(key)
+        if hit is not None and hit[0] == self.__version:
+            return hit[1]
+        value = compute()
+        self.__cache[key] = (self.__version, value)
+        return value
+
+    # ======== TRUSTED STATE ========
+    def _check_positions(self, name: str, positions: Collection[tuple[int, int]], tuples_only: bool = True) -> None:
+        """
+            Validazione delle coordinate usata dai setter pubblici (il confine "esterno": costruttore, livelli, utente).
+
+            Controlla che ogni elemento sia una tupla (x, y) dentro la board, altrimenti solleva
+            TypeError / ValueError con lo stesso messaggio dei setter.
+        """
+        columns, lines = range(self.columns), range(self.lines)
+        for t in positions:
+            if tuples_only and not isinstance(t, tuple):
+                raise TypeError(f"< {name} must be tuples >")
+            if len(t) != 2:
+                raise ValueError(f"< {name} must be tuples of length 2 >")
+            x, y = t
+            if x not in columns or y not in lines:
+                raise ValueError(f"< {name} contains coordinates outside the board: ({x}, {y}) >")
+
+    def _store(self,
+               *,
+               trees: Collection[tuple[int, int]] | None = None,
+               correct_tents: Collection[tuple[int, int]] | None = None,
+               tents: Collection[tuple[int, int]] | None = None,
+               grass: Collection[tuple[int, int]] | None = None) -> None:
+        """
+            Percorso interno "fidato" per sostituire interi insiemi di posizioni.
+
+            Lo usano solo le operazioni del motore (generate_board, hint, PLACE_SOLUTION), che producono
+            coordinate già dentro la board: quindi salta la validazione per elemento dei setter.
+            Gli insiemi lasciati a None non vengono toccati; version aumenta una volta sola.
+            Con Game.debug_checks = True i controlli completi vengono rifatti anche qui.
+        """
+        if self.debug_checks:
+            for name, positions in (("trees", trees), ("correct_tents", correct_tents), ("tents", tents), ("grass", grass)):
+                if positions is not None:
+                    self._check_positions(name, positions, tuples_only=name != "trees")
+
+        if trees is not None:
+            self.__trees = set(trees)
+        if correct_tents is not None:
+            self.__correct_tents = set(correct_tents)
+        if tents is not None:
+            self.__tents = set(tents)
+        if grass is not None:
+            self.__grass = set(grass)
+        self._touch()
+
     def reset_targets(self):
         """
             Forza il ricalcolo dei target di righe/colonne.
@@ -545,6 +727,7 @@ class Game(BoardGame):
             delattr(self, f'_{self.__class__.__name__}__columns_targets')
         if hasattr(self, f'_{self.__class__.__name__}__rows_targets'):
             delattr(self, f'_{self.__class__.__name__}__rows_targets')
+        self._touch()
 
 
     # ======== AUTOMATISMI ========
@@ -714,6 +897,17 @@ class Game(BoardGame):
                         changed = True
 
     # ======== PROPERTIES ========
+    @property
+    def version(self) -> int:
+        """
+            Numero che cresce a ogni modifica dello stato (tende, prato, alberi, soluzione).
+
+            Permette a chi legge il gioco (GUI, cache interne) di capire se qualcosa è cambiato
+            senza confrontare gli insiemi. Le modifiche fatte direttamente sui set (es. game.tents.add)
+            non lo aggiornano: passare da play() o dai setter.
+        """
+        return self.__version
+
     @property
     def board(self) -> list[list[CellState]]:
         cols, rows = self.columns, self.lines
@@ -747,6 +941,7 @@ class Game(BoardGame):
         if len(new) != self.columns:
             raise ValueError("< columns_targets must have the same length as columns >")
         self.__columns_targets: list[int] = new
+        self._touch()
 
     @property
     def rows_targets(self) -> list[int]:
@@ -769,6 +964,7 @@ class Game(BoardGame):
         if len(new) != self.lines:
             raise ValueError("< rows_targets must have the same length as lines >")
         self.__rows_targets: list[int] = new
+        self._touch()
 
     @property
     def solution_board(self) -> list[list[CellState]]:
@@ -780,6 +976,34 @@ class Game(BoardGame):
             board[y][x] = CellState.TENT
         return board
 
+    @property
+    def seed(self) -> int | None:
+        return self.__seed
+    @seed.setter
+    def seed(self, new: int | None) -> None:
+        if new is not None and (not isinstance(new, int) or new < 0):
+            raise TypeError("< seed must be a non-negative int or None >")
+        self.__seed = new
+
+    @property
+    def journal(self) -> list[tuple[int, int, Action | None]]:
+        """Mosse giocate con play(), in ordine: (x, y, action)."""
+        return self.__journal
+    @journal.setter
+    def journal(self, new: list[tuple[int, int, Action | None]]) -> None:
+        if not isinstance(new, list):
+            raise TypeError("< journal must be a list >")
+        self.__journal = new
+
+    @property
+    def generator_version(self) -> int:
+        return self.__generator_version
+    @generator_version.setter
+    def generator_version(self, new: int) -> None:
+        if new not in GENERATOR_VERSIONS:
+            raise ValueError(f"< Unknown generator version: {new} >")
+        self.__generator_version = new
+
     @property
     def columns(self) -> int:
         return self.__columns
@@ -804,13 +1028,9 @@ class Game(BoardGame):
     @trees.setter
     def trees(self, new: Collection[tuple[int, int]] | None) -> None:
         if new is not None:
-            for t in new:
-                if len(t) != 2:
-                    raise ValueError("< trees must be tuples of length 2 >")
-                x, y = t
-                if x not in range(self.columns) or y not in range(self.lines):
-                    raise ValueError(f"< trees contains coordinates outside the board: ({x}, {y}) >")
+            self._check_positions("trees", new, tuples_only=False)
         self.__trees = None if new is None else set(new)
+        self._touch()
 
     @property
     def correct_tents(self) -> set[tuple[int, int]] | None:
@@ -818,15 +1038,9 @@ class Game(BoardGame):
     @correct_tents.setter
     def correct_tents(self, new: Collection[tuple[int, int]] | None) -> None:
         if new is not None:
-            for t in new:
-                if not isinstance(t, tuple):
-                    raise TypeError("< correct_tents must be tuples >")
-                if len(t) != 2:
-                    raise ValueError("< correct_tents must be tuples of length 2 >")
-                x, y = t
-                if x not in range(self.columns) or y not in range(self.lines):
-                    raise ValueError(f"< correct_tents contains coordinates outside the board: ({x}, {y}) >")
+            self._check_positions("correct_tents", new)
         self.__correct_tents = None if new is None else set(new)
+        self._touch()
 
     @property
     def tents(self) -> set[tuple[int, int]] | None:
@@ -834,15 +1048,9 @@ class Game(BoardGame):
     @tents.setter
     def tents(self, new: Collection[tuple[int, int]] | None) -> None:
         if new is not None:
-            for t in new:
-                if not isinstance(t, tuple):
-                    raise TypeError("< tents must be tuples >")
-                if len(t) != 2:
-                    raise ValueError("< tents must be tuples of length 2 >")
-                x, y = t
-                if x not in range(self.columns) or y not in range(self.lines):
-                    raise ValueError(f"< tents contains coordinates outside the board: ({x}, {y}) >")
+            self._check_positions("tents", new)
         self.__tents = None if new is None else set(new)
+        self._touch()
 
     @property
     def grass(self) -> set[tuple[int, int]] | None:
@@ -850,19 +1058,13 @@ class Game(BoardGame):
     @grass.setter
     def grass(self, new: Collection[tuple[int, int]] | None) -> None:
         if new is not None:
-            for t in new:
-                if not isinstance(t, tuple):
-                    raise TypeError("< grass must be tuples >")
-                if len(t) != 2:
-                    raise ValueError("< grass must be tuples of length 2 >")
-                x, y = t
-                if x not in range(self.columns) or y not in range(self.lines):
-                    raise ValueError(f"< grass contains coordinates outside the board: ({x}, {y}) >")
+            self._check_positions("grass", new)
         self.__grass = None if new is None else set(new)
+        self._touch()
 
     # ======== CLASSMETHODS ========
     @classmethod
-    def init_from_level(cls, level) -> "Game":
+    def init_from_level(cls, level, debug_checks: bool | None = None) -> "Game":
         """
             Crea un Game partendo da un Level già parsato.
 
@@ -875,6 +1077,7 @@ class Game(BoardGame):
             trees=set(level.trees),
             tents=set(level.correct_tents),
             columns_targets=level.columns_targets,
-            rows_targets=level.rows_targets
+            rows_targets=level.rows_targets,
+            debug_checks=debug_checks
         )
         return game
@@ -0,0 +1,159 @@
+from __future__ import annotations
+from collections import deque
+from collections.abc import Callable
+from concurrent.futures import Executor, Future, ProcessPoolExecutor
+from concurrent.futures.process import BrokenProcessPool
+import random
+import time
+
+# CORE
+from .game import Game
+
+
+def generate_pair_lists(side: int, seed: int) -> tuple[list[tuple[int, int]], list[tuple[int, int]], float]:
+    """
+        Lavoro eseguito nel processo worker: genera una board side x side con quel seed.
+        Ritorna (alberi, tende, secondi impiegati); liste di tuple, così il passaggio tra processi costa poco.
+    """
+    start = time.perf_counter()
+    # -> board vuota (valida) e poi una sola generazione, con il seed scelto dal pool
+    game = Game(columns=side, rows=side, trees=(), tents=())
+    game.generate_board(seed)
+    return sorted(game.trees), sorted(game.correct_tents), time.perf_counter() - start
+
+
+class GeneratorPool:
+    """
+    Generatore di livelli random in background:
+    - per ogni lato tra min_side e max_side tiene una coda di board già generate (al massimo depth)
+    - le board vengono generate da un pool di processi (workers), mai nel thread del canvas
+    - service() raccoglie i risultati pronti e rimette in coda il lavoro mancante: va chiamato a ogni frame
+    - take() consegna subito una board pronta, oppure None se per quel lato non ce n'è ancora una
+    - espone le metriche: board in coda per lato (depths), in lavorazione (in_flight), latenza di generazione
+    """
+
+    def __init__(self,
+                 min_side: int = 8,
+                 max_side: int = 20,
+                 depth: int = 2,
+                 workers: int = 2,
+                 executor_factory: Callable[[int], Executor] | None = None,
+                 rng: random.Random | None = None) -> None:
+        if not isinstance(min_side, int) or not isinstance(max_side, int):
+            raise TypeError("min_side and max_side must be int")
+        if not 0 < min_side <= max_side:
+            raise ValueError("0 < min_side <= max_side is required")
+        if not isinstance(depth, int) or depth <= 0:
+            raise ValueError("depth must be an int > 0")
+        if not isinstance(workers, int) or workers <= 0:
+            raise ValueError("workers must be an int > 0")
+
+        self.min_side = min_side
+        self.max_side = max_side
+        self.depth = depth
+        self.workers = workers
+        self.executor_factory = executor_factory or (lambda n: ProcessPoolExecutor(max_workers=n))
+        self.rng = rng or random.Random()
+
+        self.generated = 0
+        self.failed = 0
+        self.last_latency = 0.0
+        self.latency = 0.0
+
+        self._executor: Executor | None = None
+        self._ready: dict[int, deque] = {side: deque() for side in self.sides}
+        self._futures: dict[Future, tuple[int, int]] = {}
+
+    # ======== METHODS ========
+    def service(self) -> None:
+        """Raccoglie le board finite e avvia quelle che mancano per riempire le code. Non blocca."""
+        self._collect()
+        self._refill()
+
+    def take(self, side: int | None = None, debug_checks: bool | None = None) -> Game | None:
+        """
+            Ritorna un Game già generato e toglie la board dalla coda; None se non ce n'è uno pronto.
+            Con side None sceglie a caso tra i lati che hanno almeno una board pronta.
+        """
+        record = self.take_record(side)
+        if record is None:
+            return None
+        side, seed, trees, tents = record
+        game = Game(columns=side, rows=side, trees=trees, tents=tents, debug_checks=debug_checks)
+        game.seed = seed
+        return game
+
+    def take_record(self, side: int | None = None) -> tuple[int, int, list, list] | None:
+        """Come take, ma ritorna la board grezza (lato, seed, alberi, tende), per esempio da salvare su disco."""
+        self._collect()
+        if side is None:
+            ready = [s for s, queue in self._ready.items() if queue]
+            if not ready:
+                return None
+            side = self.rng.choice(ready)
+
+        queue = self._ready.get(side)
+        if not queue:
+            return None
+
+        seed, trees, tents = queue.popleft()
+        self._refill()
+        return side, seed, trees, tents
+
+    def close(self) -> None:
+        """Ferma il pool di processi, scartando il lavoro non ancora iniziato."""
+        if self._executor is not None:
+            self._executor.shutdown(wait=False, cancel_futures=True)
+            self._executor = None
+        self._futures.clear()
+
+    # ======== HELPERS ========
+    def _collect(self) -> None:
+        for future in [f for f in self._futures if f.done()]:
+            side, seed = self._futures.pop(future)
+            if future.cancelled() or future.exception() is not None:
+                self.failed += 1
+                continue
+            trees, tents, elapsed = future.result()
+            self._ready[side].append((seed, trees, tents))
+            self.generated += 1
+            self.last_latency = elapsed
+            self.latency = elapsed if self.generated == 1 else 0.9 * self.latency + 0.1 * elapsed
+
+    def _refill(self) -> None:
+        in_flight = self._in_flight_by_side()
+        for side in self.sides:
+            missing = self.depth - len(self._ready[side]) - in_flight.get(side, 0)
+            for _ in range(missing):
+                if self._executor is None:
+                    self._executor = self.executor_factory(self.workers)
+                seed = self.rng.getrandbits(32)
+                try:
+                    future = self._executor.submit(generate_pair_lists, side, seed)
+                except (BrokenProcessPool, RuntimeError):
+                    # -> pool rotto (worker morto): lo si ricrea al prossimo service()
+                    self.failed += 1
+                    self.close()
+                    return
+                self._futures[future] = side, seed
+
+    def _in_flight_by_side(self) -> dict[int, int]:
+        counts: dict[int, int] = {}
+        for side, _ in self._futures.values():
+            counts[side] = counts.get(side, 0) + 1
+        return counts
+
+    # ======== PROPERTIES ========
+    @property
+    def sides(self) -> range:
+        return range(self.min_side, self.max_side + 1)
+
+    @property
+    def depths(self) -> dict[int, int]:
+        """Board pronte in coda, per lato."""
+        return {side: len(queue) for side, queue in self._ready.items()}
+
+    @property
+    def in_flight(self) -> int:
+        """Board in generazione in questo momento (inviate al pool e non ancora raccolte)."""
+        return len(self._futures)
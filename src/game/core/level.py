@@ -1,5 +1,11 @@
+import hashlib
+import itertools
+import operator
 import pathlib
 
+# CORE
+from .difficulty import Rating, rate_level
+
 
 def _char_to_target(char: str) -> int:
     """Converte un carattere del file livello in un numero target."""
@@ -10,6 +16,51 @@ def _char_to_target(char: str) -> int:
     raise ValueError(f"Invalid target char: {char}")
 
 
+def _target_to_char(target: int) -> str:
+    """Inverso di _char_to_target: la cifra del target. Target più grandi di 9 non sono esprimibili."""
+    if 0 <= target <= 9:
+        return str(target)
+    raise ValueError(f"Target {target} cannot be written in the level format (max 9)")
+
+
+# -> formato esteso: prima riga "#tents <versione>"
+FORMAT_MAGIC = b"#tents"
+FORMAT_VERSION = 2
+
+_DIGITS = b"0123456789"
+_CELLS = bytes.maketrans(b"t", b"T")
+_ONLY_ONES = bytes(1 if i == 1 else 0 for i in range(256))
+
+
+def _parse_digits(data: bytes, path: pathlib.Path, what: str) -> list[int]:
+    """Target del formato classico: una cifra (o '.') per target."""
+    digits = data.replace(b".", b"0")
+    if digits.translate(None, _DIGITS):
+        char = next(chr(c) for c in digits if c not in _DIGITS)
+        raise ValueError(f"{path.name}: invalid target char {char!r} in {what}")
+    return [c - 48 for c in digits]
+
+
+def _parse_numbers(data: bytes, path: pathlib.Path, what: str) -> list[int]:
+    """Target del formato esteso: numeri separati da spazi o virgole."""
+    try:
+        numbers = [int(item) for item in data.replace(b",", b" ").split()]
+    except ValueError:
+        raise ValueError(f"{path.name}: invalid {what}: {data.decode(errors='replace')}") from None
+    if not numbers or any(n < 0 for n in numbers):
+        raise ValueError(f"{path.name}: invalid {what}: {data.decode(errors='replace')}")
+    return numbers
+
+
+def _find_cells(grid: bytes, char: bytes, columns: int) -> set[tuple[int, int]]:
+    """Coordinate (x, y) di tutte le occorrenze di char nella griglia (righe concatenate, larghe columns)."""
+    # -> maschera 0/1 con translate, indici con compress, coordinate con map: nessun ciclo Python per cella
+    mask = grid.translate(bytes.maketrans(char, b"\x01").translate(_ONLY_ONES))
+    indexes = list(itertools.compress(range(len(grid)), mask))
+    width = itertools.repeat(columns)
+    return set(zip(map(operator.mod, indexes, width), map(operator.floordiv, indexes, width)))
+
+
 class Level:
     def __init__(
         self,
@@ -29,9 +80,10 @@ class Level:
         self.rows_targets = rows_targets
         self.trees = trees or set()
         self.correct_tents = correct_tents or set()
+        self.rating = None
 
     def __str__(self) -> str:
-        return f"< {self.__class__.__name__} | {self.path.name}, {self.difficulty}, {self.columns}x{self.lines} >"
+        return f"< {self.__class__.__name__} | {self.path.name}, {self.declared_difficulty}, {self.columns}x{self.lines} >"
 
     def __repr__(self) -> str:
         return str(self)
@@ -41,9 +93,9 @@ class Level:
             return True
         if not isinstance(other, Level):
             return NotImplemented
+        # -> conta solo il puzzle, non il file da cui arriva (per le simmetrie: puzzle_hash)
         return (
-                self.path.resolve() == other.path.resolve()
-                and self.columns == other.columns
+                self.columns == other.columns
                 and self.lines == other.lines
                 and self.columns_targets == other.columns_targets
                 and self.rows_targets == other.rows_targets
@@ -52,7 +104,6 @@ class Level:
 
     def __hash__(self) -> int:
         return hash((
-            self.path.resolve(),
             self.columns,
             self.lines,
             tuple(self.columns_targets),
@@ -144,77 +195,166 @@ class Level:
                 raise TypeError("correct_tent coordinates must be int")
         self.__correct_tents = value
 
+    @property
+    def rating(self) -> Rating:
+        """
+            Valutazione del rater (difficulty.rate), calcolata alla prima richiesta e poi tenuta in memoria.
+            Il calcolo può durare fino a difficulty.MAX_SECONDS: dove non si può aspettare (il menu) controllare prima rated.
+        """
+        if self.__rating is None:
+            self.__rating = rate_level(self)
+        return self.__rating
+    @rating.setter
+    def rating(self, value: Rating | None) -> None:
+        if value is not None and not isinstance(value, Rating):
+            raise TypeError("rating must be Rating or None")
+        self.__rating = value
+
+    @property
+    def rated(self) -> bool:
+        """True se la valutazione c'è già (da ratings.json o già calcolata): leggere rating non costa niente."""
+        return self.__rating is not None
+
     @property
     def difficulty(self) -> str:
-        """Prova a ricavare la difficoltà dal nome file."""
+        """Difficoltà misurata dal rater (easy / medium / hard / expert)."""
+        return self.rating.label
+
+    @property
+    def declared_difficulty(self) -> str:
+        """Difficoltà dichiarata nel nome file, che può non corrispondere a quella misurata."""
         # tents-2025-11-27-8x8-easy.txt -> "easy"
         stem = self.path.stem
         if "-" not in stem:
             return "unknown"
         return stem.split("-")[-1].lower()
 
+    @property
+    def fingerprint(self) -> str:
+        """Impronta del contenuto (dimensioni, target, alberi): se cambia il file, cambia l'impronta."""
+        content = f"{self.columns}x{self.lines}|{self.columns_targets}|{self.rows_targets}|{sorted(self.trees)}"
+        return hashlib.sha1(content.encode("utf-8")).hexdigest()
+
     # ======== PARSING ========
     @classmethod
     def from_file(cls, path: pathlib.Path | str) -> "Level":
         """
             Carica e interpreta un file di livello (.txt) e lo trasforma in un oggetto Level.
 
-            Formato atteso:
+            Formato classico (versione 1):
             - prima riga: un carattere char + target colonne (cifre o '.')
             - righe successive: target riga + griglia lunga quanto le colonne
               * '.' = vuoto
               * 'T' = albero
               * '^' = tenda soluzione
+
+            Formato esteso (versione 2, per board grandi con target da più cifre):
+            - prima riga: "#tents 2"
+            - seconda riga: i target delle colonne, separati da spazi (o virgole)
+            - righe successive: target riga, uno spazio, poi la griglia come nel formato classico
         """
         p = pathlib.Path(path)
-        raw: list[str] = [line.strip() for line in p.read_text(encoding="utf-8").splitlines() if line.strip()]
-        if len(raw) < 2:
-            raise ValueError(f"{p.name}: file must contain at least 2 lines")
+        return cls.from_bytes(p.read_bytes(), p)
 
-        header = raw[0]
-        if len(header) < 2:
-            raise ValueError(f"{p.name}: invalid header line: {header}")
-
-        col_targets = [_char_to_target(ch) for ch in header[1:]]
-        cols = len(col_targets)
+    @classmethod
+    def from_text(cls, text: str, path: pathlib.Path | str) -> "Level":
+        """Come from_file, ma legge il livello da una stringa (path serve solo come nome, per esempio dentro un pack)."""
+        return cls.from_bytes(text.encode("utf-8"), path)
 
-        grid_lines = raw[1:]
-        rows = len(grid_lines)
+    @classmethod
+    def from_bytes(cls, data: bytes, path: pathlib.Path | str) -> "Level":
+        """
+            Parser dei due formati di from_file, direttamente sui bytes: le righe della griglia vengono
+            controllate con bytes.translate e gli alberi/le tende cercati con bytes.find, senza un ciclo per cella.
+        """
+        p = pathlib.Path(path)
+        raw = [line.strip() for line in data.removeprefix(b"\xef\xbb\xbf").split(b"\n")]
+        raw = [line for line in raw if line]
 
-        row_targets: list[int] = []
-        trees: set[tuple[int, int]] = set()
-        tents: set[tuple[int, int]] = set()
+        if raw and raw[0].startswith(FORMAT_MAGIC):
+            version = raw[0][len(FORMAT_MAGIC):].strip()
+            if version != b"2":
+                raise ValueError(f"{p.name}: unsupported level format version {version.decode(errors='replace')!r}")
+            if len(raw) < 3:
+                raise ValueError(f"{p.name}: file must contain at least 3 lines")
+            col_targets = _parse_numbers(raw[1], p, "column targets")
+            grid_lines, row_targets = [], []
+            for y, line in enumerate(raw[2:]):
+                target, _, cells = line.partition(b" ")
+                row_targets.append(_parse_numbers(target, p, f"row {y} target")[0])
+                grid_lines.append(cells.strip())
+        else:
+            if len(raw) < 2:
+                raise ValueError(f"{p.name}: file must contain at least 2 lines")
+            header = raw[0]
+            if len(header) < 2:
+                raise ValueError(f"{p.name}: invalid header line: {header.decode(errors='replace')}")
+            col_targets = _parse_digits(header[1:], p, "column targets")
+            grid_lines = [line[1:] for line in raw[1:]]
+            row_targets = _parse_digits(bytes(line[0] for line in raw[1:]), p, "row targets")
 
+        cols, rows = len(col_targets), len(grid_lines)
         for y, line in enumerate(grid_lines):
-            if len(line) != 1 + cols:
-                raise ValueError(f"{p.name}: row {y} length {len(line)} != {1 + cols} ({line})")
-
-            row_targets.append(_char_to_target(line[0]))
+            if len(line) != cols:
+                raise ValueError(f"{p.name}: row {y} has {len(line)} cells != {cols} ({line.decode(errors='replace')})")
 
-            for x, char in enumerate(line[1:]):
-                if char == ".":
-                    continue
-                if char.upper() == "T":
-                    trees.add((x, y))
-                elif char == "^":
-                    tents.add((x, y))
-                else:
-                    raise ValueError(f"{p.name}: invalid cell char {char!r} at {(x, y)}")
+        # -> una sola stringa con tutta la griglia: gli indici di find diventano (x, y) con divmod
+        grid = b"".join(grid_lines).translate(_CELLS)
+        bad = grid.translate(None, b".T^")
+        if bad:
+            index = next(i for i, char in enumerate(grid) if char not in b".T^")
+            raise ValueError(f"{p.name}: invalid cell char {chr(grid[index])!r} at {(index % cols, index // cols)}")
 
         lvl = cls(
             path=p,
             columns=cols,
             lines=rows,
             columns_targets=col_targets,
-            rows_targets=row_targets,
-            trees=trees,
-            correct_tents=tents
+            rows_targets=row_targets
         )
+        # -> coordinate costruite qui, già valide: si saltano i controlli per elemento dei setter
+        lvl.__trees = _find_cells(grid, b"T", cols)
+        lvl.__correct_tents = _find_cells(grid, b"^", cols)
+        return lvl
+
+    @classmethod
+    def from_game(cls, game, path: pathlib.Path | str) -> "Level":
+        """Level con alberi, soluzione e target di un Game (per esempio appena generato), da salvare in path."""
+        return cls(
+            path=path,
+            columns=game.columns,
+            lines=game.lines,
+            columns_targets=list(game.columns_targets),
+            rows_targets=list(game.rows_targets),
+            trees=set(game.trees),
+            correct_tents=set(game.correct_tents)
+        )
+
+    # ======== WRITING ========
+    def to_text(self, version: int | None = None) -> str:
+        """
+            Il livello nel formato letto da from_text / from_file. Con version None usa il formato classico (1)
+            quando tutti i target hanno una cifra, altrimenti quello esteso (2).
+        """
+        if version is None:
+            version = 1 if max((*self.columns_targets, *self.rows_targets), default=0) <= 9 else FORMAT_VERSION
+        if version not in (1, FORMAT_VERSION):
+            raise ValueError(f"Unknown level format version {version}")
 
-        # -> coerenza targets vs dimensioni
-        if len(lvl.columns_targets) != lvl.columns:
-            raise ValueError(f"{p.name}: columns_targets length mismatch")
-        if len(lvl.rows_targets) != lvl.lines:
-            raise ValueError(f"{p.name}: rows_targets length mismatch")
+        grid = []
+        for y in range(self.lines):
+            grid.append("".join("T" if (x, y) in self.trees else "^" if (x, y) in self.correct_tents else "."
+                                for x in range(self.columns)))
+        if version == 1:
+            rows = ["." + "".join(_target_to_char(t) for t in self.columns_targets)]
+            rows += [_target_to_char(target) + cells for target, cells in zip(self.rows_targets, grid)]
+        else:
+            rows = [f"{FORMAT_MAGIC.decode()} {FORMAT_VERSION}", " ".join(map(str, self.columns_targets))]
+            rows += [f"{target} {cells}" for target, cells in zip(self.rows_targets, grid)]
+        return "\n".join(rows) + "\n"
 
-        return lvl
\ No newline at end of file
+    def save(self, path: pathlib.Path | str | None = None) -> pathlib.Path:
+        """Scrive il livello in path (di default nel suo path) e ritorna il percorso scritto."""
+        p = pathlib.Path(path) if path is not None else self.path
+        p.write_text(self.to_text(), encoding="utf-8", newline="\n")
+        return p
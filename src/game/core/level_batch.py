@@ -0,0 +1,233 @@
+from __future__ import annotations
+from collections.abc import Callable, Iterable
+from concurrent.futures import ProcessPoolExecutor
+import argparse
+import datetime
+import hashlib
+import json
+import os
+import pathlib
+import random
+import time
+
+# CORE
+from .difficulty import LABELS, Rating, rate_game
+from .file_management import write_pack, write_ratings
+from .game import Game, GENERATOR_VERSION
+from .level import Level
+from .puzzle_hash import canonical_hash
+from .puzzle_id import PuzzleId, SEED_BITS
+
+
+UNRATED = "unrated"
+BANDS = tuple(dict.fromkeys(LABELS.values()))      # easy, medium, hard, expert
+
+Pairs = list[tuple[int, int]]
+
+
+def derive_seed(root: int, index: int) -> int:
+    """
+        Seed del job numero index, ricavato da (root, index) con un hash: ogni job ha un seed indipendente
+        e riproducibile, che non dipende da quanti worker ci sono né dall'ordine in cui finiscono.
+    """
+    digest = hashlib.blake2b(f"{root}:{index}".encode("ascii"), digest_size=8).digest()
+    return int.from_bytes(digest, "little") % (1 << SEED_BITS)
+
+
+def generate_level_job(columns: int, rows: int, seed: int, rated: bool = True) -> tuple[Pairs, Pairs, Rating | None, float]:
+    """
+        Lavoro del worker: genera una board columns x rows con quel seed e, se rated, la valuta.
+        Ritorna (alberi, tende, valutazione o None, secondi di generazione).
+    """
+    game = Game(columns=columns, rows=rows, trees=(), tents=())
+    start = time.perf_counter()
+    game.generate_board(seed)
+    elapsed = time.perf_counter() - start
+    return sorted(game.trees), sorted(game.correct_tents), rate_game(game) if rated else None, elapsed
+
+
+def level_name(puzzle_id: PuzzleId, label: str) -> str:
+    """Nome file di un livello generato, nello stile di data/levels: tents-<id>-<colonne>x<righe>-<difficoltà>.txt"""
+    version, _, seed = str(puzzle_id).split("-")
+    return f"tents-v{version}_{seed}-{puzzle_id.columns}x{puzzle_id.rows}-{label}.txt"
+
+
+def generate_levels(sizes: Iterable[tuple[int, int]],
+                    count: int,
+                    bands: Iterable[str] | None = None,
+                    workers: int = 1,
+                    root_seed: int | None = None,
+                    unique: bool = True,
+                    max_attempts: int | None = None,
+                    folder: pathlib.Path | str = ".",
+                    progress: Callable[[int, int], None] | None = None) -> tuple[list[Level], dict]:
+    """
+        Genera count livelli per ogni dimensione (colonne, righe) usando un pool di processi.
+
+        - bands: difficoltà accettate (etichette del rater); None = qualsiasi
+        - unique: scarta i puzzle con più di una soluzione
+        - i doppioni (stessa impronta canonica, anche ruotati o specchiati) vengono sempre scartati
+        - max_attempts: board da provare al massimo per dimensione (default 50 * count)
+        Ritorna i livelli (con path dentro folder e rating già impostato) e il manifest con seed e tempi.
+    """
+    bands = set(bands) if bands is not None else None
+    if bands is not None and not bands <= set(BANDS):
+        raise ValueError(f"< Unknown difficulty bands: {sorted(bands - set(BANDS))} >")
+    if not isinstance(count, int) or count <= 0:
+        raise ValueError("count must be an int > 0")
+
+    rated = unique or bands is not None
+    root_seed = random.getrandbits(64) if root_seed is None else root_seed
+    max_attempts = max_attempts or 50 * count
+    folder = pathlib.Path(folder)
+
+    start = time.perf_counter()
+    levels: list[Level] = []
+    entries: list[dict] = []
+    attempts = rejected = index = 0
+    seen: set[str] = set()
+
+    executor = ProcessPoolExecutor(max_workers=workers) if workers > 1 else None
+    try:
+        for columns, rows in sizes:
+            needed, tried = count, 0
+            accepted = evaluated = 0
+            while needed > 0 and tried < max_attempts:
+                # -> primo giro di assaggio, poi tante board quante ne servono con la frazione accettata finora (+10%)
+                if evaluated:
+                    batch = int(needed * evaluated / (accepted + 1) * 1.1) + 1
+                else:
+                    batch = min(needed, 16 * workers)
+                batch = min(max(batch, workers), max_attempts - tried)
+                seeds = [derive_seed(root_seed, index + i) for i in range(batch)]
+                jobs = ([columns] * batch, [rows] * batch, seeds, [rated] * batch)
+                results = executor.map(generate_level_job, *jobs, chunksize=max(1, batch // (4 * workers))) \
+                    if executor is not None else map(generate_level_job, *jobs)
+
+                for i, (seed, (trees, tents, rating, seconds)) in enumerate(zip(seeds, results)):
+                    if needed == 0:
+                        break
+                    evaluated += 1
+                    if (unique and not rating.unique) or (bands is not None and rating.label not in bands):
+                        rejected += 1
+                        continue
+
+                    columns_targets, rows_targets = [0] * columns, [0] * rows
+                    for x, y in tents:
+                        columns_targets[x] += 1
+                        rows_targets[y] += 1
+                    fingerprint = canonical_hash(columns, rows, trees, columns_targets, rows_targets)
+                    if fingerprint in seen:
+                        rejected += 1
+                        continue
+                    seen.add(fingerprint)
+                    needed -= 1
+                    accepted += 1
+
+                    label = rating.label if rating else UNRATED
+                    puzzle_id = PuzzleId(GENERATOR_VERSION, columns, rows, seed)
+                    level = Level(path=folder / level_name(puzzle_id, label), columns=columns, lines=rows,
+                                  columns_targets=columns_targets, rows_targets=rows_targets,
+                                  trees=set(trees), correct_tents=set(tents))
+                    level.rating = rating
+                    levels.append(level)
+                    entries.append({
+                        "file": level.path.name,
+                        "puzzle_id": str(puzzle_id),
+                        "index": index + i,
+                        "seed": seed,
+                        "hash": fingerprint,
+                        "size": f"{columns}x{rows}",
+                        "difficulty": label,
+                        "score": rating.score if rating else None,
+                        "unique": rating.unique if rating else None,
+                        "generate_seconds": round(seconds, 6),
+                        "rate_seconds": round(rating.seconds, 6) if rating else None,
+                    })
+
+                index += batch
+                tried += batch
+                attempts += batch
+                if progress is not None:
+                    progress(len(levels), attempts)
+    finally:
+        if executor is not None:
+            executor.shutdown()
+
+    manifest = {
+        "generator_version": GENERATOR_VERSION,
+        "root_seed": root_seed,
+        "created": datetime.datetime.now().isoformat(timespec="seconds"),
+        "count": count,
+        "bands": sorted(bands) if bands is not None else None,
+        "unique": unique,
+        "rated": rated,
+        "workers": workers,
+        "attempts": attempts,
+        "rejected": rejected,
+        "seconds": round(time.perf_counter() - start, 3),
+        "levels": entries,
+    }
+    return levels, manifest
+
+
+def _parse_size(text: str) -> tuple[int, int]:
+    """'12' -> (12, 12), '16x12' -> (16, 12)."""
+    try:
+        columns, _, rows = text.lower().partition("x")
+        size = int(columns), int(rows or columns)
+    except ValueError:
+        raise argparse.ArgumentTypeError(f"invalid size {text!r} (use 12 or 16x12)")
+    if min(size) <= 0:
+        raise argparse.ArgumentTypeError(f"invalid size {text!r}")
+    return size
+
+
+def main(argv: list[str] | None = None) -> None:
+    """Comando offline (python -m src.generate_levels): genera livelli in blocco e li salva con il loro manifest."""
+    parser = argparse.ArgumentParser(prog="generate_levels", description="Genera livelli nel formato di data/levels.")
+    parser.add_argument("--size", type=_parse_size, action="append", required=True,
+                        help="dimensione, per esempio 12 o 16x12 (ripetibile)")
+    parser.add_argument("--count", type=int, default=10, help="livelli per ogni dimensione")
+    parser.add_argument("--difficulty", choices=BANDS, action="append",
+                        help="difficoltà accettata (ripetibile); di default qualsiasi")
+    parser.add_argument("--allow-ambiguous", action="store_true", help="accetta anche puzzle con più soluzioni")
+    parser.add_argument("--max-attempts", type=int, default=None, help="board da provare al massimo per dimensione")
+    parser.add_argument("--workers", type=int, default=os.cpu_count() or 1)
+    parser.add_argument("--seed", type=int, default=None, help="seed radice (di default casuale, salvato nel manifest)")
+    parser.add_argument("--out", default=".", help="cartella di destinazione")
+    parser.add_argument("--pack", default=None, help="scrive un unico pack con questo nome invece di un file per livello")
+    args = parser.parse_args(argv)
+
+    folder = pathlib.Path(args.out)
+    folder.mkdir(parents=True, exist_ok=True)
+
+    def progress(done: int, attempts: int) -> None:
+        print(f"\r{done} levels ({attempts} boards tried)", end="", flush=True)
+
+    levels, manifest = generate_levels(args.size, args.count, args.difficulty, args.workers, args.seed,
+                                       unique=not args.allow_ambiguous, max_attempts=args.max_attempts,
+                                       folder=folder, progress=progress)
+    print()
+
+    if args.pack:
+        written = write_pack(levels, folder / args.pack)
+        manifest["pack"] = written.name
+        manifest_path = written.with_suffix(".manifest.json")
+    else:
+        for level in levels:
+            level.save()
+        manifest_path = folder / "manifest.json"
+
+    # -> le valutazioni sono già pronte: show_levels le ritrova in ratings.json senza ricalcolarle
+    if manifest["rated"]:
+        write_ratings(levels, folder)
+
+    with open(manifest_path, "w", encoding="utf-8") as f:
+        json.dump(manifest, f, indent=2)
+        f.write("\n")
+
+    missing = len(args.size) * args.count - len(levels)
+    print(f"{len(levels)} levels in {manifest['seconds']}s ({manifest['rejected']} boards rejected), manifest {manifest_path}")
+    if missing:
+        print(f"{missing} levels missing: raise --max-attempts or widen --difficulty")
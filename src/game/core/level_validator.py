@@ -0,0 +1,226 @@
+from __future__ import annotations
+from collections.abc import Iterable
+from concurrent.futures import ProcessPoolExecutor
+import argparse
+import datetime
+import json
+import os
+import pathlib
+import time
+
+# CORE
+from .difficulty import MAX_SECONDS, rate_level
+from .file_management import PACK_SUFFIX, library_files, pack_blocks
+from .level import Level
+
+
+N4 = ((1, 0), (-1, 0), (0, 1), (0, -1))
+
+
+def check_rules(level: Level) -> list[str]:
+    """
+        Controlla che la soluzione (^) del livello rispetti le regole e i target. Ritorna la lista degli errori.
+
+        - alberi e tende dentro la board, nessuna tenda sopra un albero
+        - tende per riga/colonna uguali ai target
+        - tende non adiacenti in N8
+        - ogni albero ha la sua tenda in N4 e viceversa (abbinamento uno a uno)
+    """
+    errors: list[str] = []
+    trees, tents = level.trees, level.correct_tents
+
+    def inside(x: int, y: int) -> bool:
+        return 0 <= x < level.columns and 0 <= y < level.lines
+
+    errors += [f"tree {cell} outside the board" for cell in sorted(trees) if not inside(*cell)]
+    errors += [f"tent {cell} outside the board" for cell in sorted(tents) if not inside(*cell)]
+    errors += [f"tent {cell} on a tree" for cell in sorted(tents & trees)]
+    if errors:
+        return errors
+
+    if not tents:
+        return ["no solution in the file (no '^' cells)"]
+
+    for x, target in enumerate(level.columns_targets):
+        placed = sum(1 for tx, _ in tents if tx == x)
+        if placed != target:
+            errors.append(f"column {x}: target {target}, solution has {placed} tents")
+    for y, target in enumerate(level.rows_targets):
+        placed = sum(1 for _, ty in tents if ty == y)
+        if placed != target:
+            errors.append(f"row {y}: target {target}, solution has {placed} tents")
+
+    for x, y in sorted(tents):
+        for dx in (-1, 0, 1):
+            for dy in (-1, 0, 1):
+                other = (x + dx, y + dy)
+                if (dx, dy) != (0, 0) and other in tents and other > (x, y):
+                    errors.append(f"tents {(x, y)} and {other} touch (N8)")
+
+    if len(trees) != len(tents):
+        errors.append(f"{len(trees)} trees but {len(tents)} tents")
+
+    # -> abbinamento albero/tenda (cammini aumentanti): ogni albero deve avere una tenda sua in N4
+    pair: dict[tuple[int, int], tuple[int, int]] = {}
+
+    def assign(tree: tuple[int, int], seen: set) -> bool:
+        for dx, dy in N4:
+            tent = (tree[0] + dx, tree[1] + dy)
+            if tent in tents and tent not in seen:
+                seen.add(tent)
+                if tent not in pair or assign(pair[tent], seen):
+                    pair[tent] = tree
+                    return True
+        return False
+
+    unmatched = [tree for tree in sorted(trees) if not assign(tree, set())]
+    errors += [f"tree {tree} has no tent of its own (N4)" for tree in unmatched]
+    errors += [f"tent {tent} has no tree of its own (N4)" for tent in sorted(tents - pair.keys())]
+    return errors
+
+
+def validate_level(level: Level, solve: bool = True, max_seconds: float = MAX_SECONDS) -> dict:
+    """
+        Valida un livello già letto: regole, target e (con solve) risolvibilità e unicità con il rater.
+        Se il rater si ferma sul limite (max_seconds o nodi) prima di decidere, il livello non fallisce:
+        la voce ha "undecided" True e nessun errore per unicità/risolvibilità.
+    """
+    start = time.perf_counter()
+    errors = check_rules(level)
+    rules_time = time.perf_counter() - start
+
+    entry = {
+        "level": level.path.name,
+        "size": f"{level.columns}x{level.lines}",
+        "ok": False,
+        "errors": errors,
+        "undecided": False,
+        "difficulty": None,
+        "score": None,
+        "timings": {"rules": round(rules_time, 6)},
+    }
+    if solve:
+        rating = rate_level(level, max_seconds)
+        entry["difficulty"] = rating.label
+        entry["score"] = rating.score
+        entry["timings"]["solve"] = round(rating.seconds, 6)
+        if not rating.decided:
+            entry["undecided"] = True
+        elif not rating.solved:
+            errors.append("no solution")
+        elif not rating.unique:
+            errors.append("more than one solution")
+
+    entry["ok"] = not errors
+    return entry
+
+
+def validate_file(path: pathlib.Path | str, solve: bool = True, max_seconds: float = MAX_SECONDS) -> dict:
+    """
+        Valida un file di livello (.txt) o un pack: lavoro eseguito nel processo worker.
+        Ritorna la voce del report per il file, con una voce per ogni livello e i tempi.
+    """
+    file = pathlib.Path(path)
+    start = time.perf_counter()
+    report = {"file": str(file), "ok": False, "errors": [], "levels": []}
+
+    try:
+        text = file.read_text(encoding="utf-8")
+    except (OSError, UnicodeDecodeError) as e:
+        report["errors"].append(f"unreadable: {e}")
+        report["seconds"] = round(time.perf_counter() - start, 6)
+        return report
+
+    # -> un pack è una lista di blocchi "@ nome"; un file .txt è un solo blocco
+    blocks = pack_blocks(text) if file.suffix == PACK_SUFFIX else [(file.name, text)]
+    for name, block in blocks:
+        if not name:
+            report["errors"].append("syntax: data before the first '@' line")
+            continue
+        parse_start = time.perf_counter()
+        try:
+            level = Level.from_text(block, file.parent / name)
+        except ValueError as e:
+            report["levels"].append({"level": name, "ok": False, "errors": [f"syntax: {e}"],
+                                     "timings": {"parse": round(time.perf_counter() - parse_start, 6)}})
+            continue
+        parse_time = time.perf_counter() - parse_start
+        entry = validate_level(level, solve, max_seconds)
+        entry["timings"] = {"parse": round(parse_time, 6)} | entry["timings"]
+        report["levels"].append(entry)
+
+    report["ok"] = not report["errors"] and bool(report["levels"]) and all(e["ok"] for e in report["levels"])
+    if not report["levels"] and not report["errors"]:
+        report["errors"].append("no levels in the file")
+    report["seconds"] = round(time.perf_counter() - start, 6)
+    return report
+
+
+def validate_paths(paths: Iterable[pathlib.Path | str], workers: int = 1, solve: bool = True,
+                   max_seconds: float = MAX_SECONDS) -> dict:
+    """
+        Valida tutti i livelli di cartelle (file .txt e pack), pack e file singoli, un file per job nel pool di processi.
+        Ritorna il report completo (vedi main) con il riepilogo in "summary".
+    """
+    files = library_files(paths)
+
+    start = time.perf_counter()
+    jobs = ([str(file) for file in files], [solve] * len(files), [max_seconds] * len(files))
+    if workers > 1 and len(files) > 1:
+        with ProcessPoolExecutor(max_workers=workers) as executor:
+            reports = list(executor.map(validate_file, *jobs))
+    else:
+        reports = list(map(validate_file, *jobs))
+
+    levels = [entry for report in reports for entry in report["levels"]]
+    return {
+        "created": datetime.datetime.now().isoformat(timespec="seconds"),
+        "summary": {
+            "files": len(reports),
+            "failed_files": sum(1 for report in reports if not report["ok"]),
+            "levels": len(levels),
+            "failed_levels": sum(1 for entry in levels if not entry["ok"]),
+            "undecided_levels": sum(1 for entry in levels if entry.get("undecided")),
+            "ok": all(report["ok"] for report in reports),
+            "solve": solve,
+            "workers": workers,
+            "seconds": round(time.perf_counter() - start, 3),
+        },
+        "files": reports,
+    }
+
+
+def main(argv: list[str] | None = None) -> None:
+    """
+        Comando offline (python -m src.validate_levels): valida una libreria di livelli prima di pubblicarla.
+        Esce con codice 1 se almeno un livello non è valido.
+    """
+    parser = argparse.ArgumentParser(prog="validate_levels", description="Valida livelli e pack.")
+    parser.add_argument("paths", nargs="+", help="cartelle di livelli, pack o file .txt")
+    parser.add_argument("--report", default=None, help="file JSON in cui salvare il report completo")
+    parser.add_argument("--workers", type=int, default=os.cpu_count() or 1)
+    parser.add_argument("--no-solve", action="store_true", help="salta risolvibilità e unicità (solo sintassi e regole)")
+    parser.add_argument("--max-seconds", type=float, default=MAX_SECONDS,
+                        help="tempo massimo del rater per livello, poi il livello resta undecided (default: %(default)s)")
+    args = parser.parse_args(argv)
+
+    report = validate_paths(args.paths, args.workers, solve=not args.no_solve, max_seconds=args.max_seconds)
+    for file_report in report["files"]:
+        for error in file_report["errors"]:
+            print(f"{file_report['file']}: {error}")
+        for entry in file_report["levels"]:
+            for error in entry["errors"]:
+                print(f"{file_report['file']} :: {entry['level']}: {error}")
+            if entry.get("undecided"):
+                print(f"{file_report['file']} :: {entry['level']}: undecided (rater limit reached, not an error)")
+
+    if args.report:
+        with open(args.report, "w", encoding="utf-8") as f:
+            json.dump(report, f, indent=2)
+            f.write("\n")
+
+    summary = report["summary"]
+    print(f"{summary['levels'] - summary['failed_levels']}/{summary['levels']} levels valid "
+          f"({summary['undecided_levels']} undecided) in {summary['files']} files ({summary['seconds']}s)")
+    if not summary["ok"]:
+        raise SystemExit(1)
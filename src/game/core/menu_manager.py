@@ -1,9 +1,15 @@
 from typing import TYPE_CHECKING
+from tkinter import TclError
+import threading
 
 # CORE
 if TYPE_CHECKING: from .app import App
-from .file_management import show_levels
+from .difficulty import rate_level
+from .file_management import show_levels, write_ratings
 from .level import Level
+from .puzzle_id import PuzzleId
+from .save_game import Snapshot
+from .startup_profile import span
 from .menu_window import MenuWindow
 
 # STATE
@@ -11,24 +17,31 @@ from ..state import AppPhase
 from ..state import MenuPhase
 
 
+# -> ordine del menu per i livelli non ancora valutati: difficoltà dichiarata nel nome file (le altre in fondo)
+DECLARED_ORDER = {"easy": 0, "medium": 1, "hard": 2, "expert": 3}
 
 
 class MenuManager:
     """
     Manager logico del menu:
-    - apre una finestra tkinter quando richiesto
-    - memorizza il livello scelto (selected_level_data)
+    - apre una finestra tkinter quando richiesto, senza bloccare il loop dell'App:
+      la finestra viene "pompata" con update() a ogni tick (niente mainloop)
+    - memorizza il livello scelto (selected_level_data): un Level, un PuzzleId, uno Snapshot (Resume) o None (Random)
     - aggiorna MenuPhase
     - comunica all'App modificandone app_phase
+    - valuta in un thread i livelli che non hanno una valutazione in ratings.json (mai nel thread di Tk)
     """
 
     def __init__(self, master: "App") -> None:
         self.master = master
         self.phase = MenuPhase.MAIN
         self.selected_level_data = None
-        self.levels = show_levels()
+        with span("levels"):
+            self.levels = show_levels()
 
         self._menu_open = False
+        self._window: MenuWindow | None = None
+        self.rating_thread = self.rate_in_background()
 
     # ======== FROM MENU_WINDOW ========
     def start_game(self) -> None:
@@ -41,21 +54,68 @@ class MenuManager:
     # ======== METHODS ========
     def open_level_menu(self) -> None:
         """
-        Apre la finestra tkinter e aspetta una scelta.
+        Apre la finestra tkinter e ritorna subito: la scelta arriva nei tick successivi (pump()).
         La finestra stessa imposterà selected_level_data e chiamerà start_game/quit.
         """
         self._menu_open = True
-        win = MenuWindow(app=self.master, menu_manager=self)
-        win.mainloop()
-        self._menu_open = False
+        self._window = MenuWindow(app=self.master, menu_manager=self)
+
+    def pump(self) -> None:
+        """
+        Elabora gli eventi tkinter in sospeso della finestra del menu (una volta per frame).
+        Se la finestra è stata chiusa (scelta fatta o chiusa dall'utente) il menu torna chiuso.
+        """
+        win = self._window
+        if win is None:
+            return
+        if not win.closed:
+            try:
+                win.update()
+            except TclError:
+                win.closed = True
+        if win.closed:
+            self._window = None
+            self._menu_open = False
 
     def set_home(self) -> None:
         self.phase = MenuPhase.MAIN
 
+    def ordered_levels(self) -> list[Level]:
+        """
+        Livelli nell'ordine del menu: per punteggio del rater se sono tutti valutati,
+        altrimenti (valutazione ancora in corso) per difficoltà dichiarata nel nome file; a parità, i più piccoli prima.
+        """
+        if all(level.rated for level in self.levels):
+            return sorted(self.levels, key=lambda lv: (lv.rating.score, lv.columns + lv.lines))
+        return sorted(self.levels, key=lambda lv: (DECLARED_ORDER.get(lv.declared_difficulty, len(DECLARED_ORDER)),
+                                                   lv.columns + lv.lines))
+
+    def rate_in_background(self) -> threading.Thread | None:
+        """
+        Valuta in un thread i livelli senza valutazione e la salva in ratings.json, per le aperture successive.
+        Ritorna il thread, o None se erano già tutti valutati.
+        """
+        missing = [level for level in self.levels if not level.rated]
+        if not missing:
+            return None
+        thread = threading.Thread(target=self._rate, args=(missing,), name="level-rater", daemon=True)
+        thread.start()
+        return thread
+
+    def _rate(self, levels: list[Level]) -> None:
+        for level in levels:
+            level.rating = rate_level(level)
+        try:
+            write_ratings(levels, levels[0].path.parent)
+        except OSError as e:
+            # -> cartella in sola lettura: le valutazioni restano solo in memoria, per questa sessione
+            print(f"<menu_manager.py | Cannot save ratings: {e}>")
+
     # ======== TICK ========
     def tick(self, keys: list[str], cursor_pos: tuple[float, float]) -> None:
         if self.phase is MenuPhase.MAIN and not self._menu_open:
             self.open_level_menu()
+        self.pump()
 
     # ======== PROPERTIES ========
     @property
@@ -76,10 +136,10 @@ class MenuManager:
 
     # -> from menu_window
     @property
-    def selected_level_data(self) -> Level | None:
+    def selected_level_data(self) -> Level | PuzzleId | Snapshot | None:
         return self.__selected_level_data
     @selected_level_data.setter
-    def selected_level_data(self, value: Level | None) -> None:
+    def selected_level_data(self, value: Level | PuzzleId | Snapshot | None) -> None:
         self.__selected_level_data = value
 
     @property
@@ -2,24 +2,23 @@ from typing import TYPE_CHECKING
 import tkinter as tk
 
 # CORE
-from .file_management import show_levels, read_settings
+from .puzzle_id import PuzzleId
+from .settings import get_settings
 if TYPE_CHECKING: from .app import App; from .menu_manager import MenuManager
 
 
-levels = show_levels()
-settings = read_settings()
-
 class MenuWindow(tk.Tk):
     """
         Interfaccia grafica del menu principale.
         - Gestisce graficamente la scelta di un livello.
-        - Gestisce la chiusura della finestra.
+        - Gestisce la chiusura della finestra (closed diventa True).
+        - Non ha un mainloop proprio: il MenuManager la aggiorna con update() a ogni tick.
         - Comunica con il MenuManager e App attraverso metodi e properties.
     """
 
     def __init__(self, app: "App", menu_manager: "MenuManager", *args, **kwargs) -> None:
         """
-            Crea la finestra del menu e la prepara per essere usata come "blocco" principale.
+            Crea la finestra del menu; gli eventi vengono elaborati dal MenuManager (update()).
 
             Qui:
             - centra la finestra
@@ -28,17 +27,17 @@ class MenuWindow(tk.Tk):
             - costruisce tutta la UI (_build_ui())
         """
         super().__init__(*args, **kwargs)
-        global settings
-        menu_window_settings = settings.get("menu_window", {})
+        menu_window_settings = get_settings().menu_window
 
         self.app = app
         self.menu_manager = menu_manager
+        self.closed = False
 
         self.title("TentsAndTrees | Cecchelani Diego - 386276")
         self.protocol("WM_DELETE_WINDOW", self._on_quit)
 
         # -> posizione e dimensioni
-        self.w, self.h = menu_window_settings.get("width", 420), menu_window_settings.get("height", 520)
+        self.w, self.h = menu_window_settings.width, menu_window_settings.height
         self.update_idletasks()
         screen_w = self.winfo_screenwidth()
         screen_h = self.winfo_screenheight()
@@ -65,11 +64,12 @@ class MenuWindow(tk.Tk):
 
             Contiene:
             - titolo e regole
-            - lista dei livelli (un bottone per file)
-            - due pulsanti in basso: Random e Quit
+            - lista dei livelli (un bottone per file), dal più facile al più difficile
+            - tre pulsanti in basso: Resume (attivo solo se c'è una partita salvata), Random e Quit
+            - un campo per l'id di un puzzle generato, con il pulsante Load ID
 
             La logica è solo di "impaginazione".
-            Ogni bottone delega a _on_level_selected / _on_random / _on_quit.
+            Ogni bottone delega a _on_level_selected / _on_resume / _on_random / _on_quit / _on_puzzle_id.
         """
         root = tk.Frame(self, padx=14, pady=14)
         root.grid(row=0, column=0, sticky="nsew")
@@ -99,8 +99,12 @@ class MenuWindow(tk.Tk):
         levels_frame.grid_columnconfigure(0, weight=1)
 
         # BUTTONS
-        for i, lvl in enumerate(sorted(levels, key=lambda x: x.columns + x.lines)):
-            label = f"{lvl.difficulty} {lvl.columns}x{lvl.lines}"
+        # -> livelli già caricati dal MenuManager, nel suo ordine; qui il rater non gira mai (solo valutazioni pronte)
+        for i, lvl in enumerate(self.menu_manager.ordered_levels()):
+            if lvl.rated:
+                label = f"{lvl.difficulty} ({lvl.rating.score:.0f}) {lvl.columns}x{lvl.lines}"
+            else:
+                label = f"{lvl.declared_difficulty} {lvl.columns}x{lvl.lines}"
             btn = tk.Button(
                 master=levels_frame,
                 text=label,
@@ -114,14 +118,35 @@ class MenuWindow(tk.Tk):
         # BOTTOM
         bottom = tk.Frame(root)
         bottom.grid(row=3, column=0, sticky="ew", pady=(10, 0))
-        bottom.grid_columnconfigure((0, 1), weight=1)
+        bottom.grid_columnconfigure((0, 1, 2), weight=1)
+
+        # RESUME + RANDOM + QUIT
+        saves = getattr(self.app, "saves", None)
+        resume_btn = tk.Button(bottom, text="Resume", command=self._on_resume, bg="lightgreen", fg="black",
+                               state="normal" if saves is not None and saves.exists else "disabled")
+        resume_btn.grid(row=0, column=0, sticky="nsew", padx=(0, 5), ipady=5)
 
-        # RANDOM + QUIT
         random_btn = tk.Button(bottom, text="Random", command=self._on_random, bg="lightblue", fg="black")
-        random_btn.grid(row=0, column=0, sticky="nsew", padx=(0, 5), ipady=5)
+        random_btn.grid(row=0, column=1, sticky="nsew", padx=5, ipady=5)
 
         quit_btn = tk.Button(bottom, text="Quit", command=self._on_quit, bg="red", fg="white")
-        quit_btn.grid(row=0, column=1, sticky="nsew", padx=(5, 0), ipady=5)
+        quit_btn.grid(row=0, column=2, sticky="nsew", padx=(5, 0), ipady=5)
+
+        # PUZZLE ID
+        by_id = tk.Frame(root)
+        by_id.grid(row=4, column=0, sticky="ew", pady=(10, 0))
+        by_id.grid_columnconfigure(0, weight=1)
+
+        self.puzzle_id_var = tk.StringVar(master=self)
+        entry = tk.Entry(by_id, textvariable=self.puzzle_id_var)
+        entry.grid(row=0, column=0, sticky="nsew", padx=(0, 5))
+        entry.bind("<Return>", lambda _event: self._on_puzzle_id())
+
+        load_btn = tk.Button(by_id, text="Load ID", command=self._on_puzzle_id)
+        load_btn.grid(row=0, column=1, sticky="nsew")
+
+        self.puzzle_id_error = tk.Label(by_id, text="", fg="red", font=("Consolas", 8))
+        self.puzzle_id_error.grid(row=1, column=0, columnspan=2, sticky="w")
 
     # ======== BUTTONS COMMANDS ========
     def _on_level_selected(self, level) -> None:
@@ -129,10 +154,28 @@ class MenuWindow(tk.Tk):
         self.menu_manager.start_game()
         self._close()
 
+    def _on_resume(self) -> None:
+        try:
+            snapshot = self.app.saves.load()
+        except (OSError, ValueError):
+            snapshot = None
+        if snapshot is None:
+            self.puzzle_id_error.config(text="Cannot resume: the saved game is missing or damaged")
+            return
+        self._on_level_selected(snapshot)
+
     def _on_random(self) -> None:
         level = None
         self._on_level_selected(level)
 
+    def _on_puzzle_id(self) -> None:
+        try:
+            puzzle_id = PuzzleId.parse(self.puzzle_id_var.get())
+        except ValueError:
+            self.puzzle_id_error.config(text="Invalid puzzle id (example: 1-12x12-3KZ8Q1)")
+            return
+        self._on_level_selected(puzzle_id)
+
     def _on_quit(self) -> None:
         self.menu_manager.quit()
         self._close()
@@ -140,6 +183,7 @@ class MenuWindow(tk.Tk):
     # ======== HELPERS ========
     def _close(self) -> None:
         """Chiude la finestra Tkinter in modo corretto."""
+        self.closed = True
         try:
             self.grab_release()
         except Exception:
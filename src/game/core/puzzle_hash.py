@@ -0,0 +1,152 @@
+from __future__ import annotations
+from collections.abc import Iterable, Sequence
+from functools import lru_cache
+import argparse
+import hashlib
+import pathlib
+import struct
+
+# CORE
+from .file_management import PACK_SUFFIX, library_files, read_pack, write_pack
+from .level import Level
+
+
+# -> le 8 simmetrie del rettangolo: (trasposta, specchio orizzontale, specchio verticale)
+TRANSFORMS = tuple((swap, flip_x, flip_y) for swap in (False, True) for flip_x in (False, True) for flip_y in (False, True))
+DIMENSIONS = struct.Struct(">HHB")      # colonne, righe, byte per target
+
+
+@lru_cache(maxsize=64)
+def _tables(columns: int, rows: int) -> tuple[list[int], tuple[list[int], ...]]:
+    """Potenze di 2 per ogni cella e, per ogni trasformazione, dove finisce la cella i (indice riga per riga)."""
+    powers = [1 << i for i in range(columns * rows)]
+    tables = []
+    for swap, flip_x, flip_y in TRANSFORMS:
+        new_columns, new_rows = (rows, columns) if swap else (columns, rows)
+        table = []
+        for y in range(rows):
+            for x in range(columns):
+                nx, ny = (y, x) if swap else (x, y)
+                if flip_x:
+                    nx = new_columns - 1 - nx
+                if flip_y:
+                    ny = new_rows - 1 - ny
+                table.append(ny * new_columns + nx)
+        tables.append(table)
+    return powers, tuple(tables)
+
+
+def canonical_key(columns: int,
+                  rows: int,
+                  trees: Iterable[tuple[int, int]],
+                  columns_targets: Sequence[int],
+                  rows_targets: Sequence[int]) -> bytes:
+    """
+        Codifica compatta del puzzle (dimensioni, target, alberi come bitmap) nella sua forma canonica:
+        la più piccola tra le codifiche delle 8 rotazioni/riflessioni. Due puzzle uguali a meno di
+        una simmetria hanno la stessa chiave; la soluzione (tende) non conta.
+    """
+    powers, tables = _tables(columns, rows)
+    cells = [y * columns + x for x, y in trees]
+    width = 1 if max(max(columns_targets, default=0), max(rows_targets, default=0)) < 256 else 2
+    size = (columns * rows + 7) // 8
+
+    def encode(targets: Sequence[int]) -> bytes:
+        return bytes(targets) if width == 1 else b"".join(t.to_bytes(2, "big") for t in targets)
+
+    # -> target già codificati, nei due versi: (dritto, rovesciato)
+    columns_bytes = encode(columns_targets), encode(columns_targets[::-1])
+    rows_bytes = encode(rows_targets), encode(rows_targets[::-1])
+    dimensions = DIMENSIONS.pack(columns, rows, width), DIMENSIONS.pack(rows, columns, width)
+
+    best = None
+    for (swap, flip_x, flip_y), table in zip(TRANSFORMS, tables):
+        # -> con la trasposta le righe diventano colonne; lo specchio rovescia l'ordine dei target
+        new_columns = rows_bytes if swap else columns_bytes
+        new_rows = columns_bytes if swap else rows_bytes
+        bits = sum(map(powers.__getitem__, map(table.__getitem__, cells)))
+        key = dimensions[swap] + new_columns[flip_x] + new_rows[flip_y] + bits.to_bytes(size, "big")
+        if best is None or key < best:
+            best = key
+    return best
+
+
+def canonical_hash(columns: int,
+                   rows: int,
+                   trees: Iterable[tuple[int, int]],
+                   columns_targets: Sequence[int],
+                   rows_targets: Sequence[int]) -> str:
+    """Impronta (32 caratteri esadecimali) della chiave canonica: stessa impronta = stesso puzzle a meno di simmetrie."""
+    key = canonical_key(columns, rows, trees, columns_targets, rows_targets)
+    return hashlib.blake2b(key, digest_size=16).hexdigest()
+
+
+def level_hash(level: Level) -> str:
+    """canonical_hash per un Level."""
+    return canonical_hash(level.columns, level.lines, level.trees, level.columns_targets, level.rows_targets)
+
+
+# ======== DEDUPE ========
+def load_library(paths: Iterable[pathlib.Path | str]) -> list[tuple[pathlib.Path, Level]]:
+    """Carica i livelli da cartelle (file .txt e pack), pack e singoli file: lista di (file di origine, livello)."""
+    files = library_files(paths)
+
+    library: list[tuple[pathlib.Path, Level]] = []
+    for file in files:
+        if file.suffix == PACK_SUFFIX:
+            library.extend((file, level) for level in read_pack(file))
+            continue
+        try:
+            library.append((file, Level.from_file(file)))
+        except Exception as e:
+            print(f"[skip] {file.name}: {e}")
+    return library
+
+
+def find_duplicates(library: Iterable[tuple[pathlib.Path, Level]]) -> list[list[tuple[pathlib.Path, Level]]]:
+    """Gruppi di livelli con la stessa impronta canonica (solo i gruppi con almeno 2 livelli), nell'ordine di arrivo."""
+    groups: dict[str, list[tuple[pathlib.Path, Level]]] = {}
+    for source, level in library:
+        groups.setdefault(level_hash(level), []).append((source, level))
+    return [group for group in groups.values() if len(group) > 1]
+
+
+def remove_duplicates(groups: list[list[tuple[pathlib.Path, Level]]]) -> int:
+    """
+        Tiene il primo livello di ogni gruppo e toglie gli altri: i file .txt vengono cancellati,
+        i pack riscritti senza i livelli doppi. Ritorna quanti livelli sono stati tolti.
+    """
+    drop_files: set[pathlib.Path] = set()
+    drop_from_pack: dict[pathlib.Path, set[str]] = {}
+    for group in groups:
+        for source, level in group[1:]:
+            if source.suffix == PACK_SUFFIX:
+                drop_from_pack.setdefault(source, set()).add(level.path.name)
+            else:
+                drop_files.add(source)
+
+    for file in drop_files:
+        file.unlink(missing_ok=True)
+    for pack, names in drop_from_pack.items():
+        write_pack([lv for lv in read_pack(pack) if lv.path.name not in names], pack)
+    return len(drop_files) + sum(len(names) for names in drop_from_pack.values())
+
+
+def main(argv: list[str] | None = None) -> None:
+    """Comando offline (python -m src.dedupe_levels): trova i livelli doppi (anche ruotati o specchiati)."""
+    parser = argparse.ArgumentParser(prog="dedupe_levels", description="Trova i livelli duplicati a meno di simmetrie.")
+    parser.add_argument("paths", nargs="+", help="cartelle di livelli, pack o file .txt")
+    parser.add_argument("--delete", action="store_true", help="tiene il primo livello di ogni gruppo e toglie gli altri")
+    args = parser.parse_args(argv)
+
+    library = load_library(args.paths)
+    groups = find_duplicates(library)
+    for group in groups:
+        print(level_hash(group[0][1]))
+        for source, level in group:
+            print(f"\t{source}" + (f" :: {level.path.name}" if source.suffix == PACK_SUFFIX else ""))
+
+    duplicates = sum(len(group) - 1 for group in groups)
+    print(f"{len(library)} levels, {duplicates} duplicates in {len(groups)} groups")
+    if args.delete and duplicates:
+        print(f"removed {remove_duplicates(groups)} levels")
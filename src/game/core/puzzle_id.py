@@ -0,0 +1,82 @@
+from __future__ import annotations
+from typing import NamedTuple
+import random
+
+# CORE
+from .game import Game, GENERATOR_VERSION, GENERATOR_VERSIONS
+
+
+# -> alfabeto base32 di Crockford: niente I, L, O, U (si confondono con 1, 1, 0, V)
+ALPHABET = "0123456789ABCDEFGHJKMNPQRSTVWXYZ"
+_DECODE = {char: value for value, char in enumerate(ALPHABET)} | {"O": 0, "I": 1, "L": 1}
+
+SEED_BITS = 32
+
+
+def _encode_seed(seed: int) -> str:
+    text = ""
+    while True:
+        seed, digit = divmod(seed, 32)
+        text = ALPHABET[digit] + text
+        if seed == 0:
+            return text
+
+
+def _decode_seed(text: str) -> int:
+    seed = 0
+    for char in text:
+        if char not in _DECODE:
+            raise ValueError(f"< Invalid character in puzzle id: {char!r} >")
+        seed = seed * 32 + _DECODE[char]
+    return seed
+
+
+class PuzzleId(NamedTuple):
+    """
+        Identificativo compatto di una board generata: versione del generatore, dimensioni e seed.
+
+        Come stringa è "VERSIONE-COLONNExRIGHE-SEED" (seed in base32), per esempio "1-12x12-3KZ8Q1":
+        basta l'id per rigenerare esattamente la stessa board (generate), senza salvarla.
+        parse accetta minuscole e le lettere che si confondono (O -> 0, I/L -> 1).
+    """
+    version: int
+    columns: int
+    rows: int
+    seed: int
+
+    def __str__(self) -> str:
+        return f"{self.version}-{self.columns}x{self.rows}-{_encode_seed(self.seed)}"
+
+    def generate(self, debug_checks: bool | None = None) -> Game:
+        """Rigenera la board dell'id. Solleva ValueError se generate_board non conosce più quella versione."""
+        if self.version not in GENERATOR_VERSIONS:
+            raise ValueError(f"< Puzzle id version {self.version} is not supported (known: {GENERATOR_VERSIONS}) >")
+        game = Game(columns=self.columns, rows=self.rows, trees=(), tents=(), debug_checks=debug_checks)
+        game.generate_board(self.seed, version=self.version)
+        return game
+
+    # ======== CLASSMETHODS ========
+    @classmethod
+    def parse(cls, text: str) -> "PuzzleId":
+        """Legge un id nel formato di __str__. Solleva ValueError se non è valido."""
+        try:
+            version, size, seed = text.strip().upper().split("-")
+            columns, rows = size.split("X")
+            puzzle_id = cls(int(version), int(columns), int(rows), _decode_seed(seed))
+        except ValueError as e:
+            raise ValueError(f"< Invalid puzzle id {text!r} >") from e
+        if puzzle_id.columns <= 0 or puzzle_id.rows <= 0 or not seed or puzzle_id.seed >= 2 ** SEED_BITS:
+            raise ValueError(f"< Invalid puzzle id {text!r} >")
+        return puzzle_id
+
+    @classmethod
+    def random(cls, columns: int, rows: int, rng: random.Random | None = None) -> "PuzzleId":
+        """Nuovo id con un seed casuale, per la versione corrente del generatore."""
+        return cls(GENERATOR_VERSION, columns, rows, (rng or random).getrandbits(SEED_BITS))
+
+    @classmethod
+    def of(cls, game: Game) -> "PuzzleId | None":
+        """Id della board di game, se è stata generata con un seed noto; altrimenti None."""
+        if game.seed is None:
+            return None
+        return cls(game.generator_version, game.columns, game.lines, game.seed)
@@ -0,0 +1,363 @@
+from __future__ import annotations
+from collections.abc import Collection, Iterable
+from concurrent.futures import ProcessPoolExecutor
+import argparse
+import json
+import os
+import pathlib
+import random
+import struct
+import threading
+
+# CORE
+from .game import Game, GENERATOR_VERSION
+from .generator_pool import generate_pair_lists
+from .difficulty import rate
+
+
+DEFAULT_POOL = pathlib.Path(__file__).resolve().parents[2] / "data" / "pool"
+
+MAGIC = b"TTPZ\x01"
+HEADER = struct.Struct("<HHQI")      # columns, rows, versione << 32 | seed, numero di coppie
+SEED_MASK = (1 << 32) - 1
+USED = struct.Struct("<Q")           # -> offset di un record preso, nel log dei consumi
+UNRATED = "unrated"
+
+Pairs = list[tuple[int, int]]
+
+
+class PuzzleStore:
+    """
+    Pool di puzzle già generati salvato su disco, diviso in bucket per dimensione e difficoltà:
+    - puzzles.bin (puzzles.N.bin dopo compact()): file dati "append only", un record binario compatto per puzzle
+    - puzzles.idx: indice JSON bucket -> [(offset, lunghezza), ...] dei record non ancora usati,
+      più il nome del file dati in uso (cambia con compact())
+    - puzzles.bin.used (il nome del file dati + ".used"): log "append only" dei record presi
+      dopo l'ultima riscrittura dell'indice, 8 byte (l'offset) per record
+
+    Scrittura crash-safe: prima il record viene aggiunto in fondo a puzzles.bin (flush + fsync),
+    poi l'indice viene riscritto su un file temporaneo e sostituito con os.replace.
+    Se il programma si ferma a metà, all'apertura i record completi oltre la fine nota vengono
+    ri-indicizzati e un eventuale record troncato viene tagliato via.
+
+    take() toglie un puzzle dal bucket in O(1) (pop dalla lista del bucket) e aggiunge solo il suo offset al log,
+    senza fsync: dopo un crash al massimo un puzzle già preso torna disponibile. L'indice viene riscritto
+    (e il log svuotato) solo da add_many, compact() e close(); all'apertura il log viene riapplicato all'indice.
+    I record usati restano nel file dati finché compact() non lo riscrive.
+    I metodi pubblici si possono chiamare da più thread (l'App scrive da un thread suo e prende dal loop).
+    """
+
+    def __init__(self, folder: pathlib.Path | str = DEFAULT_POOL) -> None:
+        self.folder = pathlib.Path(folder)
+        self._buckets: dict[str, list[list[int]]] = {}
+        self._data_name = "puzzles.bin"
+        self._data_size = len(MAGIC)
+        self._taken = 0         # -> take registrate solo nel log, non ancora nell'indice
+        self._lock = threading.Lock()
+        self._load()
+
+    # ======== METHODS ========
+    def add(self,
+            columns: int,
+            rows: int,
+            trees: Collection[tuple[int, int]],
+            tents: Collection[tuple[int, int]],
+            seed: int = 0,
+            difficulty: str = UNRATED,
+            version: int = GENERATOR_VERSION) -> None:
+        """Valida il puzzle e lo aggiunge al bucket (columns, rows, difficulty). Solleva ValueError se non è valido."""
+        self.add_many([(columns, rows, trees, tents, seed, difficulty, version)])
+
+    def add_many(self, puzzles: Iterable[tuple[int, int, Collection, Collection, int, str, int]]) -> int:
+        """
+            Come add, ma per un gruppo di puzzle: un solo fsync e una sola riscrittura dell'indice.
+            Ritorna quanti puzzle sono stati aggiunti.
+        """
+        records = []
+        for columns, rows, trees, tents, seed, difficulty, version in puzzles:
+            if not Game(columns=columns, rows=rows, trees=(), tents=()).is_valid_board(trees, tents):
+                raise ValueError(f"< Invalid puzzle {columns}x{rows} (seed {seed}) >")
+            records.append((self.key(columns, rows, difficulty), encode(columns, rows, seed, trees, tents, version)))
+
+        if not records:
+            return 0
+
+        with self._lock:
+            self.folder.mkdir(parents=True, exist_ok=True)
+            with open(self.data_path, "ab") as file:
+                if file.tell() == 0:
+                    file.write(MAGIC)
+                offset = file.tell()
+                for key, record in records:
+                    file.write(record)
+                    self._buckets.setdefault(key, []).append([offset, len(record)])
+                    offset += len(record)
+                file.flush()
+                os.fsync(file.fileno())
+            self._data_size = offset
+
+            self._write_index()
+        return len(records)
+
+    def take(self,
+             columns: int,
+             rows: int,
+             difficulty: str | None = None,
+             debug_checks: bool | None = None) -> Game | None:
+        """
+            Toglie un puzzle dal pool e lo ritorna come Game; None se il bucket è vuoto.
+            Con difficulty None va bene qualsiasi difficoltà di quella dimensione.
+        """
+        record = self.take_record(columns, rows, difficulty)
+        if record is None:
+            return None
+        columns, rows, seed, trees, tents, version = record
+        game = Game(columns=columns, rows=rows, trees=trees, tents=tents, debug_checks=debug_checks)
+        game.seed = seed
+        game.generator_version = version
+        return game
+
+    def take_record(self, columns: int, rows: int, difficulty: str | None = None) -> tuple[int, int, int, Pairs, Pairs, int] | None:
+        """Come take, ma ritorna il record grezzo (columns, rows, seed, alberi, tende, versione del generatore)."""
+        with self._lock:
+            keys = [self.key(columns, rows, difficulty)] if difficulty is not None else \
+                   [key for key in self._buckets if key.startswith(f"{columns}x{rows}:")]
+            for key in keys:
+                entries = self._buckets.get(key)
+                if entries:
+                    offset, length = entries.pop()
+                    with open(self.data_path, "rb") as file:
+                        file.seek(offset)
+                        record = decode(file.read(length))
+                    with open(self.used_path, "ab") as file:
+                        file.write(USED.pack(offset))
+                    self._taken += 1
+                    return record
+        return None
+
+    def count(self, columns: int | None = None, rows: int | None = None, difficulty: str | None = None) -> int:
+        """Puzzle disponibili, in totale o filtrati per dimensione e/o difficoltà."""
+        total = 0
+        with self._lock:
+            buckets = list(self._buckets.items())
+        for key, entries in buckets:
+            size, level = key.split(":", 1)
+            if columns is not None and rows is not None and size != f"{columns}x{rows}":
+                continue
+            if difficulty is not None and level != difficulty:
+                continue
+            total += len(entries)
+        return total
+
+    def compact(self) -> None:
+        """
+            Copia i soli record ancora nell'indice in un nuovo file dati e poi riscrive l'indice.
+            La sostituzione dell'indice è il punto di non ritorno: prima di lei vale il file vecchio,
+            dopo quello nuovo; il file rimasto inutilizzato viene cancellato alla fine.
+        """
+        with self._lock:
+            self._compact()
+
+    def _compact(self) -> None:
+        old = self.data_path
+        if not old.exists():
+            return
+        generation = int(self._data_name.split(".")[1]) + 1 if self._data_name.count(".") == 2 else 1
+        new = self.folder / f"puzzles.{generation}.bin"
+
+        buckets: dict[str, list[list[int]]] = {}
+        with open(old, "rb") as source, open(new, "wb") as target:
+            target.write(MAGIC)
+            for key, entries in self._buckets.items():
+                for offset, length in entries:
+                    source.seek(offset)
+                    buckets.setdefault(key, []).append([target.tell(), length])
+                    target.write(source.read(length))
+            data_size = target.tell()
+            target.flush()
+            os.fsync(target.fileno())
+
+        old_used = self.used_path
+        self._buckets, self._data_name, self._data_size = buckets, new.name, data_size
+        self._write_index()
+        old.unlink()
+        old_used.unlink(missing_ok=True)
+
+    def close(self) -> None:
+        """Porta nell'indice le take registrate solo nel log (una riscrittura per tutte) e svuota il log."""
+        with self._lock:
+            if self._taken:
+                self._write_index()
+
+    @staticmethod
+    def key(columns: int, rows: int, difficulty: str = UNRATED) -> str:
+        return f"{columns}x{rows}:{difficulty}"
+
+    # ======== HELPERS ========
+    def _load(self) -> None:
+        if self.index_path.exists():
+            try:
+                index = json.loads(self.index_path.read_text(encoding="utf-8"))
+                self._buckets = index["buckets"]
+                self._data_name = index["data"]
+                self._data_size = index["data_size"]
+            except (ValueError, KeyError) as e:
+                print(f"<puzzle_store.py | Broken index {self.index_path}: {e}>")
+                self._buckets, self._data_size = {}, len(MAGIC)
+
+        if self.used_path.exists():
+            # -> take dopo l'ultimo indice; un offset scritto a metà (crash durante la take) viene ignorato
+            data = self.used_path.read_bytes()
+            used = {offset for offset, in USED.iter_unpack(data[:len(data) - len(data) % USED.size])}
+            for entries in self._buckets.values():
+                entries[:] = [entry for entry in entries if entry[0] not in used]
+            self._taken = len(used)
+
+        if self.data_path.exists() and self.data_path.stat().st_size != self._data_size:
+            self._recover()
+
+    def _recover(self) -> None:
+        """
+            Riallinea indice e file dati dopo un'interruzione:
+            - i record completi scritti dopo l'ultimo indice vengono indicizzati (come "unrated")
+            - un record troncato in fondo viene tagliato via
+            - se il file dati è più corto del previsto, le voci che puntano oltre la fine vengono tolte
+        """
+        with open(self.data_path, "r+b") as file:
+            if file.read(len(MAGIC)) != MAGIC:
+                raise ValueError(f"< {self.data_path} is not a puzzle pool file >")
+            size = file.seek(0, os.SEEK_END)
+            if size < self._data_size:
+                for entries in self._buckets.values():
+                    entries[:] = [entry for entry in entries if entry[0] + entry[1] <= size]
+                self._data_size = len(MAGIC)
+                for entries in self._buckets.values():
+                    for offset, length in entries:
+                        self._data_size = max(self._data_size, offset + length)
+
+            offset = max(self._data_size, len(MAGIC))
+            file.seek(offset)
+            data = file.read()
+            position = 0
+            while position + HEADER.size <= len(data):
+                columns, rows, _, pairs = HEADER.unpack_from(data, position)
+                length = HEADER.size + 8 * pairs
+                if position + length > len(data):
+                    break
+                self._buckets.setdefault(self.key(columns, rows), []).append([offset + position, length])
+                position += length
+            self._data_size = offset + position
+            file.truncate(self._data_size)
+        self._write_index()
+
+    def _write_index(self) -> None:
+        self.folder.mkdir(parents=True, exist_ok=True)
+        tmp = self.index_path.with_suffix(".idx.tmp")
+        index = {"version": 1, "data": self._data_name, "data_size": self._data_size, "buckets": self._buckets}
+        with open(tmp, "w", encoding="utf-8") as file:
+            json.dump(index, file, separators=(",", ":"))
+            file.flush()
+            os.fsync(file.fileno())
+        os.replace(tmp, self.index_path)
+        # -> da qui l'indice contiene già le take del log
+        self.used_path.unlink(missing_ok=True)
+        self._taken = 0
+
+    # ======== PROPERTIES ========
+    @property
+    def data_path(self) -> pathlib.Path:
+        return self.folder / self._data_name
+
+    @property
+    def buckets(self) -> dict[str, int]:
+        """Puzzle disponibili per bucket ("COLONNExRIGHE:difficoltà")."""
+        with self._lock:
+            return {key: len(entries) for key, entries in self._buckets.items() if entries}
+
+    @property
+    def index_path(self) -> pathlib.Path:
+        return self.folder / "puzzles.idx"
+
+    @property
+    def used_path(self) -> pathlib.Path:
+        return self.folder / f"{self._data_name}.used"
+
+
+# ======== RECORD ========
+def encode(columns: int, rows: int, seed: int, trees: Collection[tuple[int, int]], tents: Collection[tuple[int, int]],
+           version: int = GENERATOR_VERSION) -> bytes:
+    """
+        Record binario: header (columns, rows, versione e seed, n) + n alberi + n tende, ogni coordinata su 2 byte.
+        Versione del generatore e seed (32 bit) condividono un campo a 64 bit: versione nei 32 bit alti.
+    """
+    trees, tents = sorted(trees), sorted(tents)
+    coords = [c for pos in trees for c in pos] + [c for pos in tents for c in pos]
+    return HEADER.pack(columns, rows, version << 32 | seed, len(trees)) + struct.pack(f"<{len(coords)}H", *coords)
+
+
+def decode(record: bytes) -> tuple[int, int, int, Pairs, Pairs, int]:
+    """Inverso di encode: ritorna (columns, rows, seed, alberi, tende, versione). Versione 0 (record vecchi) vale 1."""
+    columns, rows, packed, pairs = HEADER.unpack_from(record)
+    coords = struct.unpack_from(f"<{4 * pairs}H", record, HEADER.size)
+    positions = list(zip(coords[0::2], coords[1::2]))
+    return columns, rows, packed & SEED_MASK, positions[:pairs], positions[pairs:], packed >> 32 or 1
+
+
+# ======== BATCH ========
+def generate_rated(side: int, seed: int) -> tuple[Pairs, Pairs, str]:
+    """Lavoro del worker per fill(rate=True): genera la board e la valuta con il rater (difficulty.rate)."""
+    trees, tents, _ = generate_pair_lists(side, seed)
+    columns_targets, rows_targets = [0] * side, [0] * side
+    for x, y in tents:
+        columns_targets[x] += 1
+        rows_targets[y] += 1
+    return trees, tents, rate(side, side, trees, columns_targets, rows_targets).label
+
+
+def fill(store: PuzzleStore, sides: Iterable[int], count: int, workers: int = 2, seed: int | None = None,
+         rated: bool = False) -> int:
+    """
+        Genera count puzzle per ogni lato in sides con un pool di processi e li aggiunge allo store.
+        Con rated True ogni puzzle viene anche valutato e finisce nel bucket della sua difficoltà (molto più lento).
+        Ritorna quanti puzzle sono stati aggiunti.
+    """
+    rng = random.Random(seed)
+    jobs = [(side, rng.getrandbits(32)) for side in sides for _ in range(count)]
+    work = generate_rated if rated else generate_pair_lists
+    with ProcessPoolExecutor(max_workers=workers) as executor:
+        results = executor.map(work, *zip(*jobs)) if jobs else []
+        return store.add_many((side, side, trees, tents, job_seed, label if rated else UNRATED, GENERATOR_VERSION)
+                              for (side, job_seed), (trees, tents, label) in zip(jobs, results))
+
+
+def main(argv: list[str] | None = None) -> None:
+    """Comando offline (python -m src.puzzle_pool fill|stats|compact)."""
+    parser = argparse.ArgumentParser(prog="puzzle_store", description="Gestione del pool di puzzle su disco.")
+    parser.add_argument("--pool", default=str(DEFAULT_POOL), help="cartella del pool")
+    commands = parser.add_subparsers(dest="command", required=True)
+
+    fill_cmd = commands.add_parser("fill", help="genera puzzle e li aggiunge al pool")
+    fill_cmd.add_argument("--count", type=int, default=10, help="puzzle per ogni lato")
+    fill_cmd.add_argument("--min-side", type=int, default=8)
+    fill_cmd.add_argument("--max-side", type=int, default=20)
+    fill_cmd.add_argument("--workers", type=int, default=os.cpu_count() or 1)
+    fill_cmd.add_argument("--seed", type=int, default=None)
+    fill_cmd.add_argument("--rate", action="store_true", help="valuta ogni puzzle e lo mette nel bucket della sua difficoltà")
+
+    commands.add_parser("stats", help="puzzle disponibili per bucket")
+    commands.add_parser("compact", help="riscrive il file dati senza i record già usati")
+
+    args = parser.parse_args(argv)
+    store = PuzzleStore(args.pool)
+
+    match args.command:
+        case "fill":
+            added = fill(store, range(args.min_side, args.max_side + 1), args.count, args.workers, args.seed, args.rate)
+            print(f"added {added} puzzles ({store.count()} available)")
+        case "stats":
+            for key, available in sorted(store.buckets.items()):
+                print(f"{key}\t{available}")
+            print(f"total\t{store.count()}")
+        case "compact":
+            store.compact()
+            print(f"compacted: {store.data_path.stat().st_size if store.data_path.exists() else 0} bytes")
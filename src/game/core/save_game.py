@@ -0,0 +1,291 @@
+from __future__ import annotations
+from typing import NamedTuple
+import os
+import pathlib
+import threading
+import time
+
+# CORE
+from .file_management import show_levels
+from .game import Game
+from .level import Level, _find_cells
+from .puzzle_id import PuzzleId
+
+# STATE
+from ..state import Action
+
+
+DEFAULT_SAVE = pathlib.Path(__file__).resolve().parents[2] / "data" / "saves" / "current.sav"
+
+MAGIC = b"TTSV"
+VERSION = 1
+SOURCE_LEVEL, SOURCE_PUZZLE_ID = 0, 1
+
+# -> codice di ogni azione nel journal (3 bit): 0 è il click (action None)
+_ACTION_CODES = {None: 0} | {action: action.value for action in Action}
+_CODE_ACTIONS = {code: action for action, code in _ACTION_CODES.items()}
+
+
+class Snapshot(NamedTuple):
+    """
+        Stato di una partita letto da un salvataggio (decode).
+
+        - source: il livello (path + impronta del contenuto) o il PuzzleId della board
+        - tents / grass: i due strati piazzati dal giocatore
+        - journal: le mosse giocate, come Game.journal
+    """
+    source: tuple[str, str] | PuzzleId
+    columns: int
+    rows: int
+    tents: set[tuple[int, int]]
+    grass: set[tuple[int, int]]
+    journal: list[tuple[int, int, Action | None]]
+
+
+# ======== ENCODING ========
+def _varint(value: int) -> bytes:
+    out = bytearray()
+    while True:
+        byte, value = value & 0x7F, value >> 7
+        if value:
+            out.append(byte | 0x80)
+        else:
+            out.append(byte)
+            return bytes(out)
+
+
+def _read_varint(data: bytes, offset: int) -> tuple[int, int]:
+    value = shift = 0
+    while True:
+        if offset >= len(data):
+            raise ValueError("< Truncated save file >")
+        byte = data[offset]
+        offset += 1
+        value |= (byte & 0x7F) << shift
+        if not byte & 0x80:
+            return value, offset
+        shift += 7
+
+
+def _pack_layer(cells: set[tuple[int, int]], columns: int, rows: int) -> bytes:
+    """Strato di celle come bitmap (1 bit per cella, riga per riga)."""
+    text = bytearray(b"0") * (columns * rows)
+    for x, y in cells:
+        text[y * columns + x] = 49
+    return int(text[::-1] or b"0", 2).to_bytes((columns * rows + 7) // 8, "little")
+
+
+def _unpack_layer(data: bytes, columns: int, rows: int) -> set[tuple[int, int]]:
+    size = columns * rows
+    text = format(int.from_bytes(data, "little"), f"0{size}b")[::-1].encode("ascii")
+    if len(text) != size:
+        raise ValueError("< Corrupted save file: layer larger than the board >")
+    return _find_cells(text, b"1", columns)
+
+
+def encode(game: Game, source: Level | PuzzleId) -> bytes:
+    """
+        Snapshot binario compatto della partita: riferimento al livello, strati tende/prato come bitmap
+        e journal delle mosse in varint (indice cella * 8 + codice azione).
+    """
+    out = bytearray(MAGIC)
+    out.append(VERSION)
+    if isinstance(source, PuzzleId):
+        reference = str(source).encode("ascii")
+        out.append(SOURCE_PUZZLE_ID)
+        out += _varint(len(reference)) + reference
+    elif isinstance(source, Level):
+        reference = str(source.path.resolve()).encode("utf-8")
+        out.append(SOURCE_LEVEL)
+        out += _varint(len(reference)) + reference + bytes.fromhex(source.fingerprint)
+    else:
+        raise TypeError("< source must be a Level or a PuzzleId >")
+
+    columns, rows = game.columns, game.lines
+    out += _varint(columns) + _varint(rows)
+    out += _pack_layer(game.tents, columns, rows) + _pack_layer(game.grass, columns, rows)
+    out += _varint(len(game.journal))
+    for x, y, action in game.journal:
+        out += _varint((y * columns + x) * 8 + _ACTION_CODES[action])
+    return bytes(out)
+
+
+def decode(data: bytes) -> Snapshot:
+    """Legge uno snapshot di encode(). Solleva ValueError se il file non è un salvataggio valido."""
+    if not data.startswith(MAGIC) or len(data) < len(MAGIC) + 2:
+        raise ValueError("< Not a save file >")
+    if data[len(MAGIC)] != VERSION:
+        raise ValueError(f"< Unsupported save version {data[len(MAGIC)]} >")
+
+    kind, offset = data[len(MAGIC) + 1], len(MAGIC) + 2
+    length, offset = _read_varint(data, offset)
+    reference, offset = data[offset:offset + length], offset + length
+    if kind == SOURCE_PUZZLE_ID:
+        source = PuzzleId.parse(reference.decode("ascii"))
+    elif kind == SOURCE_LEVEL:
+        source = reference.decode("utf-8"), data[offset:offset + 20].hex()
+        offset += 20
+    else:
+        raise ValueError(f"< Unknown save source {kind} >")
+
+    columns, offset = _read_varint(data, offset)
+    rows, offset = _read_varint(data, offset)
+    if columns <= 0 or rows <= 0:
+        raise ValueError("< Corrupted save file: invalid board size >")
+    size = (columns * rows + 7) // 8
+    tents = _unpack_layer(data[offset:offset + size], columns, rows)
+    grass = _unpack_layer(data[offset + size:offset + 2 * size], columns, rows)
+    offset += 2 * size
+
+    count, offset = _read_varint(data, offset)
+    journal = []
+    for _ in range(count):
+        move, offset = _read_varint(data, offset)
+        cell, code = divmod(move, 8)
+        if code not in _CODE_ACTIONS:
+            raise ValueError("< Corrupted save file: unknown action >")
+        journal.append((cell % columns, cell // columns, _CODE_ACTIONS[code]))
+    return Snapshot(source, columns, rows, tents, grass, journal)
+
+
+def restore(snapshot: Snapshot, debug_checks: bool | None = None) -> tuple[Game, Level | PuzzleId]:
+    """
+        Ricrea la partita di uno snapshot: rilegge il livello (o rigenera la board dell'id) e rimette
+        tende, prato e journal. Ritorna (game, sorgente). Solleva ValueError se il livello è cambiato.
+    """
+    if isinstance(snapshot.source, PuzzleId):
+        source = snapshot.source
+        game = source.generate(debug_checks=debug_checks)
+    else:
+        path, fingerprint = snapshot.source
+        source = _find_level(pathlib.Path(path), fingerprint)
+        game = Game.init_from_level(source, debug_checks=debug_checks)
+
+    if (game.columns, game.lines) != (snapshot.columns, snapshot.rows):
+        raise ValueError("< Save file does not match the board size >")
+    # -> coordinate già dentro la board (vengono da una bitmap della stessa dimensione): percorso fidato
+    game._store(tents=snapshot.tents, grass=snapshot.grass)
+    game.journal = list(snapshot.journal)
+    return game, source
+
+
+def _find_level(path: pathlib.Path, fingerprint: str) -> Level:
+    """Il livello salvato: dal suo file, o (livello di un pack) tra quelli della sua cartella."""
+    try:
+        level = Level.from_file(path)
+    except FileNotFoundError:
+        level = next((lv for lv in show_levels(path.parent) if lv.path.name == path.name), None)
+        if level is None:
+            raise ValueError(f"< Saved level not found: {path} >") from None
+    if level.fingerprint != fingerprint:
+        raise ValueError(f"< Saved level changed on disk: {path} >")
+    return level
+
+
+# ======== WRITER ========
+class SaveWriter:
+    """
+    Scrittura dei salvataggi in un thread in background, così il loop dei frame non aspetta mai il disco:
+    - submit() mette in coda lo snapshot da scrivere (se ne arriva un altro prima, vince l'ultimo)
+    - la scrittura è atomica: file temporaneo, fsync, poi os.replace sul salvataggio
+    - submit(None) cancella il salvataggio (partita finita)
+    - flush() aspetta che il thread abbia finito; close() in più lo ferma
+    """
+
+    def __init__(self, path: pathlib.Path | str = DEFAULT_SAVE) -> None:
+        self.path = pathlib.Path(path)
+        self.written = 0
+        self.failed = 0
+        self.last_write = 0.0
+
+        self._condition = threading.Condition()
+        self._pending: list[bytes | None] = []
+        self._busy = False
+        self._closed = False
+        self._thread: threading.Thread | None = None
+
+    # ======== METHODS ========
+    def save(self, game: Game, source: Level | PuzzleId) -> None:
+        """Codifica la partita (pochi ms anche su board grandi) e la passa al thread di scrittura."""
+        self.submit(encode(game, source))
+
+    def submit(self, data: bytes | None) -> None:
+        with self._condition:
+            if self._closed:
+                raise RuntimeError("< SaveWriter is closed >")
+            self._pending[:] = [data]
+            if self._thread is None:
+                self._thread = threading.Thread(target=self._run, name="save-writer", daemon=True)
+                self._thread.start()
+            self._condition.notify_all()
+
+    def discard(self) -> None:
+        """Cancella il salvataggio (in background, dopo le scritture già in coda)."""
+        self.submit(None)
+
+    def flush(self, timeout: float | None = None) -> bool:
+        """Aspetta che non ci sia più niente da scrivere. Ritorna False se scade il timeout."""
+        with self._condition:
+            return self._condition.wait_for(lambda: not self._pending and not self._busy, timeout)
+
+    def close(self, timeout: float | None = 5.0) -> None:
+        """Scrive quello che resta e ferma il thread."""
+        self.flush(timeout)
+        with self._condition:
+            self._closed = True
+            self._condition.notify_all()
+        if self._thread is not None:
+            self._thread.join(timeout)
+            self._thread = None
+
+    def load(self) -> Snapshot | None:
+        """Lo snapshot salvato, o None se non c'è. Solleva ValueError se il file è rovinato."""
+        self.flush()
+        try:
+            data = self.path.read_bytes()
+        except FileNotFoundError:
+            return None
+        return decode(data)
+
+    # ======== HELPERS ========
+    def _run(self) -> None:
+        while True:
+            with self._condition:
+                self._condition.wait_for(lambda: self._pending or self._closed)
+                if not self._pending:
+                    return
+                data = self._pending.pop()
+                self._busy = True
+            try:
+                start = time.perf_counter()
+                self._write(data)
+                self.written += 1
+                self.last_write = time.perf_counter() - start
+            except OSError as e:
+                self.failed += 1
+                print(f"<save_game.py | Error writing {self.path}: {e}>")
+            finally:
+                with self._condition:
+                    self._busy = False
+                    self._condition.notify_all()
+
+    def _write(self, data: bytes | None) -> None:
+        if data is None:
+            self.path.unlink(missing_ok=True)
+            return
+        self.path.parent.mkdir(parents=True, exist_ok=True)
+        tmp = self.path.with_suffix(self.path.suffix + ".tmp")
+        with open(tmp, "wb") as f:
+            f.write(data)
+            f.flush()
+            os.fsync(f.fileno())
+        os.replace(tmp, self.path)
+
+    # ======== PROPERTIES ========
+    @property
+    def exists(self) -> bool:
+        """C'è un salvataggio da riprendere (contando anche quello in coda)."""
+        with self._condition:
+            if self._pending:
+                return self._pending[-1] is not None
+        return self.path.exists()
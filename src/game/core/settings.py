@@ -0,0 +1,248 @@
+from __future__ import annotations
+from collections.abc import Callable, Mapping
+from dataclasses import dataclass, field
+from types import MappingProxyType
+import os
+import time
+
+# CORE
+from .file_management import SETTINGS, read_settings
+from .startup_profile import span
+
+
+RGB = tuple[int, ...]
+
+
+def _color(value, default: RGB) -> RGB:
+    return tuple(value) if value is not None else default
+
+
+def _freeze(value):
+    """Copia in sola lettura del JSON (dizionari -> MappingProxyType, liste -> tuple)."""
+    if isinstance(value, dict):
+        return MappingProxyType({key: _freeze(item) for key, item in value.items()})
+    if isinstance(value, list):
+        return tuple(_freeze(item) for item in value)
+    return value
+
+
+# ======== SECTIONS ========
+@dataclass(frozen=True, slots=True)
+class GeneratorPoolSettings:
+    enabled: bool = False
+    min_side: int = 8
+    max_side: int = 20
+    depth: int = 2
+    workers: int = 2
+
+    @classmethod
+    def from_dict(cls, data: Mapping) -> "GeneratorPoolSettings":
+        return cls(enabled=bool(data.get("enabled", False)), min_side=data.get("min_side", 8),
+                   max_side=data.get("max_side", 20), depth=data.get("depth", 2), workers=data.get("workers", 2))
+
+
+@dataclass(frozen=True, slots=True)
+class PuzzlePoolSettings:
+    enabled: bool = False
+    keep: int = 5
+
+    @classmethod
+    def from_dict(cls, data: Mapping) -> "PuzzlePoolSettings":
+        return cls(enabled=bool(data.get("enabled", False)), keep=data.get("keep", 5))
+
+
+@dataclass(frozen=True, slots=True)
+class SaveGameSettings:
+    enabled: bool = False
+
+    @classmethod
+    def from_dict(cls, data: Mapping) -> "SaveGameSettings":
+        return cls(enabled=bool(data.get("enabled", False)))
+
+
+@dataclass(frozen=True, slots=True)
+class MenuWindowSettings:
+    width: int = 420
+    height: int = 520
+
+    @classmethod
+    def from_dict(cls, data: Mapping) -> "MenuWindowSettings":
+        return cls(width=data.get("width", 420), height=data.get("height", 520))
+
+
+@dataclass(frozen=True, slots=True)
+class BoardSettings:
+    height_ratio: float = 0.95      # -> "height%" nel JSON: parte di SIZE occupata dalla board
+    padding: int = 2
+    max_visible: int = 20
+
+    @classmethod
+    def from_dict(cls, data: Mapping) -> "BoardSettings":
+        return cls(height_ratio=data.get("height%", 0.95), padding=data.get("padding", 2),
+                   max_visible=data.get("max_visible", 20))
+
+
+@dataclass(frozen=True, slots=True)
+class StatsSettings:
+    text_size: int = 30
+    text_color: RGB = (248, 248, 248)
+    progress_bar_color: RGB = (48, 96, 48)
+    progress_padding: int = 2
+
+    @classmethod
+    def from_dict(cls, data: Mapping) -> "StatsSettings":
+        return cls(text_size=data.get("text_size", 30),
+                   text_color=_color(data.get("text_color"), (248, 248, 248)),
+                   progress_bar_color=_color(data.get("progress_bar_color"), (48, 96, 48)),
+                   progress_padding=data.get("progress_padding", 2))
+
+
+@dataclass(frozen=True, slots=True)
+class BoardGameGuiSettings:
+    background_color: RGB = (0, 0, 0)
+    board: BoardSettings = BoardSettings()
+    stats: StatsSettings = StatsSettings()
+
+    @classmethod
+    def from_dict(cls, data: Mapping) -> "BoardGameGuiSettings":
+        return cls(background_color=_color(data.get("background_color"), (0, 0, 0)),
+                   board=BoardSettings.from_dict(data.get("board", {})),
+                   stats=StatsSettings.from_dict(data.get("stats", {})))
+
+
+@dataclass(frozen=True, slots=True)
+class Settings:
+    """
+        settings.json letto una volta e tradotto in campi tipizzati (con i default già applicati).
+        Immutabile: un reload crea un nuovo Settings, chi ha il vecchio continua a vedere il vecchio.
+
+        sections tiene il JSON completo in sola lettura, per le parti interpretate altrove
+        (gli stili di EMPTY, TREE, ... e INDICATOR vengono compilati da gui/cell_style.py).
+    """
+    fps: int = 30
+    adaptive_fps: bool = False
+    min_fps: int = 15
+    scale: float = 1
+    size: int = 430
+    idle_loop: bool = False
+    idle_wait: int = 250
+    backend: str = "window"
+    debug_checks: bool = False
+    hot_reload: bool = False
+    generator_pool: GeneratorPoolSettings = GeneratorPoolSettings()
+    puzzle_pool: PuzzlePoolSettings = PuzzlePoolSettings()
+    save_game: SaveGameSettings = SaveGameSettings()
+    menu_window: MenuWindowSettings = MenuWindowSettings()
+    board_game_gui: BoardGameGuiSettings = BoardGameGuiSettings()
+    sections: Mapping = field(default_factory=lambda: MappingProxyType({}), compare=False, repr=False)
+
+    @classmethod
+    def from_dict(cls, data: Mapping) -> "Settings":
+        return cls(
+            fps=data.get("fps", 30),
+            adaptive_fps=bool(data.get("adaptive_fps", False)),
+            min_fps=data.get("min_fps", 15),
+            scale=data.get("scale", 1),
+            size=data.get("size", 430),
+            idle_loop=bool(data.get("idle_loop", False)),
+            idle_wait=data.get("idle_wait", 250),
+            backend=data.get("backend", "window"),
+            debug_checks=bool(data.get("debug_checks", False)),
+            hot_reload=bool(data.get("hot_reload", False)),
+            generator_pool=GeneratorPoolSettings.from_dict(data.get("generator_pool", {})),
+            puzzle_pool=PuzzlePoolSettings.from_dict(data.get("puzzle_pool", {})),
+            save_game=SaveGameSettings.from_dict(data.get("save_game", {})),
+            menu_window=MenuWindowSettings.from_dict(data.get("menu_window", {})),
+            board_game_gui=BoardGameGuiSettings.from_dict(data.get("board_game_gui", {})),
+            sections=_freeze(dict(data)),
+        )
+
+
+# ======== CACHE ========
+_current: Settings | None = None
+_mtime: int | None = None
+_last_poll = float("-inf")
+_subscribers: list[Callable[[Settings], None]] = []
+
+
+def _mtime_of(path) -> int | None:
+    try:
+        return os.stat(path).st_mtime_ns
+    except OSError:
+        return None
+
+
+def get_settings() -> Settings:
+    """Le impostazioni correnti: il file viene letto solo alla prima chiamata (o dopo un reload)."""
+    if _current is None:
+        load_settings()
+    return _current
+
+
+def load_settings(path=SETTINGS) -> Settings:
+    """Rilegge settings.json e lo rende il Settings corrente (senza avvisare i subscriber)."""
+    global _current, _mtime
+    with span("settings"):
+        _mtime = _mtime_of(path)
+        _current = Settings.from_dict(read_settings(path))
+    return _current
+
+
+def set_settings(new: Settings) -> Settings:
+    """Sostituisce il Settings corrente (un'unica assegnazione) e avvisa i subscriber."""
+    global _current
+    if not isinstance(new, Settings):
+        raise TypeError("< new must be a Settings >")
+    _current = new
+    for callback in list(_subscribers):
+        callback(new)
+    return new
+
+
+def reload_settings(path=SETTINGS, force: bool = False) -> bool:
+    """
+        Rilegge settings.json se la sua data di modifica è cambiata (o con force) e avvisa i subscriber.
+        Se il file non si legge o non è JSON valido (per esempio salvato a metà da un editor) le impostazioni
+        correnti restano quelle di prima: l'errore viene solo stampato, e il file riletto alla prossima modifica.
+        Ritorna True se le impostazioni sono state ricaricate.
+    """
+    global _mtime
+    mtime = _mtime_of(path)
+    if not force and _current is not None and mtime == _mtime:
+        return False
+    _mtime = mtime
+    if _current is None:
+        data = read_settings(path)
+    else:
+        try:
+            data = read_settings(path, strict=True)
+        except (OSError, ValueError) as e:
+            print(f"<settings.py | Keeping the current settings, cannot reload {path}: {e}>")
+            return False
+    set_settings(Settings.from_dict(data))
+    return True
+
+
+def poll_settings(interval: float = 1.0, path=SETTINGS) -> bool:
+    """
+        Hot reload da chiamare nel loop dei frame: controlla la data del file al massimo una volta ogni
+        interval secondi, quindi negli altri frame costa solo una lettura dell'orologio.
+    """
+    global _last_poll
+    now = time.monotonic()
+    if now - _last_poll < interval:
+        return False
+    _last_poll = now
+    return reload_settings(path)
+
+
+def subscribe(callback: Callable[[Settings], None]) -> Callable[[], None]:
+    """Registra callback(settings), chiamata a ogni reload. Ritorna la funzione che la toglie."""
+    if not callable(callback):
+        raise TypeError("< callback must be a callable >")
+    _subscribers.append(callback)
+
+    def unsubscribe() -> None:
+        if callback in _subscribers:
+            _subscribers.remove(callback)
+    return unsubscribe
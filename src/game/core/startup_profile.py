@@ -0,0 +1,191 @@
+from __future__ import annotations
+from contextlib import contextmanager, nullcontext
+import datetime
+import importlib.abc
+import json
+import pathlib
+import sys
+import time
+
+# -> solo libreria standard: questo modulo viene importato prima di tutto il resto (src/main.py)
+
+
+DEFAULT_REPORT = "startup_profile.json"
+TOP_IMPORTS = 25
+
+
+class _TimedLoader(importlib.abc.Loader):
+    """Loader che misura create_module + exec_module del loader vero (tutto il resto viene delegato)."""
+
+    def __init__(self, loader, name: str, profile: "StartupProfile") -> None:
+        self._loader = loader
+        self._name = name
+        self._profile = profile
+        self._started = False
+
+    def create_module(self, spec):
+        self._profile._begin_import(self._name)
+        self._started = True
+        try:
+            return self._loader.create_module(spec)
+        except BaseException:
+            self._started = False
+            self._profile._end_import(self._name, failed=True)
+            raise
+
+    def exec_module(self, module) -> None:
+        if not self._started:
+            self._profile._begin_import(self._name)
+        failed = True
+        try:
+            self._loader.exec_module(module)
+            failed = False
+        finally:
+            self._started = False
+            self._profile._end_import(self._name, failed=failed)
+
+    def __getattr__(self, name: str):
+        return getattr(self._loader, name)
+
+
+class _ImportTimer(importlib.abc.MetaPathFinder):
+    """Primo finder di sys.meta_path: trova lo spec con gli altri finder e ne avvolge il loader."""
+
+    def __init__(self, profile: "StartupProfile") -> None:
+        self._profile = profile
+
+    def find_spec(self, name, path, target=None):
+        for finder in sys.meta_path:
+            if finder is self or not hasattr(finder, "find_spec"):
+                continue
+            spec = finder.find_spec(name, path, target)
+            if spec is not None:
+                if spec.loader is not None and hasattr(spec.loader, "exec_module"):
+                    spec.loader = _TimedLoader(spec.loader, name, self._profile)
+                return spec
+        return None
+
+
+class StartupProfile:
+    """
+    Profilo dell'avvio (python -m src.main --profile-startup):
+    - tempi di import per modulo, come "python -X importtime": self (solo il modulo) e cumulativo (con i suoi import)
+    - span con nome per le fasi dell'avvio (settings, livelli, canvas, primo frame), con inizio e durata
+    - report testuale ordinato per costo e file JSON con tutti i dati
+
+    Tutti i tempi sono in ms dall'inizio del profilo (start()).
+    """
+
+    def __init__(self, clock=time.perf_counter) -> None:
+        self.clock = clock
+        self.origin = clock()
+        self.imports: list[dict] = []
+        self.spans: list[dict] = []
+        self.preloaded = len(sys.modules)
+
+        self._stack: list[list] = []
+        self._timer: _ImportTimer | None = None
+
+    # ======== IMPORTS ========
+    def install(self) -> None:
+        """Comincia a misurare gli import (solo i moduli non ancora caricati)."""
+        if self._timer is None:
+            self._timer = _ImportTimer(self)
+            sys.meta_path.insert(0, self._timer)
+
+    def uninstall(self) -> None:
+        if self._timer is not None:
+            if self._timer in sys.meta_path:
+                sys.meta_path.remove(self._timer)
+            self._timer = None
+
+    def _begin_import(self, name: str) -> None:
+        # -> [nome, inizio, tempo dei figli, posizione nella lista]: la voce si aggiunge subito per tenere l'ordine
+        self.imports.append({"module": name, "depth": len(self._stack)})
+        self._stack.append([name, self.clock(), 0.0, len(self.imports) - 1])
+
+    def _end_import(self, name: str, failed: bool = False) -> None:
+        if not self._stack or self._stack[-1][0] != name:
+            return
+        _, start, children, index = self._stack.pop()
+        cumulative = self.clock() - start
+        if self._stack:
+            self._stack[-1][2] += cumulative
+        self.imports[index].update(self_ms=round((cumulative - children) * 1000, 3),
+                                   cumulative_ms=round(cumulative * 1000, 3))
+        if failed:
+            self.imports[index]["failed"] = True
+
+    # ======== SPANS ========
+    @contextmanager
+    def span(self, name: str):
+        """Misura il blocco with come fase dell'avvio."""
+        start = self.clock()
+        try:
+            yield
+        finally:
+            end = self.clock()
+            self.spans.append({"name": name, "start_ms": round((start - self.origin) * 1000, 3),
+                               "ms": round((end - start) * 1000, 3)})
+
+    # ======== REPORT ========
+    def to_dict(self) -> dict:
+        imports = [entry for entry in self.imports if "cumulative_ms" in entry]
+        return {
+            "created": datetime.datetime.now().isoformat(timespec="seconds"),
+            "python": sys.version.split()[0],
+            "argv": sys.argv,
+            "total_ms": round((self.clock() - self.origin) * 1000, 3),
+            "preloaded_modules": self.preloaded,
+            "import_ms": round(sum(entry["cumulative_ms"] for entry in imports if entry["depth"] == 0), 3),
+            "spans": sorted(self.spans, key=lambda span: span["start_ms"]),
+            "imports": imports,
+        }
+
+    def report(self, top: int = TOP_IMPORTS) -> str:
+        """Report testuale: fasi e import più costosi, dal più lento."""
+        data = self.to_dict()
+        lines = [f"startup: {data['total_ms']:.1f} ms total, {data['import_ms']:.1f} ms in imports "
+                 f"({len(data['imports'])} modules)", "", "spans (ms, start ms):"]
+        for span in sorted(data["spans"], key=lambda span: -span["ms"]):
+            lines.append(f"  {span['ms']:>9.1f}  {span['start_ms']:>9.1f}  {span['name']}")
+
+        lines += ["", f"imports, top {top} by self time (self ms, cumulative ms):"]
+        for entry in sorted(data["imports"], key=lambda entry: -entry["self_ms"])[:top]:
+            lines.append(f"  {entry['self_ms']:>9.1f}  {entry['cumulative_ms']:>9.1f}  {entry['module']}")
+        return "\n".join(lines)
+
+    def write(self, path: pathlib.Path | str = DEFAULT_REPORT) -> pathlib.Path:
+        """Salva il profilo come JSON e ritorna il path."""
+        path = pathlib.Path(path)
+        with open(path, "w", encoding="utf-8") as f:
+            json.dump(self.to_dict(), f, indent=2)
+            f.write("\n")
+        return path
+
+
+# ======== PROFILO CORRENTE ========
+PROFILE: StartupProfile | None = None
+
+
+def start() -> StartupProfile:
+    """Avvia il profilo dell'avvio (una volta sola) e comincia a misurare gli import."""
+    global PROFILE
+    if PROFILE is None:
+        PROFILE = StartupProfile()
+        PROFILE.install()
+    return PROFILE
+
+
+def stop() -> StartupProfile | None:
+    """Smette di misurare gli import e toglie il profilo corrente. Ritorna il profilo (o None)."""
+    global PROFILE
+    profile, PROFILE = PROFILE, None
+    if profile is not None:
+        profile.uninstall()
+    return profile
+
+
+def span(name: str):
+    """Fase dell'avvio da misurare: senza profilo attivo è un with vuoto, quindi non costa niente."""
+    return PROFILE.span(name) if PROFILE is not None else nullcontext()
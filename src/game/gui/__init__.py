@@ -3,4 +3,5 @@ from .bar import Bar
 from .button import Button
 from .text import Text
 from .color import Color
-from .board import Board
\ No newline at end of file
+from .board import Board
+from .viewport import Viewport
\ No newline at end of file
@@ -39,6 +39,7 @@ class Bar(GUIComponent):
         self.value = value
         self.fixed = fixed
 
+        self._last_render_signature = None
 
     @property
     def name_id(self) -> str:
@@ -186,10 +187,18 @@ class Bar(GUIComponent):
         - un rettangolo di sfondo
         - un rettangolo interno che rappresenta il valore attuale
         - un testo centrato con il valore formattato dentro la stringa text
+
+        Se niente di ciò che influisce sul disegno è cambiato dall'ultima chiamata ritorna [].
         """
 
         self.value = new_value if new_value is not None else self.value
 
+        sig = (self.x, self.y, self.width, self.height, self.padding, self.text, self.text_size,
+               self.text_color, self.background_color, self.bar_color, self.value, self.max_value)
+        if sig == self._last_render_signature:
+            return []
+        self._last_render_signature = sig
+
         x, y = self.x, self.y
         width, height = self.width, self.height
 
@@ -2,6 +2,18 @@ from __future__ import annotations
 
 from .gui_component import GUIComponent
 from .cell import Cell
+from .cell_grid import CellGrid, CellView
+from .cell_style import current_theme
+from .color import Color
+from .viewport import Viewport
+
+from ..core.settings import get_settings
+
+TEXT_COLOR = Color((248, 248, 248)).rgba
+
+# -> tasti (rilasciati) che muovono la finestra visibile e cambiano lo zoom
+PAN_KEYS = {"ArrowLeft": (-1, 0), "ArrowRight": (1, 0), "ArrowUp": (0, -1), "ArrowDown": (0, 1)}
+ZOOM_KEYS = {"+": -1, "=": -1, "-": 1}
 
 
 class Board(GUIComponent):
@@ -12,115 +24,385 @@ class Board(GUIComponent):
         y: int,
         width: int,
         height: int,
-        padding: int
+        padding: int,
+        allow_deferred=None,
+        viewport: Viewport | None = None,
+        background_color: Color | tuple[int, int, int] = (0, 0, 0)
     ) -> None:
+        """
+            Campo di gioco: indicatore, target di colonne/righe e celle di gioco.
+
+            Disegna solo la parte di board dentro il viewport (di default tutta la board):
+            con le frecce si sposta la finestra, con + e - si cambia lo zoom. I target seguono
+            la finestra, e solo le celle visibili vengono aggiornate, controllate e disegnate.
+        """
         self.master = master
         self.x = x
         self.y = y
         self.width = width
         self.height = height
         self.padding = padding
+        self.allow_deferred = allow_deferred
+        self.background_color = Color(background_color).rgba
+
+        self._viewport = viewport
+        self._layout: tuple[int, int, int, int] | None = None
+        self._needs_clear = False
 
         self._cells: list[Cell] | None = None
+        self._grid: CellGrid | None = None
+        self._hovered_index: int | None = None
+
+        self._dirty: set[int] = set()
+        self._rendered_version = None
+        self._rendered_theme = None
 
+    # ======== GEOMETRY ========
     @property
-    def cells(self) -> list[Cell]:
+    def viewport(self) -> Viewport:
+        """Finestra visibile sulla board (creata la prima volta, se non passata, sull'intera board)."""
+        if self._viewport is None:
+            self._viewport = Viewport(self.master.cols(), self.master.rows())
+        return self._viewport
+
+    @property
+    def grid_size(self) -> tuple[int, int]:
+        """Dimensioni della griglia disegnata (colonne, righe), compresi indicatore e target."""
+        viewport = self.viewport
+        return viewport.visible_columns + 1, viewport.visible_rows + 1
+
+    @property
+    def cell_width(self) -> float:
+        cols, _ = self.grid_size
+        return (self.width - (self.padding * cols)) / cols
+
+    @property
+    def cell_height(self) -> float:
+        _, rows = self.grid_size
+        return (self.height - (self.padding * rows)) / rows
+
+    def cell_index_at(self, cursor_pos: tuple[float, float]) -> int | None:
+        """
+            Ritorna l'indice della cella sotto il cursore nella griglia disegnata
+            (i * colonne + j, target compresi), oppure None.
+
+            La griglia è regolare, quindi basta una divisione per riga e colonna:
+            non serve controllare il rettangolo di ogni cella.
+            Se il cursore cade nel padding tra due celle ritorna None.
         """
-            Costruisce la griglia di Cell solo la prima volta, poi la riusa.
+        cols, rows = self.grid_size
+        cell_width, cell_height = self.cell_width, self.cell_height
+        step_x, step_y = cell_width + self.padding, cell_height + self.padding
+
+        cx, cy = cursor_pos
+        scale = get_settings().scale
+        cx = cx / scale - self.x
+        cy = cy / scale - self.y
 
-            - aggiunge 1 riga in alto per i target di colonna
-            - aggiunge 1 colonna a sinistra per i target di riga
-            - l'angolo (0, 0) resta vuoto
+        j, i = int(cx // step_x), int(cy // step_y)
+        if not (0 <= j < cols and 0 <= i < rows):
+            return None
 
-            Le celle interne hanno un comando di click che chiama master.play(...)
-            con action None, così si usa il comportamento "toggle" gestito dal Game.
+        # -> cursore nello spazio di padding
+        if cx - j * step_x > cell_width or cy - i * step_y > cell_height:
+            return None
+
+        return i * cols + j
+
+    def cell_xy(self, j: int, i: int) -> tuple[float, float]:
+        """Angolo in alto a sinistra della cella (j, i) della griglia disegnata."""
+        x = self.x + (j * self.cell_width) + (self.padding * j)
+        y = self.y + (i * self.cell_height) + (self.padding * i)
+        return x, y
+
+    # ======== CELLS ========
+    @property
+    def cells(self) -> list[Cell]:
+        """
+            Costruisce solo la prima volta le Cell di contorno, poi le riusa:
+            - l'angolo (indice 0) con l'indicatore
+            - la riga in alto con i target delle colonne visibili (indici 1..visible_columns)
+            - la colonna a sinistra con i target delle righe visibili
+
+            Sono solo visible_columns + visible_rows + 1 oggetti: le celle di gioco stanno in grid.
         """
         if self._cells is not None:
             return self._cells
 
-        cols = self.master.cols() + 1
-        rows = self.master.rows() + 1
-
+        viewport = self.viewport
         cols_targets = self.master.columns_targets
         rows_targets = self.master.rows_targets
+        cell_width, cell_height = self.cell_width, self.cell_height
 
-        cell_width = (self.width - (self.padding * cols)) / cols
-        cell_height = (self.height - (self.padding * rows)) / rows
-
-        def cell_xy(j: int, i: int) -> tuple[float, float]:
-            x = self.x + (j * cell_width) + (self.padding * j)
-            y = self.y + (i * cell_height) + (self.padding * i)
-            return x, y
-
-        cells: list[Cell] = []
-
-        for i in range(rows):
-            for j in range(cols):
-                x, y = cell_xy(j, i)
-                board_pos = (j - 1, i - 1)
-
-                if j == 0 and i == 0:
-                    cells.append(
-                        Cell(
-                            game=self.master,
-                            board_pos=board_pos,
-                            x=x, y=y, width=cell_width, height=cell_height,
-                        )
-                    )
-                    continue
-
-                # -> prima colonna: rows_targets
-                if j == 0:
-                    cells.append(
-                        Cell(
-                            game=self.master,
-                            board_pos=board_pos,
-                            x=x, y=y,
-                            width=cell_width, height=cell_height,
-                            text=str(rows_targets[i - 1])
-                        )
-                    )
-                    continue
-
-                # -> prima riga: columns_targets
-                if i == 0:
-                    cells.append(
-                        Cell(
-                            game=self.master,
-                            board_pos=board_pos,
-                            x=x, y=y,
-                            width=cell_width, height=cell_height,
-                            text=str(cols_targets[j - 1])
-                        )
-                    )
-                    continue
-
-                # -> grid
-                cells.append(
-                    Cell(
-                        game=self.master,
-                        board_pos=board_pos,
-                        x=x, y=y,
-                        width=cell_width, height=cell_height,
-                        text=None,
-                        command=(lambda j_=j, i_=i: self.master.play(j_ - 1, i_ - 1, None)),
-                        activate_keys=["LeftButton"]
-                    )
+        x, y = self.cell_xy(0, 0)
+        cells: list[Cell] = [
+            Cell(
+                game=self.master,
+                board_pos=(-1, -1),
+                x=x, y=y, width=cell_width, height=cell_height,
+                allow_deferred=self.allow_deferred
+            )
+        ]
+
+        # -> prima riga: columns_targets
+        for j in range(1, viewport.visible_columns + 1):
+            x, y = self.cell_xy(j, 0)
+            column = viewport.first_column + j - 1
+            cells.append(
+                Cell(
+                    game=self.master,
+                    board_pos=(column, -1),
+                    x=x, y=y,
+                    width=cell_width, height=cell_height,
+                    text=str(cols_targets[column])
                 )
+            )
+
+        # -> prima colonna: rows_targets
+        for i in range(1, viewport.visible_rows + 1):
+            x, y = self.cell_xy(0, i)
+            row = viewport.first_row + i - 1
+            cells.append(
+                Cell(
+                    game=self.master,
+                    board_pos=(-1, row),
+                    x=x, y=y,
+                    width=cell_width, height=cell_height,
+                    text=str(rows_targets[row])
+                )
+            )
 
         self._cells = cells
         return self._cells
 
+    @property
+    def grid(self) -> CellGrid:
+        """
+            Stato compatto delle celle di gioco visibili (hover, pressed, ultimo disegno), costruito la prima volta.
+            Il click su una cella chiama master.play(x, y, None), cioè il comportamento "toggle" del Game.
+        """
+        if self._grid is None:
+            viewport = self.viewport
+            self._grid = CellGrid(
+                columns=viewport.visible_columns, rows=viewport.visible_rows,
+                xs=[self.cell_xy(j + 1, 0)[0] for j in range(viewport.visible_columns)],
+                ys=[self.cell_xy(0, i + 1)[1] for i in range(viewport.visible_rows)],
+                width=self.cell_width, height=self.cell_height,
+                first_column=viewport.first_column, first_row=viewport.first_row
+            )
+        return self._grid
+
+    def cell(self, x: int, y: int) -> Cell | CellView | None:
+        """
+            Ritorna la cella in posizione (x, y) della board (-1 = riga/colonna dei target),
+            oppure None se non è visibile. Per le celle di gioco crea al momento una CellView leggera.
+        """
+        viewport = self.viewport
+        if x >= 0 and y >= 0:
+            return self.grid.view(x, y) if viewport.contains(x, y) else None
+        if x >= 0 and not viewport.first_column <= x < viewport.first_column + viewport.visible_columns:
+            return None
+        if y >= 0 and not viewport.first_row <= y < viewport.first_row + viewport.visible_rows:
+            return None
+        return self.cells[self._chrome_index(x, y)]
+
+    def _chrome_index(self, x: int, y: int) -> int:
+        """Indice in self.cells della cella di contorno (x, y), con x < 0 oppure y < 0."""
+        viewport = self.viewport
+        if x < 0 and y < 0:
+            return 0
+        if y < 0:
+            return 1 + x - viewport.first_column
+        return 1 + viewport.visible_columns + y - viewport.first_row
+
+    def _split(self, index: int) -> tuple[int, int]:
+        """Da indice della griglia disegnata a posizione (x, y) sulla board (-1 per indicatore e target)."""
+        viewport = self.viewport
+        i, j = divmod(index, self.grid_size[0])
+        x = -1 if j == 0 else viewport.first_column + j - 1
+        y = -1 if i == 0 else viewport.first_row + i - 1
+        return x, y
+
+    # ======== VIEWPORT ========
+    def _handle_viewport_keys(self, keys: list[str]) -> None:
+        for key in keys:
+            if key in PAN_KEYS:
+                self.viewport.pan(*PAN_KEYS[key])
+            elif key in ZOOM_KEYS:
+                self.viewport.zoom(ZOOM_KEYS[key])
+
+    def _sync_viewport(self) -> None:
+        """
+            Allinea celle e griglia alla finestra del viewport, se è cambiata dall'ultimo frame.
+
+            - pan: stesse celle, cambiano solo i target mostrati e le celle di gioco da ridisegnare
+            - zoom: cambia la dimensione delle celle, quindi vengono ricostruite e l'area va ripulita
+        """
+        layout = self.viewport.layout
+        previous = self._layout
+        self._layout = layout
+        if previous is None or layout == previous:
+            return
+
+        # -> al prossimo render le celle di gioco vanno ricontrollate tutte
+        self._rendered_version = None
+
+        if layout[2:] != previous[2:]:
+            self._cells = None
+            self._grid = None
+            self._hovered_index = None
+            self._needs_clear = True
+            return
+
+        first_column, first_row, visible_columns, visible_rows = layout
+        cols_targets = self.master.columns_targets
+        rows_targets = self.master.rows_targets
+        cells = self.cells
+        for j in range(visible_columns):
+            cells[1 + j].board_pos = (first_column + j, -1)
+            cells[1 + j].text = str(cols_targets[first_column + j])
+        for i in range(visible_rows):
+            cells[1 + visible_columns + i].board_pos = (-1, first_row + i)
+            cells[1 + visible_columns + i].text = str(rows_targets[first_row + i])
+
+        grid = self.grid
+        grid.first_column, grid.first_row = first_column, first_row
+        grid.invalidate()
+
     # ======== RENDERING ========
     def render_info(self):
-        """Raccoglie le info di render di tutte le celle e le unisce in un'unica lista."""
+        """
+            Raccoglie le info di render di tutte le celle visibili e le unisce in un'unica lista.
+
+            Le celle di gioco vengono ricontrollate tutte solo quando cambia il game (master.version);
+            altrimenti solo quelle che hanno cambiato hover/pressed. Ogni cella viene ridisegnata
+            solo se il suo codice di disegno è diverso dall'ultimo (o se è cambiato il tema).
+        """
+        self._sync_viewport()
+
         info = []
+        if self._needs_clear:
+            info.append({
+                "type": "rect",
+                "color": self.background_color,
+                "pos": (self.x, self.y),
+                "size": (self.width, self.height)
+            })
+            self._needs_clear = False
+
         for cell in self.cells:
             info.extend(cell.render_info())
+
+        grid = self.grid
+        theme = current_theme()
+        version = getattr(self.master, "version", None)
+
+        if theme is not self._rendered_theme:
+            grid.invalidate()
+            candidates = range(len(grid))
+        elif version is None or version != self._rendered_version:
+            candidates = range(len(grid))
+        else:
+            candidates = sorted(self._dirty)
+
+        font_size = (20 / 39) * min(grid.width, grid.height)
+        for index in candidates:
+            x, y = grid.position(index)
+            state = self.master.get_cell_state(x, y)
+            code = grid.draw_code(state.value, grid.hovered[index], grid.pressed[index])
+            if grid.drawn[index] != code:
+                grid.drawn[index] = code
+                info.extend(self._render_grid_cell(grid, index, theme.style(state), font_size))
+
+        self._dirty.clear()
+        self._rendered_version = version
+        self._rendered_theme = theme
         return info
 
+    def _render_grid_cell(self, grid: CellGrid, index: int, style, font_size: float) -> list[dict]:
+        """Istruzioni di disegno di una cella di gioco (stesso formato di Cell.render_info)."""
+        if grid.pressed[index]:
+            bg_color = style.pressed_color
+        elif grid.hovered[index]:
+            bg_color = style.hover_color
+        else:
+            bg_color = style.background_color
+
+        px, py = grid.origin(index)
+        width, height = grid.width, grid.height
+
+        return [
+            {
+                "type": "rect",
+                "color": bg_color,
+                "pos": (px, py),
+                "size": (width, height)
+            },
+            {
+                "type": "text",
+                "color": TEXT_COLOR,
+                "text": style.text,
+                "center": (px + width / 2, py + height / 2),
+                "font_size": font_size
+            }
+        ]
+
     # ======== TICK ========
     def tick(self, keys: list[str], cursor_pos: tuple[int, int]):
-        """Propaga input e posizione mouse a ogni Cell."""
-        for cell in self.cells:
-            cell.tick(keys, cursor_pos)
+        """
+            Aggiorna la board a ogni frame.
+
+            - frecce / + / - muovono e zoomano il viewport
+            - lo stato (testo e colori) viene sincronizzato sulle Cell di contorno visibili
+            - hover e click riguardano al massimo due celle: quella sotto il cursore
+              (trovata con cell_index_at) e quella che lo era al frame precedente
+        """
+        self._handle_viewport_keys(keys)
+        self._sync_viewport()
+
+        cells = self.cells
+        ready = [cell.refresh() for cell in cells]
+
+        index = self.cell_index_at(cursor_pos)
+
+        previous = self._hovered_index
+        if previous is not None and previous != index:
+            self._set_hovered(previous, False)
+
+        if index is not None:
+            self._set_hovered(index, True)
+            self._handle_keys(index, keys, ready)
+
+        self._hovered_index = index
+
+    def _set_hovered(self, index: int, hovered: bool) -> None:
+        """Hover della cella index (griglia disegnata): Cell di contorno oppure flag nella CellGrid."""
+        x, y = self._split(index)
+        if x < 0 or y < 0:
+            self.cells[self._chrome_index(x, y)].set_hovered(hovered)
+            return
+
+        grid = self.grid
+        k = grid.index(x, y)
+        grid.hovered[k] = 1 if hovered else 0
+        if not hovered:
+            grid.pressed[k] = 0
+        self._dirty.add(k)
+
+    def _handle_keys(self, index: int, keys: list[str], ready: list[bool]) -> None:
+        """Input sulla cella hovered: il click su una cella di gioco chiama master.play(x, y, None)."""
+        x, y = self._split(index)
+        if x < 0 or y < 0:
+            chrome = self._chrome_index(x, y)
+            if ready[chrome]:
+                self.cells[chrome].handle_keys(keys)
+            return
+
+        grid = self.grid
+        k = grid.index(x, y)
+        pressed = "LeftButton" in keys
+        if grid.pressed[k] != pressed:
+            grid.pressed[k] = 1 if pressed else 0
+            self._dirty.add(k)
+        if pressed:
+            self.master.play(x, y, None)
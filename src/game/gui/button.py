@@ -2,9 +2,7 @@ from collections.abc import Callable
 from .gui_component import GUIComponent
 from .color import Color
 
-from ..core.file_management import read_settings
-
-SCALE = read_settings().get("scale", 1)
+from ..core.settings import get_settings
 
 class Button(GUIComponent):
     def __init__(self,
@@ -55,8 +53,9 @@ class Button(GUIComponent):
     def contains(self, cursor_pos: tuple[float, float]) -> bool:
         """Ritorna True se il cursore è sopra il bottone."""
         cx, cy = cursor_pos
-        cx /= SCALE
-        cy /= SCALE
+        scale = get_settings().scale
+        cx /= scale
+        cy /= scale
         return (self.x <= cx <= self.x + self.width
                 and self.y <= cy <= self.y + self.height)
 
@@ -69,6 +68,15 @@ class Button(GUIComponent):
             return
         self.hovered = self.contains(cursor_pos)
 
+    def set_hovered(self, hovered: bool) -> None:
+        """
+        Imposta lo stato di hover dall'esterno, senza hit-test (es. quando il contenitore sa già quale bottone è sotto il cursore).
+        Se il bottone non è più hovered non può restare pressed.
+        """
+        self.hovered = hovered and self.enabled
+        if not self.hovered:
+            self.pressed = False
+
     def tick(self, keys: list[str], cursor_pos: tuple[float, float]) -> None:
         """
         Gestione completa del cursore e della tastiera per il bottone.
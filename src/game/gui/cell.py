@@ -1,11 +1,7 @@
 from collections.abc import Callable
 from .button import Button
 from .color import Color
-
-from ..core.file_management import read_settings
-
-SCALE = read_settings().get("scale", 1)
-SETTINGS = read_settings()
+from .cell_style import current_theme
 
 
 class Cell(Button):
@@ -26,29 +22,40 @@ class Cell(Button):
                  fixed: bool = True,
                  enabled: bool = True,
                  command: Callable[[], None] | None = None,
-                 activate_keys: list[str] | None = None) -> None:
+                 activate_keys: list[str] | None = None,
+                 allow_deferred: Callable[[str], bool] | None = None) -> None:
         """
             Una singola cella cliccabile della board.
 
             È un Button specializzato che:
             - mantiene riferimento al gioco a cui appartiene (game)
             - ricorda la propria coordinata sulla griglia (board_pos)
-            - prende testo e colori da settings.json in base allo stato della cella (EMPTY, TREE, TENT, ...)
+            - prende testo e colori dal tema corrente (settings.json compilato, vedi cell_style)
+              in base allo stato della cella (EMPTY, TREE, TENT, ...)
 
             Se passi text manualmente (ad esempio per i numeri target) ha priorità
             e non viene sovrascritto dallo stato del gioco.
-        """
 
-        global SETTINGS
+            La cella d'angolo (-1, -1) mostra l'indicatore (risolto / errore / in corso): viene ricalcolato
+            solo quando cambia game.version, e allow_deferred può rimandarlo a un frame con più margine.
+        """
 
         self.cooldown = 0
         self.cooldown_time = 0
 
+        self.allow_deferred = allow_deferred
+        self._indicator_version = None
+        self._indicator_ready = False
+        self._indicator_theme = None
+
+        self._style = None
+        self._text_size_for = None
+
         self.game = game
         self.board_pos = board_pos
 
-        state = str(self.game.get_cell_state(*self.board_pos))
-        self.text = SETTINGS.get(state, {}).get("text", "Error") if text is None else text
+        state = self.game.get_cell_state(*self.board_pos)
+        self.text = current_theme().style(state).text if text is None else text
 
         super().__init__(name_id=name_id,
                          x=x, y=y, width=width, height=height,
@@ -64,32 +71,63 @@ class Cell(Button):
         """
             Aggiorna la cella a ogni frame.
             - gestisce un piccolo cooldown per evitare click multipli
-            - ricalcola testo e colori leggendo lo stato attuale dal game (e da SETTINGS)
+            - ricalcola testo e colori leggendo lo stato attuale dal game (e dal tema corrente)
             - aggiorna hover e gestisce l'input (handle_keys)
         """
-        global SETTINGS
-
-        if self.cooldown > 0:
-            self.cooldown -= 1
+        if not self.refresh():
             return
 
-        self.text_size = (20 / 39) * min(self.width, self.height) # -> 20/39 è una proporzione utile per determinare la dimensione del testo in base al lato minimo della cella
+        self.update_hover(cursor_pos)
+        self.handle_keys(keys)
 
-        state = str(self.game.get_cell_state(*self.board_pos))
+    def refresh(self) -> bool:
+        """
+            Sincronizza testo e colori con lo stato attuale del game, senza toccare hover e input.
 
-        if self.game.inside(*self.board_pos):
-            self.text = SETTINGS.get(state, {}).get("text", "Error")
-        elif self.board_pos == (-1, -1):
-            if self.game.finished(): self.text = SETTINGS.get("INDICATOR", {}).get("correct")
-            elif self.game.wrong(): self.text = SETTINGS.get("INDICATOR", {}).get("incorrect")
-            else: self.text = SETTINGS.get("INDICATOR", {}).get("warning")
+            Ritorna False se la cella è in cooldown (e in quel caso non aggiorna nulla).
+            La Board la usa per aggiornare tutte le celle, gestendo poi l'hover solo dove serve.
+        """
+        if self.cooldown > 0:
+            self.cooldown -= 1
+            return False
+
+        size_key = (self.width, self.height)
+        if size_key != self._text_size_for:
+            self.text_size = (20 / 39) * min(self.width, self.height) # -> 20/39 è una proporzione utile per determinare la dimensione del testo in base al lato minimo della cella
+            self._text_size_for = size_key
+
+        theme = current_theme()
+        style = theme.style(self.game.get_cell_state(*self.board_pos))
+
+        if self.board_pos == (-1, -1):
+            self._refresh_indicator(theme)
+
+        # -> lo stile è immutabile: se è lo stesso oggetto dell'ultimo frame non c'è niente da copiare
+        if style is not self._style:
+            self._style = style
+            if self.game.inside(*self.board_pos):
+                self.text = style.text
+            self.background_color = style.background_color
+            self.hover_color = style.hover_color
+            self.pressed_color = style.pressed_color
+
+        return True
+
+    def _refresh_indicator(self, theme) -> None:
+        """Ricalcola il testo dell'indicatore, se il game è cambiato e il lavoro non va rimandato."""
+        version = getattr(self.game, "version", None)
+        if self._indicator_ready and version is not None and version == self._indicator_version and theme is self._indicator_theme:
+            return
+        if self._indicator_ready and self.allow_deferred is not None and not self.allow_deferred("indicator"):
+            return
 
-        self.background_color = tuple(SETTINGS.get(state, {}).get("background_color", (48, 48, 48)))
-        self.hover_color = tuple(SETTINGS.get(state, {}).get("hover_color", (48, 48, 108)))
-        self.pressed_color = tuple(SETTINGS.get(state, {}).get("pressed_color", (48, 64, 208)))
+        if self.game.finished(): self.text = theme.correct
+        elif self.game.wrong(): self.text = theme.incorrect
+        else: self.text = theme.warning
 
-        self.update_hover(cursor_pos)
-        self.handle_keys(keys)
+        self._indicator_version = version
+        self._indicator_theme = theme
+        self._indicator_ready = True
 
     def invoke(self) -> None:
         """Esegue il command associato alla cella (se abilitata), con un cooldown."""
@@ -0,0 +1,143 @@
+from __future__ import annotations
+from array import array
+from collections.abc import Iterable
+
+
+class CellGrid:
+    """
+        Stato di interfaccia delle celle di gioco in forma compatta (struct-of-arrays).
+
+        Invece di un oggetto Cell per ogni posizione, tiene array paralleli indicizzati da
+        index = (y - first_row) * columns + (x - first_column):
+        - hovered / pressed: flag 0/1 (bytearray, 1 byte per cella)
+        - drawn: codice dell'ultimo disegno (vedi draw_code), NOT_DRAWN se la cella va ridisegnata
+
+        Le posizioni non sono salvate per cella: bastano le coordinate di colonne (xs) e righe (ys).
+        La griglia può coprire solo una parte della board (la finestra di un Viewport): first_column e
+        first_row dicono da quale cella parte, x e y restano sempre coordinate della board.
+        Le CellView (oggetti leggeri) vengono create solo quando servono, con view().
+    """
+
+    NOT_DRAWN = 255
+
+    __slots__ = ("columns", "rows", "xs", "ys", "width", "height", "first_column", "first_row",
+                 "hovered", "pressed", "drawn")
+
+    def __init__(self,
+                 columns: int,
+                 rows: int,
+                 xs: Iterable[float],
+                 ys: Iterable[float],
+                 width: float,
+                 height: float,
+                 first_column: int = 0,
+                 first_row: int = 0) -> None:
+        self.columns = columns
+        self.rows = rows
+        self.xs = array("d", xs)
+        self.ys = array("d", ys)
+        self.width = width
+        self.height = height
+        self.first_column = first_column
+        self.first_row = first_row
+
+        if len(self.xs) != columns or len(self.ys) != rows:
+            raise ValueError("< xs/ys must have one coordinate per column/row >")
+
+        size = columns * rows
+        self.hovered = bytearray(size)
+        self.pressed = bytearray(size)
+        self.drawn = bytearray([self.NOT_DRAWN]) * size
+
+    def __len__(self) -> int:
+        return self.columns * self.rows
+
+    # ======== METHODS ========
+    def index(self, x: int, y: int) -> int:
+        return (y - self.first_row) * self.columns + (x - self.first_column)
+
+    def position(self, index: int) -> tuple[int, int]:
+        """Coordinate (x, y) sulla board della cella index."""
+        y, x = divmod(index, self.columns)
+        return x + self.first_column, y + self.first_row
+
+    def origin(self, index: int) -> tuple[float, float]:
+        """Angolo in alto a sinistra (in pixel) della cella index."""
+        y, x = divmod(index, self.columns)
+        return self.xs[x], self.ys[y]
+
+    def view(self, x: int, y: int) -> CellView:
+        return CellView(self, self.index(x, y))
+
+    def invalidate(self) -> None:
+        """Forza il ridisegno di tutte le celle al prossimo render."""
+        self.drawn[:] = bytes([self.NOT_DRAWN]) * len(self)
+
+    @staticmethod
+    def draw_code(state_value: int, hovered: int, pressed: int) -> int:
+        """Codice (< NOT_DRAWN) di tutto ciò che cambia il disegno di una cella: stato, hover e pressed."""
+        return (state_value << 2) | (hovered << 1) | pressed
+
+    @property
+    def nbytes(self) -> int:
+        """Memoria occupata dagli array (byte)."""
+        return (len(self.hovered) + len(self.pressed) + len(self.drawn)
+                + self.xs.itemsize * len(self.xs) + self.ys.itemsize * len(self.ys))
+
+
+class CellView:
+    """
+        Vista leggera su una cella di CellGrid: non copia dati, legge e scrive negli array della griglia.
+        Ha solo due attributi (__slots__), quindi crearla costa pochissimo.
+    """
+
+    __slots__ = ("grid", "index")
+
+    def __init__(self, grid: CellGrid, index: int) -> None:
+        self.grid = grid
+        self.index = index
+
+    def __repr__(self) -> str:
+        return f"{self.__class__.__name__}(board_pos={self.board_pos})"
+
+    def __eq__(self, other) -> bool:
+        if not isinstance(other, CellView):
+            return NotImplemented
+        return self.grid is other.grid and self.index == other.index
+
+    def __hash__(self) -> int:
+        return hash((id(self.grid), self.index))
+
+    @property
+    def board_pos(self) -> tuple[int, int]:
+        return self.grid.position(self.index)
+
+    @property
+    def x(self) -> float:
+        return self.grid.origin(self.index)[0]
+
+    @property
+    def y(self) -> float:
+        return self.grid.origin(self.index)[1]
+
+    @property
+    def width(self) -> float:
+        return self.grid.width
+
+    @property
+    def height(self) -> float:
+        return self.grid.height
+
+    @property
+    def hovered(self) -> bool:
+        return bool(self.grid.hovered[self.index])
+    @hovered.setter
+    def hovered(self, value: bool) -> None:
+        self.grid.hovered[self.index] = 1 if value else 0
+
+    @property
+    def pressed(self) -> bool:
+        return bool(self.grid.pressed[self.index])
+    @pressed.setter
+    def pressed(self, value: bool) -> None:
+        self.grid.pressed[self.index] = 1 if value else 0
@@ -0,0 +1,90 @@
+from __future__ import annotations
+from collections.abc import Mapping
+from typing import NamedTuple
+
+from ..core.settings import get_settings, subscribe
+from ..state import CellState
+
+RGBA = tuple[int, int, int, int]
+
+
+class CellStyle(NamedTuple):
+    """Aspetto di un CellState: glifo (text) e colori già in RGBA. Immutabile."""
+    text: str
+    background_color: RGBA
+    hover_color: RGBA
+    pressed_color: RGBA
+
+
+class Theme(NamedTuple):
+    """
+        settings.json "compilato": uno stile per ogni CellState, indicizzato da CellState.value,
+        più i glifi dell'indicatore (risolto / errore / in corso).
+
+        Essendo immutabile, cambiare tema significa sostituire l'intero Theme (set_theme):
+        chi lo sta usando vede o il vecchio o il nuovo, mai un misto.
+    """
+    styles: tuple[CellStyle, ...]
+    correct: str
+    incorrect: str
+    warning: str
+
+    def style(self, state: CellState) -> CellStyle:
+        return self.styles[state.value]
+
+
+DEFAULT_STYLE = CellStyle(
+    text="Error",
+    background_color=(48, 48, 48, 255),
+    hover_color=(48, 48, 108, 255),
+    pressed_color=(48, 64, 208, 255)
+)
+
+
+def _rgba(value, default: RGBA) -> RGBA:
+    if value is None:
+        return default
+    values = tuple(value)
+    return values if len(values) == 4 else values + (255,)
+
+
+def compile_theme(settings: Mapping) -> Theme:
+    """Trasforma le sezioni EMPTY, TREE, TENT, GRASS, OUT e INDICATOR di settings in un Theme."""
+    styles = [DEFAULT_STYLE] * (max(state.value for state in CellState) + 1)
+    for state in CellState:
+        section = settings.get(str(state), {})
+        styles[state.value] = CellStyle(
+            text=section.get("text", DEFAULT_STYLE.text),
+            background_color=_rgba(section.get("background_color"), DEFAULT_STYLE.background_color),
+            hover_color=_rgba(section.get("hover_color"), DEFAULT_STYLE.hover_color),
+            pressed_color=_rgba(section.get("pressed_color"), DEFAULT_STYLE.pressed_color)
+        )
+
+    indicator = settings.get("INDICATOR", {})
+    return Theme(
+        styles=tuple(styles),
+        correct=indicator.get("correct"),
+        incorrect=indicator.get("incorrect"),
+        warning=indicator.get("warning")
+    )
+
+
+# -> compilato alla prima richiesta (non all'import) e ricompilato a ogni reload di settings.json
+THEME: Theme | None = None
+
+
+def current_theme() -> Theme:
+    global THEME
+    if THEME is None:
+        THEME = compile_theme(get_settings().sections)
+    return THEME
+
+
+def set_theme(settings: Mapping) -> Theme:
+    """Compila settings e lo rende il tema corrente (un'unica assegnazione). Ritorna il nuovo Theme."""
+    global THEME
+    THEME = compile_theme(settings)
+    return THEME
+
+
+subscribe(lambda settings: set_theme(settings.sections))
@@ -0,0 +1,143 @@
+from __future__ import annotations
+
+
+class Viewport(object):
+    """
+        Finestra (in celle) sulla board di gioco: quali colonne e righe sono visibili.
+
+        - first_column / first_row: prima cella visibile in alto a sinistra
+        - visible_columns / visible_rows: quante colonne e righe si vedono (lo zoom)
+
+        Sposta la finestra con pan() e cambia lo zoom con zoom(): i valori vengono sempre
+        riportati dentro la board. La Board confronta layout con quello dell'ultimo frame
+        per sapere quando ricalcolare celle e target.
+    """
+
+    def __init__(self,
+                 columns: int,
+                 rows: int,
+                 visible_columns: int | None = None,
+                 visible_rows: int | None = None,
+                 min_visible: int = 5) -> None:
+        self.columns = columns
+        self.rows = rows
+        self.min_visible = min_visible
+
+        self.__first_column = 0
+        self.__first_row = 0
+
+        self.visible_columns = columns if visible_columns is None else visible_columns
+        self.visible_rows = rows if visible_rows is None else visible_rows
+
+    def __repr__(self) -> str:
+        return (f"{self.__class__.__name__}(columns={self.columns}, rows={self.rows}, "
+                f"visible_columns={self.visible_columns}, visible_rows={self.visible_rows})")
+
+    # ======== METHODS ========
+    def pan(self, dx: int, dy: int) -> bool:
+        """Sposta la finestra di dx colonne e dy righe. Ritorna True se si è mossa."""
+        before = self.first_column, self.first_row
+        self.first_column += dx
+        self.first_row += dy
+        return (self.first_column, self.first_row) != before
+
+    def zoom(self, delta: int) -> bool:
+        """
+            Cambia di delta il numero di colonne e righe visibili (delta < 0 = zoom in),
+            mantenendo il più possibile lo stesso centro. Ritorna True se è cambiato qualcosa.
+        """
+        before = self.layout
+        center_x = self.first_column + self.visible_columns / 2
+        center_y = self.first_row + self.visible_rows / 2
+
+        self.visible_columns += delta
+        self.visible_rows += delta
+        self.first_column = round(center_x - self.visible_columns / 2)
+        self.first_row = round(center_y - self.visible_rows / 2)
+        return self.layout != before
+
+    def contains(self, x: int, y: int) -> bool:
+        """True se la cella (x, y) della board è dentro la finestra."""
+        return (self.first_column <= x < self.first_column + self.visible_columns
+                and self.first_row <= y < self.first_row + self.visible_rows)
+
+    @property
+    def layout(self) -> tuple[int, int, int, int]:
+        """(first_column, first_row, visible_columns, visible_rows)"""
+        return self.first_column, self.first_row, self.visible_columns, self.visible_rows
+
+    # ======== PROPERTIES ========
+    @property
+    def columns(self) -> int:
+        return self.__columns
+    @columns.setter
+    def columns(self, value: int) -> None:
+        if not isinstance(value, int):
+            raise TypeError("columns must be int")
+        if value <= 0:
+            raise ValueError("columns must be > 0")
+        self.__columns = value
+
+    @property
+    def rows(self) -> int:
+        return self.__rows
+    @rows.setter
+    def rows(self, value: int) -> None:
+        if not isinstance(value, int):
+            raise TypeError("rows must be int")
+        if value <= 0:
+            raise ValueError("rows must be > 0")
+        self.__rows = value
+
+    @property
+    def min_visible(self) -> int:
+        return self.__min_visible
+    @min_visible.setter
+    def min_visible(self, value: int) -> None:
+        if not isinstance(value, int):
+            raise TypeError("min_visible must be int")
+        if value <= 0:
+            raise ValueError("min_visible must be > 0")
+        self.__min_visible = value
+
+    @property
+    def visible_columns(self) -> int:
+        return self.__visible_columns
+    @visible_columns.setter
+    def visible_columns(self, value: int) -> None:
+        if not isinstance(value, int):
+            raise TypeError("visible_columns must be int")
+        value = max(min(self.min_visible, self.columns), min(value, self.columns))
+        self.__visible_columns = value
+        self.first_column = self.first_column
+
+    @property
+    def visible_rows(self) -> int:
+        return self.__visible_rows
+    @visible_rows.setter
+    def visible_rows(self, value: int) -> None:
+        if not isinstance(value, int):
+            raise TypeError("visible_rows must be int")
+        value = max(min(self.min_visible, self.rows), min(value, self.rows))
+        self.__visible_rows = value
+        self.first_row = self.first_row
+
+    @property
+    def first_column(self) -> int:
+        return self.__first_column
+    @first_column.setter
+    def first_column(self, value: int) -> None:
+        if not isinstance(value, int):
+            raise TypeError("first_column must be int")
+        value = max(0, min(value, self.columns - self.visible_columns))
+        self.__first_column = value
+
+    @property
+    def first_row(self) -> int:
+        return self.__first_row
+    @first_row.setter
+    def first_row(self, value: int) -> None:
+        if not isinstance(value, int):
+            raise TypeError("first_row must be int")
+        value = max(0, min(value, self.rows - self.visible_rows))
+        self.__first_row = value
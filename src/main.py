@@ -1,4 +1,10 @@
-from src.game import main
+import sys
 
 if __name__ == "__main__":
+    # -> il profilo parte prima di importare il gioco, così misura anche gli import (vedi core/startup_profile.py)
+    if "--profile-startup" in sys.argv[1:]:
+        from src.game.core.startup_profile import start
+        start()
+
+    from src.game import main
     main()
\ No newline at end of file
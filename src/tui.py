@@ -0,0 +1,4 @@
+from src.game.board_game_tui import main
+
+if __name__ == "__main__":
+    main()
\ No newline at end of file
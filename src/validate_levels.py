@@ -0,0 +1,4 @@
+from src.game.core.level_validator import main
+
+if __name__ == "__main__":
+    main()
\ No newline at end of file
@@ -0,0 +1,133 @@
+import os
+import pathlib
+import subprocess
+import sys
+import unittest
+from unittest.mock import patch
+
+from src.g2d_lib import g2d
+
+
+ROOT = pathlib.Path(__file__).resolve().parents[2]
+
+# -> cosa dava "from src.game import *" prima dell'import pigro, senza moduli, nomi di typing/stdlib e le copie
+#    di settings (settings, SIZE, SCALE, FPS) sostituite da get_settings()
+BASELINE_EXPORTS = {
+    "Action", "AppPhase", "CellState", "MenuPhase",
+    "BoardGame", "abstract", "print_game", "console_play",
+    "BoardGameGui", "init_canvas", "close_canvas", "clear_canvas", "gui_get_current_keys",
+    "gui_get_released_keys", "gui_get_mouse_pos", "gui_get_previous_keys",
+    "GUIComponent", "Bar", "Button", "Text", "Color", "Board",
+    "Game", "Level", "show_levels", "DEFAULT", "read_settings", "App", "main", "MenuManager", "MenuWindow",
+}
+
+
+def loaded_modules(code: str) -> set[str]:
+    """Moduli caricati da un interprete nuovo dopo aver eseguito code."""
+    result = subprocess.run([sys.executable, "-c", code + "\nimport sys; print(' '.join(sys.modules))"],
+                            cwd=ROOT, capture_output=True, text=True, check=True)
+    return set(result.stdout.split())
+
+
+class G2dImportTest(unittest.TestCase):
+    def test_import_does_not_load_pygame_or_tk(self):
+        """Importare g2d non deve caricare pygame né Tkinter: arrivano con init_canvas o con i dialoghi."""
+        modules = loaded_modules("from src.g2d_lib import g2d")
+        self.assertNotIn("pygame", modules)
+        self.assertNotIn("tkinter", modules)
+
+    def test_engine_import_has_no_gui_dependencies(self):
+        """Il motore (game, level, save_game) si importa senza pygame, Tkinter, g2d e multiprocessing."""
+        modules = loaded_modules("import src.game.core.game, src.game.core.level, src.game.core.save_game")
+        for name in ("pygame", "tkinter", "src.g2d_lib.g2d", "src.game.core.app", "multiprocessing"):
+            self.assertNotIn(name, modules)
+
+    def test_package_names_are_loaded_on_first_use(self):
+        """I nomi del package game restano disponibili, ma vengono importati solo al primo accesso."""
+        import src.game
+        from src.game.core.game import Game
+
+        self.assertIs(src.game.Game, Game)
+        self.assertIn("main", dir(src.game))
+        with self.assertRaises(AttributeError):
+            src.game.not_a_name
+
+    def test_lazy_exports_keep_baseline_names(self):
+        """__all__ del package game contiene tutti i nomi che "from src.game import *" dava prima, e ognuno si risolve."""
+        import src.game
+
+        self.assertLessEqual(BASELINE_EXPORTS, set(src.game.__all__))
+        namespace = {}
+        exec("from src.game import *", namespace)
+        self.assertLessEqual(BASELINE_EXPORTS, set(namespace))
+
+    def test_missing_pygame_is_installed_on_first_use(self):
+        """Se pygame manca, _pygame lo installa con pip (come faceva l'import di g2d) e poi lo importa."""
+        import pygame
+
+        def install(command):
+            sys.modules["pygame"] = pygame                # -> "installato": l'import successivo riesce
+            return 0
+
+        with patch.object(g2d, "pg", None), patch.dict(sys.modules, {"pygame": None}), \
+                patch("subprocess.call", side_effect=install) as mock_call:
+            module = g2d._pygame()
+
+        command = mock_call.call_args.args[0]
+        self.assertEqual(command[:5], [sys.executable, "-m", "pip", "install", "pygame"])
+        self.assertIs(module, pygame)
+
+
+class G2dHeadlessTest(unittest.TestCase):
+    def setUp(self):
+        with patch.dict(os.environ, {"G2D_BACKEND": "headless"}):
+            g2d.init_canvas((40, 30))
+        g2d.clear_canvas((0, 0, 0))
+
+    def test_headless_backend_has_no_window_and_no_tk(self):
+        """Il backend headless disegna su una Surface in memoria, senza creare Tk."""
+        self.assertEqual(g2d.canvas_size(), (40, 30))
+        self.assertIsNone(g2d._tkmain)
+        g2d.update_canvas()
+
+    def test_frame_buffer_shape_and_pixels(self):
+        """frame_buffer deve avere forma (h, w, 3) e contenere i pixel disegnati."""
+        g2d.set_color((255, 0, 0))
+        g2d.draw_rect((10, 5), (5, 5))
+
+        frame = g2d.frame_buffer()
+
+        self.assertEqual(frame.shape, (30, 40, 3))
+        self.assertEqual(tuple(frame[6, 11, c] for c in range(3)), (255, 0, 0))
+        self.assertEqual(tuple(frame[0, 0, c] for c in range(3)), (0, 0, 0))
+
+    def test_translucent_rect_only_touches_its_bounding_box(self):
+        """Un rettangolo semitrasparente deve fondersi solo nella sua area."""
+        g2d.set_color((255, 255, 255, 128))
+        g2d.draw_rect((0, 0), (10, 10))
+
+        frame = g2d.frame_buffer()
+
+        self.assertGreater(frame[5, 5, 0], 100)
+        self.assertLess(frame[5, 5, 0], 150)
+        self.assertEqual(tuple(frame[20, 20, c] for c in range(3)), (0, 0, 0))
+
+    def test_dialogs_do_not_block_headless(self):
+        """alert/confirm/prompt non devono aprire finestre in headless."""
+        g2d.alert("hi")
+        self.assertEqual(g2d.alerts()[-1], "hi")
+        self.assertTrue(g2d.confirm("ok?"))
+        self.assertEqual(g2d.prompt("name?"), "")
+
+
+    def test_import_does_not_load_tkinter(self):
+        """Importare g2d non deve importare tkinter (serve solo per i dialoghi in finestra)."""
+        import subprocess, sys
+        code = "import sys; from src.g2d_lib import g2d; print('tkinter' in sys.modules)"
+        out = subprocess.run([sys.executable, "-c", code], capture_output=True, text=True,
+                             env={**os.environ, "PYGAME_HIDE_SUPPORT_PROMPT": "1"})
+        self.assertEqual(out.stdout.strip().splitlines()[-1], "False")
+
+
+if __name__ == "__main__":
+    unittest.main()
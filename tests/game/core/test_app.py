@@ -1,7 +1,14 @@
+import contextlib
+import io
+import os
+import threading
 import unittest
 from unittest.mock import Mock, patch
 
 import src.game.core.app as app_module
+from src.g2d_lib import g2d
+from src.game.core.frame_governor import FrameGovernor
+from src.game.gui.cell_style import current_theme
 
 
 class AppTest(unittest.TestCase):
@@ -16,6 +23,18 @@ class AppTest(unittest.TestCase):
                 get_mouse_pos_from=self.get_mouse
             )
 
+        # -> GeneratorPool e PuzzleStore veri avvierebbero processi e scriverebbero su disco: qui sono mock vuoti
+        self.generator = Mock(sides=range(8, 10), depths={})
+        self.generator.take.return_value = None
+        self.app.generator = self.generator
+
+        self.puzzles = Mock()
+        self.puzzles.take.return_value = None
+        self.app.puzzles = self.puzzles
+
+        self.saves = Mock()
+        self.app.saves = self.saves
+
     # ======== INIT E PROPERTIES ========
     def test_init_default_state(self):
         """App deve partire in fase MENU e creare MenuManager."""
@@ -48,7 +67,7 @@ class AppTest(unittest.TestCase):
         """Se il livello è nella lista, usa Game.init_from_level e passa a PLAYING."""
         level = Mock()
 
-        game_obj = Mock()
+        game_obj = Mock(seed=None)
         gui_obj = Mock()
 
         with patch.object(app_module, "show_levels", return_value=[level]):
@@ -56,40 +75,138 @@ class AppTest(unittest.TestCase):
                 with patch.object(app_module, "BoardGameGui", return_value=gui_obj) as mock_gui:
                     self.app.load_game(level)
 
-        mock_init.assert_called_once_with(level)
+        mock_init.assert_called_once_with(level, debug_checks=self.app.settings.debug_checks)
         mock_gui.assert_called_once()
         self.assertIs(self.app.game, game_obj)
         self.assertIs(self.app.gui, gui_obj)
         self.assertEqual(self.app.app_phase, app_module.AppPhase.PLAYING)
 
     def test_load_game_random_when_level_not_found(self):
-        """Se il livello non esiste, genera una board random e passa a PLAYING."""
-        game_obj = Mock()
+        """Se il livello non esiste e i pool sono vuoti, genera sul momento una board con un id nuovo."""
+        game_obj = Mock(seed=None)
         gui_obj = Mock()
 
         with patch.object(app_module, "show_levels", return_value=[]):
             with patch.object(app_module.random, "randint", return_value=10) as mock_rand:
-                with patch.object(app_module, "Game", return_value=game_obj) as mock_game:
+                with patch.object(app_module.PuzzleId, "random") as mock_id:
+                    mock_id.return_value.generate.return_value = game_obj
                     with patch.object(app_module, "BoardGameGui", return_value=gui_obj) as mock_gui:
                         self.app.load_game(level=Mock())
 
         mock_rand.assert_called_once_with(8, 20)
-        mock_game.assert_called_once_with(rows=10, columns=10)
+        self.puzzles.take.assert_called_once_with(10, 10, debug_checks=self.app.settings.debug_checks)
+        self.generator.take.assert_called_once_with(10, debug_checks=self.app.settings.debug_checks)
+        mock_id.assert_called_once_with(10, 10)
+        mock_id.return_value.generate.assert_called_once_with(debug_checks=self.app.settings.debug_checks)
         mock_gui.assert_called_once()
         self.assertIs(self.app.game, game_obj)
         self.assertIs(self.app.gui, gui_obj)
         self.assertEqual(self.app.app_phase, app_module.AppPhase.PLAYING)
 
+    def test_load_game_random_uses_pregenerated_board(self):
+        """Con una board pronta nel GeneratorPool, load_game la usa senza generare nel thread del canvas."""
+        game_obj = Mock(seed=None)
+        self.generator.take.return_value = game_obj
+
+        with patch.object(app_module, "show_levels", return_value=[]):
+            with patch.object(app_module.random, "randint", return_value=12):
+                with patch.object(app_module, "Game") as mock_game:
+                    with patch.object(app_module, "BoardGameGui", return_value=Mock()):
+                        self.app.load_game(level=None)
+
+        self.generator.take.assert_called_once_with(12, debug_checks=self.app.settings.debug_checks)
+        mock_game.assert_not_called()
+        self.assertIs(self.app.game, game_obj)
+        self.assertEqual(self.app.app_phase, app_module.AppPhase.PLAYING)
+
+    def test_load_game_random_prefers_puzzle_store(self):
+        """Il pool su disco ha la precedenza: se ha un puzzle per quel lato, il GeneratorPool non viene toccato."""
+        game_obj = Mock(seed=None)
+        self.puzzles.take.return_value = game_obj
+
+        with patch.object(app_module, "show_levels", return_value=[]):
+            with patch.object(app_module.random, "randint", return_value=9):
+                with patch.object(app_module, "BoardGameGui", return_value=Mock()):
+                    self.app.load_game(level=None)
+
+        self.puzzles.take.assert_called_once_with(9, 9, debug_checks=self.app.settings.debug_checks)
+        self.generator.take.assert_not_called()
+        self.assertIs(self.app.game, game_obj)
+
+    def test_load_game_from_puzzle_id_regenerates_same_board(self):
+        """Con un PuzzleId load_game rigenera la stessa board e ne ricorda l'id."""
+        puzzle_id = app_module.PuzzleId.parse("1-9x7-ABC12")
+
+        with patch.object(app_module, "BoardGameGui", return_value=Mock()):
+            self.app.load_game(puzzle_id)
+            first = (self.app.game.trees, self.app.game.correct_tents)
+            self.app.load_game(puzzle_id)
+
+        self.assertEqual((self.app.game.cols(), self.app.game.rows()), (9, 7))
+        self.assertEqual((self.app.game.trees, self.app.game.correct_tents), first)
+        self.assertEqual(self.app.puzzle_id, puzzle_id)
+        self.assertEqual(self.app.app_phase, app_module.AppPhase.PLAYING)
+
+    def test_main_puzzle_argument_starts_that_puzzle(self):
+        """main(["--puzzle", ID]) deve saltare il menu e far partire la board di quell'id."""
+        with patch.object(app_module, "MenuManager", return_value=Mock()), \
+             patch.object(app_module, "GeneratorPool"), patch.object(app_module, "PuzzleStore"), \
+             patch.object(app_module, "init_canvas") as mock_canvas:
+            app_module.main(["--puzzle", "1-8x8-7q"])
+
+        app = mock_canvas.call_args.kwargs["tick"].__self__
+        self.assertEqual(app.app_phase, app_module.AppPhase.START_GAME)
+        self.assertEqual(app.menu.selected_level_data, app_module.PuzzleId(1, 8, 8, 7 * 32 + 23))
+
+    def test_store_ready_moves_board_to_disk_when_below_keep(self):
+        """Nel tempo libero le board pronte passano dal GeneratorPool al PuzzleStore, finché il lato ha meno di keep puzzle."""
+        self.generator.depths = {8: 0, 9: 2}
+        self.generator.take_record.return_value = (9, 123, [(0, 0)], [(1, 0)])
+        self.puzzles.count.return_value = 0
+
+        self.assertTrue(self.app.store_ready())
+        self.app.close_puzzles()
+
+        self.assertEqual(self.generator.take_record.call_count, 2)
+        record = (9, 9, [(0, 0)], [(1, 0)], 123, app_module.UNRATED, app_module.GENERATOR_VERSION)
+        self.puzzles.add_many.assert_called_once_with([record, record])
+        self.puzzles.close.assert_called_once_with()
+
+        self.puzzles.count.return_value = 10 ** 6
+        self.assertFalse(self.app.store_ready())
+
+    def test_store_ready_writes_in_background(self):
+        """La scrittura su disco avviene nel thread puzzle-store: store_ready non aspetta e non ne avvia un'altra finché non finisce."""
+        self.generator.depths = {9: 1}
+        self.generator.take_record.return_value = (9, 123, [(0, 0)], [(1, 0)])
+        self.puzzles.count.return_value = 0
+        release = threading.Event()
+        threads = []
+
+        def slow_add_many(batch):
+            threads.append(threading.current_thread())
+            release.wait(5)
+            return len(batch)
+        self.puzzles.add_many.side_effect = slow_add_many
+
+        self.assertTrue(self.app.store_ready())
+        self.assertFalse(self.app.store_ready())
+        release.set()
+        self.app.close_puzzles()
+
+        self.assertEqual(self.puzzles.add_many.call_count, 1)
+        self.assertIsNot(threads[0], threading.main_thread())
+
     def test_load_game_builds_gui_with_actions(self):
         """load_game deve creare BoardGameGui con la mappa tasti/azioni corretta."""
-        game_obj = Mock()
+        game_obj = Mock(seed=None)
         gui_obj = Mock()
+        self.generator.take.return_value = game_obj
 
         with patch.object(app_module, "show_levels", return_value=[]):
             with patch.object(app_module.random, "randint", return_value=8):
-                with patch.object(app_module, "Game", return_value=game_obj):
-                    with patch.object(app_module, "BoardGameGui", return_value=gui_obj) as mock_gui:
-                        self.app.load_game(level=None)
+                with patch.object(app_module, "BoardGameGui", return_value=gui_obj) as mock_gui:
+                    self.app.load_game(level=None)
 
         args, kwargs = mock_gui.call_args
         self.assertIs(kwargs["game"], game_obj)
@@ -112,6 +229,52 @@ class AppTest(unittest.TestCase):
         self.assertEqual(self.app.app_phase, app_module.AppPhase.MENU)
         self.app.gui.tick.assert_not_called()
 
+    def test_play_game_esc_saves_the_game(self):
+        """Con 'Esc' la partita in corso viene passata al SaveWriter insieme alla sua sorgente."""
+        self.app.game = Mock()
+        self.app.game.finished = Mock(return_value=False)
+        self.app.gui = Mock()
+        self.app.source = source = Mock()
+
+        self.app.play_game(keys=["Escape"])
+
+        self.saves.save.assert_called_once_with(self.app.game, source)
+
+    def test_play_game_finished_discards_the_save(self):
+        """Una partita risolta non va ripresa: il salvataggio viene cancellato."""
+        self.app.game = Mock()
+        self.app.game.finished = Mock(return_value=True)
+        self.app.gui = Mock()
+
+        self.app.play_game(keys=[])
+
+        self.saves.discard.assert_called_once_with()
+        self.saves.save.assert_not_called()
+
+    def test_load_game_resumes_snapshot(self):
+        """Con uno Snapshot, load_game ricrea la partita con restore e ne ricorda la sorgente."""
+        snapshot = app_module.Snapshot(("a.txt", "0" * 40), 3, 3, set(), set(), [])
+        game_obj, source = Mock(seed=None), Mock()
+
+        with patch.object(app_module, "restore", return_value=(game_obj, source)) as mock_restore:
+            with patch.object(app_module, "BoardGameGui", return_value=Mock()):
+                self.app.load_game(snapshot)
+
+        mock_restore.assert_called_once_with(snapshot, debug_checks=self.app.settings.debug_checks)
+        self.assertIs(self.app.game, game_obj)
+        self.assertEqual(self.app.app_phase, app_module.AppPhase.PLAYING)
+
+    def test_load_game_bad_snapshot_returns_to_menu(self):
+        """Se il livello salvato non c'è più, si torna al menu senza partita."""
+        snapshot = app_module.Snapshot(("a.txt", "0" * 40), 3, 3, set(), set(), [])
+
+        with patch.object(app_module, "restore", side_effect=ValueError("gone")):
+            with contextlib.redirect_stdout(io.StringIO()):
+                self.app.load_game(snapshot)
+
+        self.assertEqual(self.app.app_phase, app_module.AppPhase.MENU)
+        self.assertFalse(hasattr(self.app, "gui"))
+
     def test_play_game_sets_game_over_when_finished(self):
         """Se game.finished() è True, passa a GAME_OVER (ma fa comunque tick della GUI per mantenere aggiornata l'ultima immagine)."""
         self.app.game = Mock()
@@ -138,6 +301,67 @@ class AppTest(unittest.TestCase):
         self.assertEqual(self.app.app_phase, app_module.AppPhase.PLAYING)
         self.app.gui.tick.assert_called_once_with()
 
+    # ======== BUSY ========
+    def test_busy_outside_playing(self):
+        """Fuori da PLAYING il loop deve restare a frame rate fisso."""
+        self.app.app_phase = app_module.AppPhase.MENU
+        self.assertTrue(self.app.busy())
+
+    def test_busy_follows_gui_idle_when_playing(self):
+        """In PLAYING busy dipende da gui.idle."""
+        self.app.game = Mock()
+        self.app.gui = Mock()
+        self.app.app_phase = app_module.AppPhase.PLAYING
+
+        self.app.gui.idle = True
+        self.assertFalse(self.app.busy())
+
+        self.app.gui.idle = False
+        self.assertTrue(self.app.busy())
+
+    def test_busy_while_deferred_work_is_pending(self):
+        """
+            Frame pesante, poi "s" (soluzione) in un altro frame pesante, poi un frame leggero:
+            barra e indicatore sono stati rimandati, quindi il loop non deve andare in attesa
+            finché non sono aggiornati.
+        """
+        with patch.dict(os.environ, {"G2D_BACKEND": "headless"}):
+            g2d.init_canvas((100, 100))
+
+        now = [0.0]
+        self.app.governor = FrameGovernor(fps=30, clock=lambda: now[0])
+        self.app.game = app_module.Game(columns=2, rows=2, trees={(0, 0)}, tents={(1, 0)},
+                                        columns_targets=[0, 1], rows_targets=[1, 0])
+        self.app.gui = app_module.BoardGameGui(game=self.app.game,
+                                               actions={"s": app_module.Action.PLACE_SOLUTION},
+                                               allow_deferred=self.app.governor.allow_deferred)
+        self.app.app_phase = app_module.AppPhase.PLAYING
+
+        def frame(cost, keys):
+            self.app.governor.begin_frame()
+            with patch("src.game.board_game_gui.gui_get_released_keys", return_value=keys), \
+                 patch("src.game.board_game_gui.gui_get_mouse_pos", return_value=(-10, -10)):
+                self.app.gui.tick()
+            now[0] += cost
+            self.app.governor.end_frame()
+
+        frame(0.2, [])
+        frame(0.2, ["s"])
+        frame(0.001, [])
+
+        self.assertTrue(self.app.game.finished())
+        # -> l'ultimo frame non ha disegnato niente: solo il lavoro rimandato tiene il loop attivo
+        self.assertTrue(self.app.gui.idle)
+        self.assertTrue(self.app.governor.pending)
+        self.assertTrue(self.app.busy())
+
+        for _ in range(3):
+            frame(0.001, [])
+
+        self.assertFalse(self.app.busy())
+        self.assertEqual(self.app.gui.gui_board.cells[0].text, current_theme().correct)
+        self.assertIn("100.00%", self.app.gui.gui_stats.text)
+
     # ======== MENU ========
     def test_load_menu_delegates_to_menu_manager(self):
         """load_menu deve delegare a MenuManager.tick."""
@@ -188,13 +412,36 @@ class AppTest(unittest.TestCase):
         self.app.menu.set_home.assert_called_once_with()
         self.assertEqual(self.app.app_phase, app_module.AppPhase.MENU)
 
+    def test_tick_is_measured_by_governor(self):
+        """tick deve essere racchiuso tra begin_frame ed end_frame del governor."""
+        self.app.governor = Mock()
+        self.app.load_menu = Mock()
+
+        self.app.app_phase = app_module.AppPhase.MENU
+        self.app.tick()
+
+        self.app.governor.begin_frame.assert_called_once_with()
+        self.app.governor.end_frame.assert_called_once_with()
+
+    def test_tick_services_generator_pool(self):
+        """Ogni tick deve far avanzare il GeneratorPool (raccolta risultati e riempimento code)."""
+        self.app.load_menu = Mock()
+
+        self.app.app_phase = app_module.AppPhase.MENU
+        self.app.tick()
+        self.app.tick()
+
+        self.assertEqual(self.generator.service.call_count, 2)
+
     def test_tick_quit_calls_exit(self):
-        """tick in QUIT deve chiamare exit()."""
+        """tick in QUIT deve fermare il GeneratorPool e chiamare exit()."""
         self.app.app_phase = app_module.AppPhase.QUIT
 
         with patch("builtins.exit") as mock_exit:
             self.app.tick()
 
+        self.generator.close.assert_called_once_with()
+        self.saves.close.assert_called_once_with()
         mock_exit.assert_called_once_with()
 
 if __name__ == "__main__":
@@ -0,0 +1,141 @@
+import itertools
+import pathlib
+import tempfile
+import unittest
+
+from src.game.core.difficulty import MAX_SECONDS, Rating, TIERS, rate, rate_game, rate_level, rate_many
+from src.game.core.file_management import show_levels, write_ratings
+from src.game.core.game import Game
+from src.game.core.level import Level
+
+
+LEVELS = pathlib.Path(__file__).resolve().parents[3] / "src" / "data" / "levels"
+
+
+def count_solutions(columns: int, rows: int, trees: set[tuple[int, int]], columns_targets: list[int],
+                    rows_targets: list[int]) -> int:
+    """Conta le soluzioni a forza bruta: ogni albero sceglie una delle 4 celle vicine per la sua tenda."""
+    options = []
+    for x, y in sorted(trees):
+        options.append([(x + dx, y + dy) for dx, dy in ((1, 0), (-1, 0), (0, 1), (0, -1))
+                        if 0 <= x + dx < columns and 0 <= y + dy < rows and (x + dx, y + dy) not in trees])
+
+    solutions = set()
+    for tents in itertools.product(*options):
+        if len(set(tents)) != len(tents):
+            continue
+        if any(abs(a[0] - b[0]) <= 1 and abs(a[1] - b[1]) <= 1 for a, b in itertools.combinations(tents, 2)):
+            continue
+        if [sum(1 for x, _ in tents if x == c) for c in range(columns)] != columns_targets:
+            continue
+        if [sum(1 for _, y in tents if y == r) for r in range(rows)] != rows_targets:
+            continue
+        solutions.add(frozenset(tents))
+    return len(solutions)
+
+
+class DifficultyTest(unittest.TestCase):
+    # ======== RATE ========
+    def test_lines_only_puzzle_is_easy(self):
+        """Un puzzle risolto dai soli conteggi di righe/colonne deve essere easy, senza ipotesi né ricerca."""
+        rating = rate(3, 1, {(1, 0)}, [1, 0, 0], [1])
+
+        self.assertIsInstance(rating, Rating)
+        self.assertEqual(rating.label, "easy")
+        self.assertTrue(rating.solved)
+        self.assertTrue(rating.unique)
+        self.assertGreater(rating.fires["lines"], 0)
+        self.assertEqual(rating.fires["probe"], 0)
+        self.assertEqual(rating.nodes, 0)
+        self.assertEqual(rating.max_tier, "lines")
+
+    def test_profile_has_every_tier(self):
+        """fires e deductions devono avere una voce per ogni livello di deduzione."""
+        rating = rate(3, 1, {(1, 0)}, [1, 0, 0], [1])
+
+        self.assertEqual(set(rating.fires), set(TIERS))
+        self.assertEqual(set(rating.deductions), set(TIERS))
+        self.assertGreaterEqual(rating.seconds, 0.0)
+
+    def test_uniqueness_matches_brute_force(self):
+        """Su board generate piccole, solved/unique devono coincidere con il conteggio a forza bruta, con e senza soluzione nota."""
+        for size, seed in [(5, seed) for seed in range(12)] + [(6, seed) for seed in range(12)]:
+            game = Game(columns=size, rows=size, trees=(), tents=())
+            game.generate_board(seed)
+            with self.subTest(size=size, seed=seed):
+                solutions = count_solutions(size, size, game.trees, game.columns_targets, game.rows_targets)
+                guided = rate_game(game)
+                blind = rate(size, size, game.trees, game.columns_targets, game.rows_targets)
+                for rating in (guided, blind):
+                    self.assertTrue(rating.solved and rating.decided)
+                    self.assertEqual(rating.unique, solutions == 1)
+
+    def test_big_boards_are_decided(self):
+        """Board generate 20x20 e 30x30 vengono decise entro MAX_SECONDS (una unica, una con una seconda soluzione vicina)."""
+        for size, seed, unique in ((20, 0, True), (30, 4, False)):
+            game = Game(columns=size, rows=size, trees=(), tents=())
+            game.generate_board(seed)
+            with self.subTest(size=size, seed=seed):
+                rating = rate_game(game)
+                self.assertTrue(rating.decided)
+                self.assertTrue(rating.solved)
+                self.assertEqual(rating.unique, unique)
+                self.assertLess(rating.seconds, MAX_SECONDS)
+
+    def test_time_limit_leaves_rating_undecided(self):
+        """Finito il tempo la valutazione resta undecided: né unica né risolta, e senza superare il limite di molto."""
+        game = Game(columns=20, rows=20, trees=(), tents=())
+        game.generate_board(0)
+
+        rating = rate(20, 20, game.trees, game.columns_targets, game.rows_targets, max_seconds=0.0)
+
+        self.assertFalse(rating.decided)
+        self.assertFalse(rating.unique)
+        self.assertLess(rating.seconds, MAX_SECONDS)
+
+    def test_search_respects_max_nodes(self):
+        """La ricerca non deve mai superare max_nodes nodi."""
+        game = Game(columns=10, rows=10, trees=(), tents=())
+        game.generate_board(4)
+
+        rating = rate(10, 10, game.trees, game.columns_targets, game.rows_targets, max_nodes=5)
+
+        self.assertLessEqual(rating.nodes, 5)
+
+    def test_harder_bundled_level_scores_higher(self):
+        """Il livello 8x8 medium deve avere un punteggio più alto dell'8x8 easy."""
+        easy = rate_level(Level.from_file(LEVELS / "tents-2025-11-27-8x8-easy.txt"))
+        medium = rate_level(Level.from_file(LEVELS / "tents-2025-11-27-8x8-medium.txt"))
+
+        self.assertLess(easy.score, medium.score)
+        self.assertTrue(easy.unique and medium.unique)
+
+    def test_rate_many_keeps_order(self):
+        """rate_many deve ritornare una valutazione per livello, nello stesso ordine."""
+        levels = [Level("a-1.txt", 3, 1, [1, 0, 0], [1], trees={(1, 0)}),
+                  Level("b-1.txt", 1, 3, [1], [0, 0, 1], trees={(0, 1)})]
+
+        ratings = rate_many(levels, workers=2)
+
+        self.assertEqual([r.deductions for r in ratings], [rate_level(lv).deductions for lv in levels])
+        self.assertTrue(all(r.unique for r in ratings))
+
+    # ======== RATINGS.JSON ========
+    def test_show_levels_reads_saved_ratings(self):
+        """show_levels deve assegnare ai livelli le valutazioni di ratings.json, ignorando quelle vecchie."""
+        with tempfile.TemporaryDirectory() as tmp:
+            folder = pathlib.Path(tmp)
+            (folder / "tents-1-3x1-easy.txt").write_text("X100\n1.T.\n", encoding="utf-8")
+            level = show_levels(folder)[0]
+            level.rating = level.rating._replace(score=123.0)
+            write_ratings([level], folder)
+
+            self.assertEqual(show_levels(folder)[0].rating.score, 123.0)
+
+            # -> il file cambia: la valutazione salvata non vale più
+            (folder / "tents-1-3x1-easy.txt").write_text("X001\n1.T.\n", encoding="utf-8")
+            self.assertNotEqual(show_levels(folder)[0].rating.score, 123.0)
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,102 @@
+import unittest
+
+from src.game.core.frame_governor import FrameGovernor
+
+
+class FakeClock:
+    def __init__(self):
+        self.now = 0.0
+
+    def __call__(self) -> float:
+        return self.now
+
+
+class FrameGovernorTest(unittest.TestCase):
+    def setUp(self):
+        self.clock = FakeClock()
+        self.gov = FrameGovernor(fps=30, min_fps=15, step=5, patience=2, max_defer=3, clock=self.clock)
+
+    def frame(self, cost: float, interval: float | None = None) -> None:
+        """Simula un frame che costa `cost` secondi e dura `interval` secondi in totale."""
+        self.gov.begin_frame()
+        self.clock.now += cost
+        self.gov.end_frame()
+        self.clock.now += max(0.0, (interval or cost) - cost)
+
+    # ======== FRAME RATE ========
+    def test_overruns_lower_fps_down_to_min(self):
+        """Frame oltre budget devono contare come persi e abbassare il frame rate fino a min_fps."""
+        for _ in range(10):
+            self.frame(0.2)
+
+        self.assertEqual(self.gov.missed_frames, 10)
+        self.assertEqual(self.gov.fps, 15)
+        self.assertEqual(self.gov.frame_rate(), 15)
+
+    def test_fast_frames_raise_fps_back_to_target(self):
+        """Con molto margine il frame rate deve risalire, ma mai oltre quello richiesto."""
+        for _ in range(4):
+            self.frame(0.2)
+        self.assertEqual(self.gov.fps, 20)
+
+        for _ in range(30):
+            self.frame(0.001)
+
+        self.assertEqual(self.gov.fps, 30)
+
+    def test_achieved_fps_is_measured(self):
+        """achieved_fps deve stimare gli FPS reali dall'intervallo tra i frame."""
+        for _ in range(5):
+            self.frame(0.001, interval=0.05)
+
+        self.assertAlmostEqual(self.gov.achieved_fps, 20, places=3)
+
+    def test_idle_wait_is_not_measured(self):
+        """Dopo idle() la pausa prima del frame successivo non abbassa achieved_fps."""
+        for _ in range(5):
+            self.frame(0.001, interval=0.05)
+
+        self.gov.idle()
+        self.clock.now += 0.25
+        for _ in range(2):
+            self.frame(0.001, interval=0.05)
+
+        self.assertAlmostEqual(self.gov.achieved_fps, 20, places=3)
+
+    # ======== DEFERRED ========
+    def test_allow_deferred_on_spare_frames(self):
+        """Dopo un frame leggero il lavoro non urgente è concesso subito."""
+        self.frame(0.001)
+        self.assertTrue(self.gov.allow_deferred("stats"))
+
+    def test_allow_deferred_is_bounded(self):
+        """Nei frame pesanti il lavoro viene rimandato, ma non più di max_defer volte di fila."""
+        self.frame(0.2)
+
+        answers = [self.gov.allow_deferred("stats") for _ in range(4)]
+
+        self.assertEqual(answers, [False, False, False, True])
+
+    def test_pending_until_deferred_work_runs(self):
+        """pending resta True finché il lavoro rimandato non viene concesso."""
+        self.assertFalse(self.gov.pending)
+
+        self.frame(0.2)
+        self.assertFalse(self.gov.allow_deferred("stats"))
+        self.assertTrue(self.gov.pending)
+
+        self.frame(0.001)
+        self.assertTrue(self.gov.allow_deferred("stats"))
+        self.assertFalse(self.gov.pending)
+
+    # ======== PROPERTIES ========
+    def test_fps_must_be_positive_int(self):
+        """fps deve essere un int > 0."""
+        with self.assertRaises(TypeError):
+            self.gov.fps = 1.5  # type: ignore
+        with self.assertRaises(ValueError):
+            self.gov.fps = 0
+
+
+if __name__ == "__main__":
+    unittest.main()
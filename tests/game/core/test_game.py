@@ -1,7 +1,8 @@
+import time
 import unittest
 from unittest.mock import Mock, patch
 
-from src.game.core.game import Game
+from src.game.core.game import Game, GENERATOR_VERSION, GENERATOR_VERSIONS
 from src.game.state import Action, CellState
 
 
@@ -105,6 +106,16 @@ class GameTest(unittest.TestCase):
         self.assertEqual(self.game.tents, before_tents)
         self.assertEqual(self.game.grass, before_grass)
 
+    def test_play_records_journal(self):
+        """Ogni mossa (tranne SKIP) deve finire nel journal, in ordine."""
+        self.game.play(1, 1, None)
+        self.game.play(0, 1, Action.SKIP)
+        self.game.play(0, 0, Action.PLACE_GRASS)
+
+        self.assertEqual(self.game.journal, [(1, 1, None), (0, 0, Action.PLACE_GRASS)])
+        with self.assertRaises(TypeError):
+            self.game.journal = ()  # type: ignore
+
     def test_play_place_grass(self):
         """Action.PLACE_GRASS deve chiamare _auto_grass()."""
         self.game._auto_grass = Mock()
@@ -170,6 +181,100 @@ class GameTest(unittest.TestCase):
         self.assertNotIn("Solution:", s)
         self.assertIn("Tents placed:", s)
 
+    # ======== VERSION / CACHE ========
+    def test_version_increases_on_play_and_setters(self):
+        """version deve crescere a ogni modifica dello stato (play o setter)."""
+        v0 = self.game.version
+        self.game.play(1, 1, None)
+        v1 = self.game.version
+        self.game.grass = {(0, 1)}
+        v2 = self.game.version
+
+        self.assertGreater(v1, v0)
+        self.assertGreater(v2, v1)
+
+    def test_progress_is_cached_until_version_changes(self):
+        """progress non deve essere ricalcolato se version non cambia."""
+        self.game.tents = {(1, 0)}
+        with patch.object(Game, "_progress", return_value=0.25) as mock_progress:
+            self.game.progress()
+            self.game.progress()
+            self.game.status()
+            self.assertEqual(mock_progress.call_count, 1)
+
+            self.game.play(1, 1, None)
+            self.game.progress()
+            self.assertEqual(mock_progress.call_count, 2)
+
+    # ======== VALIDAZIONE / PERCORSO FIDATO ========
+    def test_setters_validate_coordinates(self):
+        """I setter pubblici (confine esterno) devono rifiutare coordinate fuori dalla board o non tuple."""
+        with self.assertRaises(ValueError):
+            self.game.tents = {(5, 0)}
+        with self.assertRaises(TypeError):
+            self.game.grass = [[0, 1]]
+        with self.assertRaises(ValueError):
+            self.game.trees = {(0, 0, 0)}
+
+    def test_store_skips_validation_and_bumps_version_once(self):
+        """_store non rivalida gli elementi, copia gli insiemi e aumenta version una sola volta."""
+        tents = {(1, 0)}
+        v0 = self.game.version
+        with patch.object(Game, "_check_positions") as mock_check:
+            self.game._store(tents=tents, grass={(0, 1)})
+
+        mock_check.assert_not_called()
+        self.assertEqual(self.game.version, v0 + 1)
+        self.assertEqual(self.game.tents, {(1, 0)})
+        self.assertEqual(self.game.grass, {(0, 1)})
+        self.assertIsNot(self.game.tents, tents)
+        self.assertEqual(self.game.trees, self.trees)
+
+    def test_store_validates_in_debug_mode(self):
+        """Con debug_checks attivo _store fa gli stessi controlli dei setter, solo per quel Game."""
+        game = Game(columns=2, rows=2, trees={(0, 0)}, tents={(1, 0)},
+                    columns_targets=[0, 1], rows_targets=[1, 0], debug_checks=True)
+        with self.assertRaises(ValueError):
+            game._store(tents={(5, 0)})
+
+        self.assertFalse(Game.debug_checks)
+        self.assertFalse(self.game.debug_checks)
+
+    def test_generated_board_is_validated_once(self):
+        """La board generata viene validata una volta quando entra nel Game (un controllo per insieme)."""
+        with patch.object(Game, "_check_positions", wraps=self.game._check_positions) as mock_check:
+            self.game.generate_board(seed=1)
+
+        names = [call.args[0] for call in mock_check.call_args_list]
+        self.assertEqual(sorted(names), ["correct_tents", "trees"])
+
+    def test_hint_does_not_revalidate_positions(self):
+        """hint usa il percorso fidato: nessuna validazione per elemento durante le simulazioni."""
+        with patch.object(Game, "_check_positions") as mock_check:
+            self.game.hint()
+        mock_check.assert_not_called()
+
+    def test_hint_bumps_version_and_refreshes_caches(self):
+        """La mossa applicata da hint cambia version dopo l'ultimo ripristino: progress e status non restano vecchi."""
+        game = Game(columns=6, rows=6)
+        game.generate_board(seed=1)
+        game.progress()
+        game.status()
+
+        store, versions = game._store, []
+        def tracked_store(**kwargs):
+            store(**kwargs)
+            versions.append(game.version)
+
+        with patch.object(game, "_store", side_effect=tracked_store):
+            self.assertTrue(game.hint())
+
+        self.assertTrue(versions)
+        self.assertGreater(game.version, versions[-1])
+        self.assertGreater(len(game.tents) + len(game.grass), 0)
+        self.assertEqual(game.progress(), game._progress())
+        self.assertEqual(game.status(), game._status())
+
     # ======== N4 / N8 ========
     def test_n4_neighbors_corner(self):
         """n4 su un angolo deve dare solo 2 vicini."""
@@ -278,6 +383,67 @@ class GameTest(unittest.TestCase):
         self.assertEqual(sum(g.columns_targets), len(g.correct_tents))
         self.assertEqual(sum(g.rows_targets), len(g.correct_tents))
 
+    @staticmethod
+    def _has_perfect_matching(game: Game) -> bool:
+        """Ogni tenda deve avere un albero n4 tutto suo (abbinamento perfetto tende-alberi)."""
+        owner: dict[tuple[int, int], tuple[int, int]] = {}
+
+        def assign(tent, seen) -> bool:
+            for tree in game.n4(*tent):
+                if tree in game.trees and tree not in seen:
+                    seen.add(tree)
+                    if tree not in owner or assign(owner[tree], seen):
+                        owner[tree] = tent
+                        return True
+            return False
+
+        return all(assign(tent, set()) for tent in game.correct_tents)
+
+    def test_generate_board_rectangular_boards(self):
+        """Il generatore lineare deve funzionare anche su board rettangolari e a una sola riga/colonna."""
+        for columns, rows in ((40, 30), (7, 50), (1, 9), (9, 1), (2, 2)):
+            g = Game(columns=columns, rows=rows, trees=(), tents=())
+            g.generate_board(seed=7)
+
+            self.assertEqual(g.generator_version, GENERATOR_VERSION)
+            self.assertTrue(g.trees)
+            self.assertTrue(g.is_valid_board(), (columns, rows))
+            self.assertTrue(self._has_perfect_matching(g), (columns, rows))
+
+    def test_generate_board_density(self):
+        """La densità di coppie deve restare vicina a quella del vecchio generatore (circa 0.2 per cella)."""
+        g = Game(columns=60, rows=60, trees=(), tents=())
+        g.generate_board(seed=3)
+        self.assertGreater(len(g.correct_tents) / 3600, 0.17)
+        self.assertLessEqual(len(g.correct_tents) / 3600, 0.25)
+
+    def test_generate_board_large_board_is_fast(self):
+        """Una board 300x300 deve essere generata in pochi istanti (il vecchio generatore non finiva)."""
+        start = time.perf_counter()
+        g = Game(columns=300, rows=300, trees=(), tents=())
+        g.generate_board(seed=1)
+        self.assertLess(time.perf_counter() - start, 10)
+        self.assertTrue(g.is_valid_board())
+
+    def test_generate_board_is_deterministic_per_version(self):
+        """Stesso seed e stessa versione danno la stessa board; la versione 1 resta disponibile."""
+        boards = {}
+        for version in GENERATOR_VERSIONS:
+            a = Game(columns=8, rows=8, trees=(), tents=())
+            b = Game(columns=8, rows=8, trees=(), tents=())
+            a.generate_board(seed=11, version=version)
+            b.generate_board(seed=11, version=version)
+            self.assertEqual((a.trees, a.correct_tents), (b.trees, b.correct_tents))
+            self.assertEqual(a.generator_version, version)
+            boards[version] = a.trees
+
+        self.assertNotEqual(boards[1], boards[2])
+
+    def test_generate_board_unknown_version(self):
+        """Una versione del generatore sconosciuta deve dare ValueError."""
+        with self.assertRaises(ValueError):
+            Game(columns=5, rows=5, trees=(), tents=()).generate_board(seed=1, version=99)
+
 
 if __name__ == "__main__":
     unittest.main()
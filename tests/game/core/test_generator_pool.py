@@ -0,0 +1,156 @@
+import random
+import unittest
+from concurrent.futures import Future
+
+from src.game.core.game import Game
+from src.game.core.generator_pool import GeneratorPool, generate_pair_lists
+
+
+class FakeExecutor:
+    """Executor finto: tiene i lavori in sospeso finché run() non li esegue."""
+
+    def __init__(self):
+        self.jobs: list[tuple[Future, tuple]] = []
+        self.shutdown_called = False
+
+    def submit(self, fn, *args):
+        future = Future()
+        self.jobs.append((future, (fn, args)))
+        return future
+
+    def run(self, count=None):
+        jobs, self.jobs = self.jobs[:count], self.jobs[count:] if count is not None else []
+        for future, (fn, args) in jobs:
+            future.set_result(fn(*args))
+
+    def shutdown(self, wait=True, cancel_futures=False):
+        self.shutdown_called = True
+
+
+class GeneratorPoolTest(unittest.TestCase):
+    def setUp(self):
+        self.executor = FakeExecutor()
+        self.created = []
+
+        def factory(workers):
+            self.created.append(workers)
+            return self.executor
+
+        self.pool = GeneratorPool(min_side=5, max_side=6, depth=2, workers=3,
+                                  executor_factory=factory, rng=random.Random(1))
+
+    # ======== INIT ========
+    def test_init_is_lazy(self):
+        """Creare il pool non deve avviare processi né generare board."""
+        self.assertEqual(self.created, [])
+        self.assertEqual(self.pool.depths, {5: 0, 6: 0})
+        self.assertEqual(self.pool.in_flight, 0)
+
+    def test_init_rejects_bad_values(self):
+        """min_side/max_side/depth/workers non validi devono dare errore."""
+        with self.assertRaises(ValueError):
+            GeneratorPool(min_side=10, max_side=8)
+        with self.assertRaises(ValueError):
+            GeneratorPool(depth=0)
+        with self.assertRaises(ValueError):
+            GeneratorPool(workers=0)
+        with self.assertRaises(TypeError):
+            GeneratorPool(min_side="8")  # type: ignore
+
+    # ======== SERVICE ========
+    def test_service_fills_each_bucket_up_to_depth(self):
+        """service deve inviare depth lavori per lato, senza duplicarli ai tick successivi."""
+        self.pool.service()
+        self.pool.service()
+
+        self.assertEqual(self.created, [3])
+        self.assertEqual(self.pool.in_flight, 4)
+        self.assertEqual(len(self.executor.jobs), 4)
+
+        self.executor.run()
+        self.pool.service()
+
+        self.assertEqual(self.pool.depths, {5: 2, 6: 2})
+        self.assertEqual(self.pool.in_flight, 0)
+        self.assertEqual(self.pool.generated, 4)
+        self.assertGreater(self.pool.latency, 0)
+
+    def test_failed_jobs_are_counted_and_retried(self):
+        """Un lavoro fallito non deve finire in coda: viene contato e rimesso in lavorazione."""
+        self.pool.service()
+        future, _ = self.executor.jobs.pop(0)
+        future.set_exception(RuntimeError("boom"))
+
+        self.pool.service()
+
+        self.assertEqual(self.pool.failed, 1)
+        self.assertEqual(self.pool.in_flight, 4)
+
+    # ======== TAKE ========
+    def test_take_returns_none_when_nothing_is_ready(self):
+        """Senza board pronte take deve ritornare subito None."""
+        self.pool.service()
+        self.assertIsNone(self.pool.take())
+        self.assertIsNone(self.pool.take(5))
+
+    def test_take_returns_valid_game_and_refills(self):
+        """take deve consegnare un Game valido della dimensione chiesta e rimettere in coda il lavoro."""
+        self.pool.service()
+        self.executor.run()
+
+        game = self.pool.take(6, debug_checks=True)
+
+        self.assertIsInstance(game, Game)
+        self.assertEqual((game.cols(), game.rows()), (6, 6))
+        self.assertTrue(game.debug_checks)
+        self.assertTrue(game.trees)
+        self.assertTrue(game.is_valid_board())
+        self.assertIsNotNone(game.seed)
+        self.assertEqual(self.pool.depths[6], 1)
+        self.assertEqual(self.pool.in_flight, 1)
+
+    def test_take_without_side_picks_a_ready_bucket(self):
+        """Con side None take deve scegliere tra i lati che hanno board pronte."""
+        self.pool.service()
+        self.executor.run(count=1)
+
+        game = self.pool.take()
+
+        self.assertIsNotNone(game)
+        self.assertEqual(game.cols(), 5)
+
+    # ======== CLOSE ========
+    def test_close_shuts_down_executor(self):
+        """close deve fermare l'executor e dimenticare il lavoro in corso."""
+        self.pool.service()
+        self.pool.close()
+
+        self.assertTrue(self.executor.shutdown_called)
+        self.assertEqual(self.pool.in_flight, 0)
+
+    # ======== WORKER ========
+    def test_generate_pair_lists_is_deterministic(self):
+        """Il lavoro del worker deve dipendere solo da lato e seed."""
+        trees_a, tents_a, _ = generate_pair_lists(7, 42)
+        trees_b, tents_b, _ = generate_pair_lists(7, 42)
+
+        self.assertEqual((trees_a, tents_a), (trees_b, tents_b))
+        self.assertEqual(len(trees_a), len(tents_a))
+
+    def test_real_process_pool(self):
+        """Con il ProcessPoolExecutor vero le board devono arrivare in coda senza bloccare service()."""
+        pool = GeneratorPool(min_side=5, max_side=5, depth=1, workers=1)
+        try:
+            pool.service()
+            for future in list(pool._futures):
+                future.result(timeout=30)
+            game = pool.take(5)
+        finally:
+            pool.close()
+
+        self.assertIsInstance(game, Game)
+        self.assertTrue(game.is_valid_board())
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -2,7 +2,8 @@ import unittest
 import pathlib
 import tempfile
 
-from src.game.core.level import Level, _char_to_target
+from src.game.core.game import Game
+from src.game.core.level import Level, _char_to_target, _target_to_char
 
 
 class LevelTest(unittest.TestCase):
@@ -15,6 +16,13 @@ class LevelTest(unittest.TestCase):
         self.assertEqual(_char_to_target("."), 0)
         self.assertEqual(_char_to_target("7"), 7)
 
+    def test_target_to_char_round_trip(self):
+        """_target_to_char deve essere l'inverso di _char_to_target e rifiutare target oltre 9."""
+        for target in range(10):
+            self.assertEqual(_char_to_target(_target_to_char(target)), target)
+        with self.assertRaises(ValueError):
+            _target_to_char(10)
+
     def test_char_to_target_invalid_raises(self):
         """_char_to_target con caratteri strani deve lanciare ValueError."""
         with self.assertRaises(ValueError):
@@ -41,8 +49,8 @@ class LevelTest(unittest.TestCase):
         self.assertEqual(lvl.trees, set())
         self.assertEqual(lvl.correct_tents, set())
 
-    def test_difficulty_parsing(self):
-        """difficulty deve leggere l'ultima parte del nome file dopo '-'."""
+    def test_declared_difficulty_parsing(self):
+        """declared_difficulty deve leggere l'ultima parte del nome file dopo '-'."""
         lvl = Level(
             path=self.path,
             columns=3,
@@ -50,7 +58,30 @@ class LevelTest(unittest.TestCase):
             columns_targets=[0, 0, 0],
             rows_targets=[0, 0]
         )
+        self.assertEqual(lvl.declared_difficulty, "easy")
+
+    def test_difficulty_comes_from_rating(self):
+        """difficulty deve essere l'etichetta del rater, calcolata una volta sola e non dal nome file."""
+        lvl = Level(
+            path=pathlib.Path("tents-2025-11-27-3x1-special.txt"),
+            columns=3,
+            lines=1,
+            columns_targets=[1, 0, 0],
+            rows_targets=[1],
+            trees={(1, 0)}
+        )
+        self.assertFalse(lvl.rated)
+        rating = lvl.rating
+
+        self.assertTrue(lvl.rated)
         self.assertEqual(lvl.difficulty, "easy")
+        self.assertIs(lvl.rating, rating)
+
+    def test_rating_setter_type_check(self):
+        """rating accetta solo un Rating o None."""
+        lvl = Level(path=self.path, columns=3, lines=2, columns_targets=[0, 0, 0], rows_targets=[0, 0])
+        with self.assertRaises(TypeError):
+            lvl.rating = "easy"
 
     def test_str_contains_basic_info(self):
         """__str__ deve contenere nome file, difficulty e dimensioni."""
@@ -106,6 +137,70 @@ class LevelTest(unittest.TestCase):
             with self.assertRaises(ValueError):
                 Level.from_file(p)
 
+    def test_from_bytes_accepts_crlf_lowercase_trees_and_bom(self):
+        """from_bytes deve accettare righe CRLF, spazi, 't' minuscola e il BOM UTF-8."""
+        lvl = Level.from_bytes(b"\xef\xbb\xbf.1.0\r\n 1^t. \r\n\r\n0...\r\n", self.path)
+
+        self.assertEqual((lvl.columns, lvl.lines), (3, 2))
+        self.assertEqual(lvl.columns_targets, [1, 0, 0])
+        self.assertEqual(lvl.trees, {(1, 0)})
+        self.assertEqual(lvl.correct_tents, {(0, 0)})
+
+    def test_from_bytes_reports_bad_cell_position(self):
+        """L'errore per una cella non valida deve indicarne le coordinate."""
+        with self.assertRaisesRegex(ValueError, r"'Z' at \(1, 1\)"):
+            Level.from_bytes(b".00\n0..\n0.Z\n", self.path)
+
+    def test_extended_format_with_multi_digit_targets(self):
+        """Il formato esteso (#tents 2) deve leggere target da più cifre, separati da spazi o virgole."""
+        lvl = Level.from_text("#tents 2\n12, 0 3\n10 T^.\n0 ...\n", self.path)
+
+        self.assertEqual(lvl.columns_targets, [12, 0, 3])
+        self.assertEqual(lvl.rows_targets, [10, 0])
+        self.assertEqual(lvl.trees, {(0, 0)})
+        self.assertEqual(lvl.correct_tents, {(1, 0)})
+
+    def test_extended_format_errors(self):
+        """Versione sconosciuta, target non numerici e righe della lunghezza sbagliata devono lanciare ValueError."""
+        for text in ("#tents 9\n1\n1 ^\n", "#tents 2\n1 x\n1 ^.\n", "#tents 2\n1 1\n1 ^\n"):
+            with self.subTest(text=text), self.assertRaises(ValueError):
+                Level.from_text(text, self.path)
+
+    # ======== WRITING ========
+    def test_to_text_round_trip(self):
+        """from_text(to_text()) deve restituire lo stesso livello."""
+        lvl = Level(self.path, 3, 2, [1, 0, 1], [1, 1], trees={(1, 0), (1, 1)}, correct_tents={(0, 0), (2, 1)})
+
+        loaded = Level.from_text(lvl.to_text(), self.path)
+
+        self.assertEqual(loaded, lvl)
+        self.assertEqual(loaded.correct_tents, lvl.correct_tents)
+
+    def test_from_game_and_save(self):
+        """from_game deve copiare board e target di un Game; save deve scrivere un file leggibile da from_file."""
+        game = Game(columns=6, rows=5, trees=(), tents=())
+        game.generate_board(3)
+
+        with tempfile.TemporaryDirectory() as tmp:
+            path = Level.from_game(game, pathlib.Path(tmp) / "tents-x-6x5-easy.txt").save()
+            loaded = Level.from_file(path)
+
+        self.assertEqual((loaded.columns, loaded.lines), (6, 5))
+        self.assertEqual(loaded.trees, game.trees)
+        self.assertEqual(loaded.correct_tents, game.correct_tents)
+        self.assertEqual(loaded.columns_targets, game.columns_targets)
+        self.assertEqual(loaded.rows_targets, game.rows_targets)
+
+    def test_to_text_uses_extended_format_for_big_targets(self):
+        """Con un target oltre 9 to_text deve passare al formato esteso, e rileggerlo uguale."""
+        lvl = Level(self.path, 2, 1, [10, 0], [10], trees={(1, 0)})
+
+        text = lvl.to_text()
+
+        self.assertTrue(text.startswith("#tents 2\n"))
+        self.assertEqual(Level.from_text(text, self.path), lvl)
+        with self.assertRaises(ValueError):
+            lvl.to_text(version=1)
 
 if __name__ == "__main__":
     unittest.main()
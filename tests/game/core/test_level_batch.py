@@ -0,0 +1,119 @@
+import contextlib
+import io
+import json
+import pathlib
+import tempfile
+import unittest
+
+from src.game.core.file_management import read_pack, show_levels, write_pack
+from src.game.core.game import Game
+from src.game.core.level import Level
+from src.game.core.level_batch import derive_seed, generate_levels, level_name, main
+from src.game.core.puzzle_id import PuzzleId
+
+
+class LevelBatchTest(unittest.TestCase):
+    def setUp(self):
+        self.tmp = tempfile.TemporaryDirectory()
+        self.folder = pathlib.Path(self.tmp.name)
+
+    def tearDown(self):
+        self.tmp.cleanup()
+
+    # ======== SEED ========
+    def test_derive_seed_is_reproducible_and_spread(self):
+        """derive_seed deve dare sempre lo stesso seed per (root, index) e seed diversi per job diversi."""
+        self.assertEqual(derive_seed(7, 3), derive_seed(7, 3))
+        seeds = {derive_seed(7, i) for i in range(1000)}
+        self.assertEqual(len(seeds), 1000)
+        self.assertNotEqual(derive_seed(7, 0), derive_seed(8, 0))
+
+    # ======== GENERATE ========
+    def test_generate_levels_count_and_filters(self):
+        """generate_levels deve produrre count livelli unici per dimensione, tutti nella banda richiesta."""
+        levels, manifest = generate_levels([(6, 6), (8, 5)], count=3, bands=["easy", "medium", "hard"],
+                                           root_seed=1, folder=self.folder)
+
+        self.assertEqual(len(levels), 6)
+        self.assertEqual(sorted({(lv.columns, lv.lines) for lv in levels}), [(6, 6), (8, 5)])
+        for level in levels:
+            self.assertTrue(level.rating.unique)
+            self.assertIn(level.difficulty, ("easy", "medium", "hard"))
+            self.assertEqual(level.declared_difficulty, level.difficulty)
+        self.assertEqual([entry["file"] for entry in manifest["levels"]], [lv.path.name for lv in levels])
+        self.assertEqual(manifest["root_seed"], 1)
+
+    def test_generated_level_matches_its_puzzle_id(self):
+        """Ogni livello generato deve essere la board del suo puzzle id (seed salvato nel manifest)."""
+        levels, manifest = generate_levels([(7, 7)], count=2, root_seed=5, unique=False, folder=self.folder)
+
+        for level, entry in zip(levels, manifest["levels"]):
+            game = PuzzleId.parse(entry["puzzle_id"]).generate()
+            self.assertEqual(level.trees, game.trees)
+            self.assertEqual(level.correct_tents, game.correct_tents)
+            self.assertEqual(level.columns_targets, game.columns_targets)
+            self.assertEqual(level.rows_targets, game.rows_targets)
+
+    def test_generate_levels_is_deterministic(self):
+        """Con lo stesso seed radice generate_levels deve produrre gli stessi livelli."""
+        first, _ = generate_levels([(6, 6)], count=3, root_seed=9, folder=self.folder)
+        second, _ = generate_levels([(6, 6)], count=3, root_seed=9, folder=self.folder)
+
+        self.assertEqual([lv.path.name for lv in first], [lv.path.name for lv in second])
+
+    def test_generate_levels_stops_at_max_attempts(self):
+        """Con una banda impossibile da riempire deve fermarsi dopo max_attempts board."""
+        levels, manifest = generate_levels([(5, 5)], count=3, bands=["expert"], root_seed=1,
+                                           max_attempts=6, folder=self.folder)
+
+        self.assertLessEqual(manifest["attempts"], 6)
+        self.assertLessEqual(len(levels), 3)
+
+    def test_unknown_band_raises(self):
+        """Una banda che il rater non conosce deve lanciare ValueError."""
+        with self.assertRaises(ValueError):
+            generate_levels([(5, 5)], count=1, bands=["impossible"])
+
+    def test_level_name_keeps_declared_difficulty_last(self):
+        """Il nome file deve finire con la difficoltà, come i livelli di data/levels."""
+        name = level_name(PuzzleId(2, 12, 10, 1234), "hard")
+        self.assertTrue(name.startswith("tents-v2_"))
+        self.assertTrue(name.endswith("-12x10-hard.txt"))
+
+    # ======== FILES ========
+    def test_pack_round_trip(self):
+        """write_pack e read_pack devono restituire gli stessi livelli, con il nome di ognuno."""
+        levels, _ = generate_levels([(6, 6)], count=2, root_seed=3, unique=False, folder=self.folder)
+
+        loaded = read_pack(write_pack(levels, self.folder / "test.pack"))
+
+        self.assertEqual([lv.path.name for lv in loaded], [lv.path.name for lv in levels])
+        self.assertEqual([lv.trees for lv in loaded], [lv.trees for lv in levels])
+        self.assertEqual([lv.rows_targets for lv in loaded], [lv.rows_targets for lv in levels])
+
+    def test_main_writes_levels_manifest_and_ratings(self):
+        """main deve scrivere un file per livello leggibile da show_levels, il manifest e ratings.json."""
+        with contextlib.redirect_stdout(io.StringIO()):
+            main(["--size", "6", "--count", "2", "--seed", "4", "--workers", "1", "--out", str(self.folder)])
+
+        manifest = json.loads((self.folder / "manifest.json").read_text(encoding="utf-8"))
+        loaded = show_levels(self.folder)
+        self.assertEqual(sorted(lv.path.name for lv in loaded), sorted(e["file"] for e in manifest["levels"]))
+        self.assertTrue((self.folder / "ratings.json").exists())
+        for level in loaded:
+            self.assertEqual(level.rating.score, next(e["score"] for e in manifest["levels"]
+                                                      if e["file"] == level.path.name))
+
+    def test_main_pack_mode(self):
+        """Con --pack deve scrivere un solo file pack e il suo manifest."""
+        with contextlib.redirect_stdout(io.StringIO()):
+            main(["--size", "5x4", "--count", "2", "--seed", "4", "--workers", "1", "--out", str(self.folder),
+                  "--pack", "small.pack", "--allow-ambiguous"])
+
+        self.assertEqual(len(read_pack(self.folder / "small.pack")), 2)
+        self.assertTrue((self.folder / "small.manifest.json").exists())
+        self.assertEqual(list(self.folder.glob("*.txt")), [])
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,134 @@
+import contextlib
+import io
+import json
+import pathlib
+import tempfile
+import unittest
+
+from src.game.core.game import Game
+from src.game.core.level import Level
+from src.game.core.level_validator import check_rules, main, validate_file, validate_level, validate_paths
+
+
+LEVELS = pathlib.Path(__file__).resolve().parents[3] / "src" / "data" / "levels"
+
+
+class LevelValidatorTest(unittest.TestCase):
+    def setUp(self):
+        self.tmp = tempfile.TemporaryDirectory()
+        self.folder = pathlib.Path(self.tmp.name)
+
+    def tearDown(self):
+        self.tmp.cleanup()
+
+    def write(self, name: str, text: str) -> pathlib.Path:
+        path = self.folder / name
+        path.write_text(text, encoding="utf-8")
+        return path
+
+    # ======== REGOLE ========
+    def test_valid_solution_has_no_errors(self):
+        """Una soluzione corretta non deve dare errori."""
+        level = Level("a.txt", 3, 1, [1, 0, 0], [1], trees={(1, 0)}, correct_tents={(0, 0)})
+        self.assertEqual(check_rules(level), [])
+
+    def test_targets_must_match_solution(self):
+        """Target che non corrispondono alle tende della soluzione devono essere segnalati."""
+        level = Level("a.txt", 3, 1, [0, 0, 1], [1], trees={(1, 0)}, correct_tents={(0, 0)})
+        errors = check_rules(level)
+        self.assertIn("column 0: target 0, solution has 1 tents", errors)
+        self.assertIn("column 2: target 1, solution has 0 tents", errors)
+
+    def test_touching_tents_are_reported(self):
+        """Due tende adiacenti in N8 devono essere segnalate."""
+        level = Level("a.txt", 2, 2, [1, 1], [1, 1], trees={(0, 0), (1, 1)}, correct_tents={(1, 0), (0, 1)})
+        self.assertTrue(any("touch (N8)" in error for error in check_rules(level)))
+
+    def test_tree_without_its_own_tent_is_reported(self):
+        """Ogni albero deve avere una tenda sua in N4 (due alberi non possono condividerla)."""
+        level = Level("a.txt", 3, 2, [0, 1, 0], [1, 0], trees={(0, 0), (2, 0), (1, 1)}, correct_tents={(1, 0)})
+        errors = check_rules(level)
+        self.assertIn("3 trees but 1 tents", errors)
+        self.assertTrue(any("has no tent of its own" in error for error in errors))
+
+    def test_missing_solution_is_reported(self):
+        """Un livello senza tende '^' non ha soluzione da controllare."""
+        level = Level("a.txt", 3, 1, [1, 0, 0], [1], trees={(1, 0)})
+        self.assertEqual(check_rules(level), ["no solution in the file (no '^' cells)"])
+
+    # ======== FILE ========
+    def test_bundled_levels_are_valid(self):
+        """Tutti i livelli di data/levels devono rispettare sintassi e regole (il rater si prova sull'8x8)."""
+        report = validate_paths([LEVELS], workers=1, solve=False)
+        self.assertTrue(report["summary"]["ok"], report)
+
+        small = validate_file(LEVELS / "tents-2025-11-27-8x8-medium.txt")
+        self.assertTrue(small["ok"])
+        self.assertEqual(small["levels"][0]["difficulty"], "hard")
+        self.assertEqual(set(small["levels"][0]["timings"]), {"parse", "rules", "solve"})
+
+    def test_syntax_error_is_reported(self):
+        """Un file con una riga della lunghezza sbagliata deve fallire con un errore di sintassi."""
+        report = validate_file(self.write("bad.txt", "X10\n1T^.\n"))
+
+        self.assertFalse(report["ok"])
+        self.assertTrue(report["levels"][0]["errors"][0].startswith("syntax:"))
+
+    def test_ambiguous_level_is_reported(self):
+        """Un livello corretto ma con più soluzioni deve fallire."""
+        report = validate_file(self.write("two.txt", ".2020\n2^T^.\n0..T.\n1^T..\n1.T^.\n"))
+
+        self.assertFalse(report["ok"])
+        self.assertEqual(report["levels"][0]["errors"], ["more than one solution"])
+
+    def test_valid_20x20_level_is_not_rejected(self):
+        """Un 20x20 generato con soluzione unica è valido; se il rater non fa in tempo resta undecided, senza errori."""
+        game = Game(columns=20, rows=20, trees=(), tents=())
+        game.generate_board(0)
+        level = Level.from_game(game, self.folder / "big-20x20-hard.txt")
+
+        entry = validate_level(level)
+        self.assertTrue(entry["ok"])
+        self.assertFalse(entry["undecided"])
+        self.assertEqual(entry["errors"], [])
+
+        entry = validate_level(level, max_seconds=0.0)
+        self.assertTrue(entry["ok"])
+        self.assertTrue(entry["undecided"])
+        self.assertEqual(entry["errors"], [])
+
+    def test_wrong_targets_fail_the_file(self):
+        """Un file con target che non corrispondono alla soluzione deve fallire."""
+        report = validate_file(self.write("bad.txt", ".101\n1^T.\n"))
+
+        self.assertFalse(report["ok"])
+        self.assertIn("column 2: target 1, solution has 0 tents", report["levels"][0]["errors"])
+
+    def test_pack_levels_are_validated_one_by_one(self):
+        """In un pack ogni livello ha la sua voce nel report."""
+        pack = self.write("lib.pack", "@ good.txt\n.100\n1^T.\n@ bad.txt\n.001\n1^T.\n")
+
+        report = validate_file(pack)
+
+        self.assertEqual([entry["level"] for entry in report["levels"]], ["good.txt", "bad.txt"])
+        self.assertEqual([entry["ok"] for entry in report["levels"]], [True, False])
+        self.assertFalse(report["ok"])
+
+    def test_main_writes_report_and_fails(self):
+        """main deve scrivere il report JSON e uscire con codice 1 se qualcosa non è valido."""
+        self.write("good.txt", ".100\n1^T.\n")
+        self.write("bad.txt", ".001\n1^T.\n")
+        report_path = self.folder / "report.json"
+
+        with contextlib.redirect_stdout(io.StringIO()), self.assertRaises(SystemExit) as exit_code:
+            main([str(self.folder), "--report", str(report_path), "--workers", "2"])
+
+        self.assertEqual(exit_code.exception.code, 1)
+        report = json.loads(report_path.read_text(encoding="utf-8"))
+        self.assertEqual(report["summary"]["levels"], 2)
+        self.assertEqual(report["summary"]["failed_levels"], 1)
+        self.assertIn("seconds", report["files"][0])
+
+
+if __name__ == "__main__":
+    unittest.main()
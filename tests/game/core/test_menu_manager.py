@@ -1,10 +1,16 @@
 import unittest
 from unittest.mock import Mock, patch
 
+from src.game.core.difficulty import rate_level
+from src.game.core.level import Level
 from src.game.core.menu_manager import MenuManager
 from src.game.state import AppPhase, MenuPhase
 
 
+def make_level(name: str) -> Level:
+    return Level(name, 3, 1, [1, 0, 0], [1], trees={(1, 0)})
+
+
 class MenuManagerTest(unittest.TestCase):
     def setUp(self):
         self.app = Mock()
@@ -51,18 +57,92 @@ class MenuManagerTest(unittest.TestCase):
 
         self.mm.open_level_menu.assert_not_called()
 
-    def test_open_level_menu_sets_menu_open_true_then_false(self):
-        """open_level_menu deve settare _menu_open True durante il mainloop e poi rimetterlo False."""
+    def test_open_level_menu_does_not_block(self):
+        """open_level_menu deve creare la finestra e ritornare subito, senza mainloop."""
         with patch("src.game.core.menu_manager.MenuWindow") as MW:
-            fake_win = Mock()
+            fake_win = Mock(closed=False)
             MW.return_value = fake_win
 
             self.mm._menu_open = False
             self.mm.open_level_menu()
 
             MW.assert_called_once_with(app=self.app, menu_manager=self.mm)
-            fake_win.mainloop.assert_called_once_with()
-            self.assertFalse(self.mm._menu_open)
+            fake_win.mainloop.assert_not_called()
+            self.assertTrue(self.mm._menu_open)
+            self.assertIs(self.mm._window, fake_win)
+
+    def test_tick_pumps_open_window_every_frame(self):
+        """Con il menu aperto, ogni tick deve elaborare gli eventi della finestra con update()."""
+        with patch("src.game.core.menu_manager.MenuWindow") as MW:
+            fake_win = Mock(closed=False)
+            MW.return_value = fake_win
+
+            for _ in range(3):
+                self.mm.tick(keys=[], cursor_pos=(0.0, 0.0))
+
+            MW.assert_called_once()
+            self.assertEqual(fake_win.update.call_count, 3)
+            self.assertTrue(self.mm._menu_open)
+
+    def test_pump_releases_window_once_closed(self):
+        """Quando la finestra si chiude durante update(), il menu deve tornare chiuso."""
+        fake_win = Mock(closed=False)
+
+        def choose():
+            fake_win.closed = True
+        fake_win.update.side_effect = choose
+
+        self.mm._window = fake_win
+        self.mm._menu_open = True
+        self.mm.pump()
+
+        self.assertIsNone(self.mm._window)
+        self.assertFalse(self.mm._menu_open)
+
+        # nessuna finestra: pump non fa nulla
+        self.mm.pump()
+        fake_win.update.assert_called_once_with()
+
+    def test_pump_treats_tcl_error_as_closed(self):
+        """Se la finestra è già stata distrutta (TclError), pump deve considerarla chiusa."""
+        from tkinter import TclError
+        fake_win = Mock(closed=False)
+        fake_win.update.side_effect = TclError("destroyed")
+
+        self.mm._window = fake_win
+        self.mm._menu_open = True
+        self.mm.pump()
+
+        self.assertIsNone(self.mm._window)
+        self.assertFalse(self.mm._menu_open)
+
+    # ======== LEVELS ========
+    def test_ordered_levels_uses_declared_difficulty_until_rated(self):
+        """Finché manca una valutazione l'ordine è quello dichiarato nel nome file; poi quello del punteggio."""
+        hard, easy, special = make_level("a-3x1-hard.txt"), make_level("b-3x1-easy.txt"), make_level("c-3x1-special.txt")
+        self.mm.levels = [special, hard, easy]
+
+        with patch("src.game.core.level.rate_level") as rate:
+            self.assertEqual(self.mm.ordered_levels(), [easy, hard, special])
+        rate.assert_not_called()
+
+        for level, score in ((hard, 1.0), (easy, 3.0), (special, 2.0)):
+            level.rating = rate_level(level)._replace(score=score)
+        self.assertEqual(self.mm.ordered_levels(), [hard, special, easy])
+
+    def test_rate_in_background_rates_and_saves(self):
+        """I livelli senza valutazione vengono valutati nel thread e salvati in ratings.json; se non manca niente, nessun thread."""
+        levels = [make_level("a-3x1-easy.txt"), make_level("b-3x1-easy.txt")]
+        levels[0].rating = rate_level(levels[0])
+        self.mm.levels = levels
+
+        with patch("src.game.core.menu_manager.write_ratings") as write:
+            thread = self.mm.rate_in_background()
+            thread.join(5)
+
+        self.assertTrue(levels[1].rated)
+        write.assert_called_once_with([levels[1]], levels[1].path.parent)
+        self.assertIsNone(self.mm.rate_in_background())
 
     # ======== PROPERTIES ========
     def test_phase_type_error(self):
@@ -2,6 +2,7 @@ import unittest
 from unittest.mock import Mock
 
 from src.game.core.menu_window import MenuWindow
+from src.game.core.puzzle_id import PuzzleId
 
 
 class MenuWindowTest(unittest.TestCase):
@@ -39,6 +40,47 @@ class MenuWindowTest(unittest.TestCase):
         self.mock_menu_manager.quit.assert_called_once_with()
         self.menu_window._close.assert_called_once_with()
 
+    def test_on_puzzle_id_starts_that_puzzle(self):
+        """_on_puzzle_id deve leggere l'id dal campo e avviare quella board."""
+        self.menu_window._on_level_selected = Mock()
+        self.menu_window.puzzle_id_var = Mock(get=Mock(return_value="1-12x12-3kz8q1"))
+
+        self.menu_window._on_puzzle_id()
+
+        self.menu_window._on_level_selected.assert_called_once_with(PuzzleId.parse("1-12x12-3KZ8Q1"))
+
+    def test_on_resume_starts_saved_game(self):
+        """_on_resume deve leggere lo snapshot dal SaveWriter dell'app e avviarlo."""
+        snapshot = object()
+        self.menu_window._on_level_selected = Mock()
+        self.menu_window.app = Mock(saves=Mock(load=Mock(return_value=snapshot)))
+
+        self.menu_window._on_resume()
+
+        self.menu_window._on_level_selected.assert_called_once_with(snapshot)
+
+    def test_on_resume_reports_damaged_save(self):
+        """Con un salvataggio rovinato _on_resume deve mostrare un errore senza chiudere il menu."""
+        self.menu_window._on_level_selected = Mock()
+        self.menu_window.app = Mock(saves=Mock(load=Mock(side_effect=ValueError("bad"))))
+        self.menu_window.puzzle_id_error = Mock()
+
+        self.menu_window._on_resume()
+
+        self.menu_window._on_level_selected.assert_not_called()
+        self.menu_window.puzzle_id_error.config.assert_called_once()
+
+    def test_on_puzzle_id_reports_invalid_ids(self):
+        """Con un id non valido _on_puzzle_id deve mostrare un errore senza chiudere il menu."""
+        self.menu_window._on_level_selected = Mock()
+        self.menu_window.puzzle_id_var = Mock(get=Mock(return_value="not an id"))
+        self.menu_window.puzzle_id_error = Mock()
+
+        self.menu_window._on_puzzle_id()
+
+        self.menu_window._on_level_selected.assert_not_called()
+        self.menu_window.puzzle_id_error.config.assert_called_once()
+
     # ======== HELPERS ========
     def test_close_calls_quit_and_destroy(self):
         """_close deve chiamare grab_release, quit e destroy."""
@@ -52,6 +94,7 @@ class MenuWindowTest(unittest.TestCase):
         win.grab_release.assert_called_once_with()
         win.quit.assert_called_once_with()
         win.destroy.assert_called_once_with()
+        self.assertTrue(win.closed)
 
     def test_close_ignores_grab_release_errors(self):
         """Se grab_release fallisce, _close deve comunque fare quit e destroy."""
@@ -0,0 +1,113 @@
+import contextlib
+import io
+import pathlib
+import tempfile
+import unittest
+
+from src.game.core.file_management import read_pack, write_pack
+from src.game.core.game import Game
+from src.game.core.level import Level
+from src.game.core.puzzle_hash import (canonical_hash, canonical_key, find_duplicates, level_hash,
+                                       load_library, main, remove_duplicates)
+
+
+def rotate(level: Level, path: str) -> Level:
+    """Il livello ruotato di 90 gradi (le colonne diventano righe)."""
+    rows = level.lines
+    return Level(path, level.lines, level.columns, list(reversed(level.rows_targets)), list(level.columns_targets),
+                 trees={(rows - 1 - y, x) for x, y in level.trees},
+                 correct_tents={(rows - 1 - y, x) for x, y in level.correct_tents})
+
+
+def mirror(level: Level, path: str) -> Level:
+    """Il livello specchiato da sinistra a destra."""
+    columns = level.columns
+    return Level(path, level.columns, level.lines, list(reversed(level.columns_targets)), list(level.rows_targets),
+                 trees={(columns - 1 - x, y) for x, y in level.trees},
+                 correct_tents={(columns - 1 - x, y) for x, y in level.correct_tents})
+
+
+class PuzzleHashTest(unittest.TestCase):
+    def setUp(self):
+        game = Game(columns=7, rows=5, trees=(), tents=())
+        game.generate_board(11)
+        self.level = Level.from_game(game, "tents-a-7x5-easy.txt")
+
+        other = Game(columns=7, rows=5, trees=(), tents=())
+        other.generate_board(12)
+        self.other = Level.from_game(other, "tents-b-7x5-easy.txt")
+
+        self.tmp = tempfile.TemporaryDirectory()
+        self.folder = pathlib.Path(self.tmp.name)
+
+    def tearDown(self):
+        self.tmp.cleanup()
+
+    # ======== HASH ========
+    def test_hash_is_invariant_under_all_symmetries(self):
+        """Le 8 rotazioni/riflessioni di un livello devono avere la stessa impronta."""
+        variants = [self.level]
+        for _ in range(3):
+            variants.append(rotate(variants[-1], "r.txt"))
+        variants += [mirror(lv, "m.txt") for lv in variants]
+
+        self.assertEqual({level_hash(lv) for lv in variants}, {level_hash(self.level)})
+        self.assertEqual(len({(lv.columns, lv.lines, frozenset(lv.trees)) for lv in variants}), 8)
+
+    def test_different_puzzles_have_different_hashes(self):
+        """Puzzle diversi devono avere impronte diverse."""
+        self.assertNotEqual(level_hash(self.level), level_hash(self.other))
+
+    def test_targets_are_part_of_the_key(self):
+        """Stessi alberi ma target diversi: non è lo stesso puzzle."""
+        targets = list(self.level.rows_targets)
+        targets[0] += 1
+        self.assertNotEqual(
+            canonical_hash(7, 5, self.level.trees, self.level.columns_targets, self.level.rows_targets),
+            canonical_hash(7, 5, self.level.trees, self.level.columns_targets, targets)
+        )
+
+    def test_large_targets_are_encoded(self):
+        """Target oltre 255 (board enormi) devono finire nella chiave senza errori."""
+        key = canonical_key(2, 1, set(), [300, 0], [300])
+        self.assertNotEqual(key, canonical_key(2, 1, set(), [301, 0], [300]))
+
+    def test_level_equality_ignores_path(self):
+        """Lo stesso puzzle con due nomi file diversi deve essere uguale (e avere lo stesso hash)."""
+        copy = Level.from_text(self.level.to_text(), "altro-nome.txt")
+
+        self.assertEqual(copy, self.level)
+        self.assertEqual(hash(copy), hash(self.level))
+
+    # ======== DEDUPE ========
+    def test_find_and_remove_duplicates_across_files_and_packs(self):
+        """I doppioni (anche ruotati, anche dentro un pack) devono essere trovati e tolti tenendo il primo."""
+        self.level.save(self.folder / "a.txt")
+        self.other.save(self.folder / "b.txt")
+        rotate(self.level, "c.txt").save(self.folder / "c.txt")
+        write_pack([mirror(self.other, "p1.txt"), Level.from_text(self.level.to_text(), "p2.txt")],
+                   self.folder / "lib.pack")
+
+        groups = find_duplicates(load_library([self.folder]))
+        self.assertEqual(sorted(len(group) for group in groups), [2, 3])
+
+        self.assertEqual(remove_duplicates(groups), 3)
+        self.assertEqual(sorted(p.name for p in self.folder.glob("*.txt")), ["a.txt", "b.txt"])
+        self.assertEqual(read_pack(self.folder / "lib.pack"), [])
+        self.assertEqual(find_duplicates(load_library([self.folder])), [])
+
+    def test_main_reports_duplicates(self):
+        """main deve stampare il numero di doppioni senza toccare i file (senza --delete)."""
+        self.level.save(self.folder / "a.txt")
+        mirror(self.level, "b.txt").save(self.folder / "b.txt")
+
+        out = io.StringIO()
+        with contextlib.redirect_stdout(out):
+            main([str(self.folder)])
+
+        self.assertIn("2 levels, 1 duplicates in 1 groups", out.getvalue())
+        self.assertTrue((self.folder / "b.txt").exists())
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,71 @@
+import random
+import unittest
+
+from src.game.core.game import Game, GENERATOR_VERSION
+from src.game.core.puzzle_id import PuzzleId
+
+
+class PuzzleIdTest(unittest.TestCase):
+    # ======== FORMATO ========
+    def test_str_and_parse_roundtrip(self):
+        """str e parse devono essere l'uno l'inverso dell'altro."""
+        for puzzle_id in (PuzzleId(1, 12, 12, 0), PuzzleId(1, 8, 20, 123456789), PuzzleId(1, 20, 20, 2 ** 32 - 1)):
+            self.assertEqual(PuzzleId.parse(str(puzzle_id)), puzzle_id)
+
+    def test_str_is_short(self):
+        """L'id di una board 20x20 con seed a 32 bit sta in pochi caratteri."""
+        self.assertEqual(str(PuzzleId(1, 20, 20, 2 ** 32 - 1)), "1-20x20-3ZZZZZZ")
+
+    def test_parse_is_lenient_on_case_and_lookalikes(self):
+        """parse deve accettare minuscole, spazi ai lati e O/I/L al posto di 0/1."""
+        self.assertEqual(PuzzleId.parse("  1-12x12-1o  "), PuzzleId.parse("1-12X12-10"))
+        self.assertEqual(PuzzleId.parse("1-8x8-il"), PuzzleId(1, 8, 8, 33))
+
+    def test_parse_rejects_invalid_ids(self):
+        """Id malformati devono dare ValueError."""
+        for text in ("", "1-12x12", "1-12-ABC", "x-12x12-ABC", "1-0x12-ABC", "1-12x12-", "1-12x12-U", "1-8x8-4000000"):
+            with self.assertRaises(ValueError, msg=text):
+                PuzzleId.parse(text)
+
+    # ======== GENERAZIONE ========
+    def test_generate_is_deterministic(self):
+        """Lo stesso id deve rigenerare sempre la stessa board."""
+        puzzle_id = PuzzleId(GENERATOR_VERSION, 10, 8, 2024)
+
+        a = puzzle_id.generate()
+        b = PuzzleId.parse(str(puzzle_id)).generate()
+
+        self.assertEqual((a.cols(), a.rows()), (10, 8))
+        self.assertEqual(a.trees, b.trees)
+        self.assertEqual(a.correct_tents, b.correct_tents)
+        self.assertTrue(a.is_valid_board())
+
+    def test_old_version_ids_still_generate(self):
+        """Gli id della versione 1 del generatore devono continuare a dare la loro board."""
+        game = PuzzleId.parse("1-8x8-ABC").generate()
+
+        self.assertEqual(game.generator_version, 1)
+        self.assertEqual(str(PuzzleId.of(game)), "1-8x8-ABC")
+        self.assertEqual(game.trees, PuzzleId(1, 8, 8, 10 * 1024 + 11 * 32 + 12).generate().trees)
+
+    def test_generate_rejects_other_versions(self):
+        """Un id di un'altra versione del generatore non può essere rigenerato."""
+        with self.assertRaises(ValueError):
+            PuzzleId(GENERATOR_VERSION + 1, 8, 8, 1).generate()
+
+    def test_random_and_of(self):
+        """random crea id della versione corrente; of ricava l'id da un Game generato con seed."""
+        puzzle_id = PuzzleId.random(9, 9, random.Random(5))
+        game = puzzle_id.generate(debug_checks=True)
+
+        self.assertEqual(puzzle_id.version, GENERATOR_VERSION)
+        self.assertEqual(PuzzleId.of(game), puzzle_id)
+        self.assertTrue(game.debug_checks)
+
+    def test_of_unseeded_game_is_none(self):
+        """Un Game senza seed noto non ha id."""
+        self.assertIsNone(PuzzleId.of(Game(columns=6, rows=6)))
+
+
+if __name__ == "__main__":
+    unittest.main()
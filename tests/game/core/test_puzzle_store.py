@@ -0,0 +1,184 @@
+import pathlib
+import tempfile
+import unittest
+
+from src.game.core.game import Game, GENERATOR_VERSION
+from src.game.core.generator_pool import generate_pair_lists
+from src.game.core.puzzle_store import PuzzleStore, decode, encode, fill, HEADER, MAGIC, UNRATED, USED
+
+
+class PuzzleStoreTest(unittest.TestCase):
+    def setUp(self):
+        self.tmp = tempfile.TemporaryDirectory()
+        self.folder = pathlib.Path(self.tmp.name) / "pool"
+        self.store = PuzzleStore(self.folder)
+
+    def tearDown(self):
+        self.tmp.cleanup()
+
+    def add_generated(self, side, seed, difficulty="unrated"):
+        trees, tents, _ = generate_pair_lists(side, seed)
+        self.store.add(side, side, trees, tents, seed=seed, difficulty=difficulty)
+        return trees, tents
+
+    # ======== RECORD ========
+    def test_encode_decode_roundtrip(self):
+        """encode/decode devono preservare dimensioni, seed, alberi e tende."""
+        record = encode(7, 5, 99, {(0, 0), (6, 4)}, {(1, 0), (5, 4)}, version=2)
+        self.assertEqual(len(record), HEADER.size + 8 * 2)
+        self.assertEqual(decode(record), (7, 5, 99, [(0, 0), (6, 4)], [(1, 0), (5, 4)], 2))
+
+    def test_decode_record_without_version(self):
+        """I record scritti prima della versione nel campo seed valgono come generatore 1."""
+        record = HEADER.pack(2, 1, 99, 1) + bytes([0, 0, 0, 0, 1, 0, 0, 0])
+        self.assertEqual(decode(record), (2, 1, 99, [(0, 0)], [(1, 0)], 1))
+
+    # ======== ADD / TAKE ========
+    def test_empty_store(self):
+        """Uno store nuovo non crea file e non ha puzzle."""
+        self.assertEqual(self.store.count(), 0)
+        self.assertIsNone(self.store.take(8, 8))
+        self.assertFalse(self.folder.exists())
+
+    def test_add_then_take_returns_same_board(self):
+        """take deve ridare la board aggiunta, come Game, e toglierla dal pool."""
+        trees, tents = self.add_generated(8, 1)
+        self.assertEqual(self.store.count(8, 8), 1)
+
+        game = self.store.take(8, 8, debug_checks=True)
+
+        self.assertIsInstance(game, Game)
+        self.assertEqual((game.seed, game.generator_version), (1, GENERATOR_VERSION))
+        self.assertEqual(game.trees, set(trees))
+        self.assertEqual(game.correct_tents, set(tents))
+        self.assertTrue(game.debug_checks)
+        self.assertEqual(self.store.count(), 0)
+        self.assertIsNone(self.store.take(8, 8))
+
+    def test_add_rejects_invalid_board(self):
+        """Un puzzle che non rispetta i vincoli non deve entrare nel pool."""
+        with self.assertRaises(ValueError):
+            self.store.add(4, 4, [(0, 0)], [(3, 3)])
+        self.assertEqual(self.store.count(), 0)
+
+    def test_buckets_by_size_and_difficulty(self):
+        """I puzzle sono divisi per dimensione e difficoltà."""
+        self.add_generated(8, 1, "easy")
+        self.add_generated(8, 2, "hard")
+        self.add_generated(9, 3)
+
+        self.assertEqual(self.store.buckets, {"8x8:easy": 1, "8x8:hard": 1, "9x9:unrated": 1})
+        self.assertEqual(self.store.count(8, 8), 2)
+        self.assertEqual(self.store.count(difficulty="hard"), 1)
+        self.assertIsNone(self.store.take(9, 9, difficulty="easy"))
+        self.assertIsNotNone(self.store.take(8, 8, difficulty="hard"))
+        self.assertEqual(self.store.count(8, 8), 1)
+
+    # ======== PERSISTENZA ========
+    def test_survives_reopen(self):
+        """Il pool deve essere ancora lì riaprendo la cartella, senza i puzzle già presi."""
+        self.add_generated(8, 1)
+        trees, _ = self.add_generated(8, 2)
+        first = self.store.take_record(8, 8)
+
+        reopened = PuzzleStore(self.folder)
+
+        self.assertEqual(reopened.count(), 1)
+        self.assertNotEqual(reopened.take_record(8, 8)[3], first[3])
+
+    def test_take_appends_to_log_without_rewriting_index(self):
+        """take scrive solo l'offset nel log dei consumi; close porta le take nell'indice e svuota il log."""
+        for seed in range(3):
+            self.add_generated(8, seed)
+        index = self.store.index_path.read_bytes()
+
+        self.store.take_record(8, 8)
+        self.store.take_record(8, 8)
+
+        self.assertEqual(self.store.index_path.read_bytes(), index)
+        self.assertEqual(self.store.used_path.stat().st_size, 2 * USED.size)
+        self.assertEqual(PuzzleStore(self.folder).count(), 1)
+
+        self.store.close()
+        self.assertFalse(self.store.used_path.exists())
+        self.assertNotEqual(self.store.index_path.read_bytes(), index)
+        self.assertEqual(PuzzleStore(self.folder).count(), 1)
+
+    def test_partial_log_entry_is_ignored(self):
+        """Un offset scritto a metà nel log (crash durante la take) non toglie nessun puzzle."""
+        self.add_generated(8, 1)
+        self.store.used_path.write_bytes(b"\x05\x00")
+
+        self.assertEqual(PuzzleStore(self.folder).count(), 1)
+
+    def test_recovers_records_written_after_index(self):
+        """Un record completo scritto dopo l'ultimo indice (crash prima della riscrittura) viene recuperato."""
+        self.add_generated(8, 1)
+        trees, tents, _ = generate_pair_lists(9, 5)
+        with open(self.store.data_path, "ab") as file:
+            file.write(encode(9, 9, 5, trees, tents))
+
+        reopened = PuzzleStore(self.folder)
+
+        self.assertEqual(reopened.count(9, 9), 1)
+        self.assertEqual(reopened.take_record(9, 9)[2], 5)
+
+    def test_truncates_partial_record(self):
+        """Un record scritto a metà viene tagliato via senza perdere quelli completi."""
+        self.add_generated(8, 1)
+        size = self.store.data_path.stat().st_size
+        trees, tents, _ = generate_pair_lists(9, 5)
+        with open(self.store.data_path, "ab") as file:
+            file.write(encode(9, 9, 5, trees, tents)[:-3])
+
+        reopened = PuzzleStore(self.folder)
+
+        self.assertEqual(reopened.count(), 1)
+        self.assertEqual(reopened.data_path.stat().st_size, size)
+
+    def test_rejects_foreign_data_file(self):
+        """Un file dati che non è un pool deve dare errore invece di essere interpretato."""
+        self.folder.mkdir(parents=True)
+        (self.folder / "puzzles.bin").write_bytes(b"not a pool file")
+        with self.assertRaises(ValueError):
+            PuzzleStore(self.folder)
+
+    def test_compact_drops_used_records(self):
+        """compact deve togliere i record usati, mantenendo leggibili quelli rimasti."""
+        for seed in range(4):
+            self.add_generated(8, seed)
+        for _ in range(3):
+            self.store.take(8, 8)
+        old_path = self.store.data_path
+
+        old_used = self.store.used_path
+
+        self.store.compact()
+
+        self.assertFalse(old_path.exists())
+        self.assertFalse(old_used.exists())
+        self.assertEqual(self.store.data_path.stat().st_size, len(MAGIC) + len(encode(8, 8, 0, *generate_pair_lists(8, 0)[:2])))
+        reopened = PuzzleStore(self.folder)
+        self.assertEqual(reopened.count(), 1)
+        self.assertEqual(reopened.take_record(8, 8)[2], 0)
+
+    # ======== BATCH ========
+    def test_fill_adds_count_per_side(self):
+        """fill deve generare count puzzle per lato e salvarli tutti."""
+        added = fill(self.store, range(5, 7), count=2, workers=1, seed=3)
+
+        self.assertEqual(added, 4)
+        self.assertEqual(self.store.count(5, 5), 2)
+        self.assertEqual(self.store.count(6, 6), 2)
+
+    def test_fill_rated_uses_difficulty_buckets(self):
+        """fill con rated=True deve mettere ogni puzzle nel bucket della difficoltà data dal rater."""
+        added = fill(self.store, [5], count=3, workers=1, seed=3, rated=True)
+
+        self.assertEqual(added, 3)
+        self.assertEqual(self.store.count(5, 5, UNRATED), 0)
+        self.assertEqual(sum(self.store.count(5, 5, label) for label in ("easy", "medium", "hard", "expert")), 3)
+
+
+if __name__ == "__main__":
+    unittest.main()
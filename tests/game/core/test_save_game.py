@@ -0,0 +1,134 @@
+import pathlib
+import tempfile
+import time
+import unittest
+
+from src.game.core.game import Game
+from src.game.core.level import Level
+from src.game.core.puzzle_id import PuzzleId
+from src.game.core.save_game import SaveWriter, Snapshot, decode, encode, restore
+from src.game.state import Action
+
+
+class SaveGameTest(unittest.TestCase):
+    def setUp(self):
+        self.tmp = tempfile.TemporaryDirectory()
+        self.folder = pathlib.Path(self.tmp.name)
+
+        self.puzzle_id = PuzzleId.parse("2-9x7-1Q2W3E")
+        self.game = self.puzzle_id.generate()
+
+    def tearDown(self):
+        self.tmp.cleanup()
+
+    def play_some(self, game: Game) -> None:
+        """Qualche mossa: click su celle libere, poi prato automatico."""
+        free = [(x, y) for y in range(game.lines) for x in range(game.columns) if (x, y) not in game.trees]
+        for x, y in free[:5]:
+            game.play(x, y, None)
+        game.play(*free[5], None)
+        game.play(*free[5], None)
+        game.play(0, 0, Action.PLACE_GRASS)
+
+    # ======== ENCODING ========
+    def test_round_trip_puzzle_id(self):
+        """Tende, prato e journal di una board generata devono tornare identici dopo encode/decode/restore."""
+        self.play_some(self.game)
+
+        snapshot = decode(encode(self.game, self.puzzle_id))
+        self.assertEqual(snapshot.source, self.puzzle_id)
+
+        game, source = restore(snapshot)
+        self.assertEqual(source, self.puzzle_id)
+        self.assertEqual(game.trees, self.game.trees)
+        self.assertEqual(game.tents, self.game.tents)
+        self.assertEqual(game.grass, self.game.grass)
+        self.assertEqual(game.journal, self.game.journal)
+
+    def test_round_trip_level(self):
+        """Con un Level lo snapshot ricarica il file e rimette le mosse."""
+        level = Level.from_game(self.game, self.folder / "a.txt")
+        level.save()
+        game = Game.init_from_level(level)
+        self.play_some(game)
+
+        restored, source = restore(decode(encode(game, level)))
+
+        self.assertEqual(source, level)
+        self.assertEqual((restored.tents, restored.grass), (game.tents, game.grass))
+
+    def test_level_changed_on_disk_is_refused(self):
+        """Se il file del livello è cambiato dopo il salvataggio, restore deve rifiutare lo snapshot."""
+        level = Level.from_game(self.game, self.folder / "a.txt")
+        level.save()
+        data = encode(Game.init_from_level(level), level)
+
+        other = PuzzleId.parse("2-9x7-ZZZZ").generate()
+        Level.from_game(other, self.folder / "a.txt").save()
+
+        with self.assertRaises(ValueError):
+            restore(decode(data))
+
+    def test_snapshot_is_compact(self):
+        """Gli strati occupano un bit per cella: una board 100x100 sta in pochi KB."""
+        game = Game(columns=100, rows=100, trees={(0, 0)}, tents={(1, 0)})
+        game.tents = {(x, y) for x in range(0, 100, 2) for y in range(0, 100, 2)}
+
+        self.assertLess(len(encode(game, PuzzleId(2, 100, 100, 1))), 2 * 10_000 // 8 + 64)
+
+    def test_damaged_data_is_refused(self):
+        """Dati che non sono un salvataggio (o troncati) devono dare ValueError."""
+        data = encode(self.game, self.puzzle_id)
+        for bad in (b"", b"nope", data[:4] + b"\x09" + data[5:], data[:-3]):
+            with self.assertRaises(ValueError):
+                decode(bad)
+
+    def test_resume_100x100_is_fast(self):
+        """Il resume di una partita 100x100 (con migliaia di mosse) deve richiedere pochi millisecondi."""
+        level = Level(self.folder / "big.txt", 100, 100, [0] * 100, [0] * 100, trees={(x, 0) for x in range(0, 100, 2)})
+        level.save()
+        game = Game.init_from_level(level)
+        game.grass = {(x, y) for x in range(100) for y in range(1, 100) if (x + y) % 3}
+        game.journal = [(x, y, None) for x, y in sorted(game.grass)]
+        data = encode(game, level)
+
+        start = time.perf_counter()
+        restored, _ = restore(decode(data))
+        elapsed = time.perf_counter() - start
+
+        self.assertEqual(restored.grass, game.grass)
+        self.assertEqual(len(restored.journal), len(game.journal))
+        self.assertLess(elapsed, 0.25)
+
+    # ======== WRITER ========
+    def test_writer_saves_loads_and_discards(self):
+        """SaveWriter deve scrivere in background, rileggere lo snapshot e cancellarlo con discard."""
+        writer = SaveWriter(self.folder / "saves" / "current.sav")
+        self.assertFalse(writer.exists)
+        self.assertIsNone(writer.load())
+
+        writer.save(self.game, self.puzzle_id)
+        self.assertTrue(writer.exists)
+        self.assertIsInstance(writer.load(), Snapshot)
+        self.assertFalse(writer.path.with_suffix(".sav.tmp").exists())
+
+        writer.discard()
+        self.assertFalse(writer.exists)
+        writer.close()
+        self.assertFalse(writer.path.exists())
+
+    def test_writer_keeps_the_latest_snapshot(self):
+        """Con tanti salvataggi in fila deve restare l'ultimo."""
+        writer = SaveWriter(self.folder / "current.sav")
+        for i in range(20):
+            writer.submit(encode(self.game, self.puzzle_id) if i < 19 else b"last")
+        writer.close()
+
+        self.assertEqual(writer.path.read_bytes(), b"last")
+        self.assertLessEqual(writer.written, 20)
+        with self.assertRaises(RuntimeError):
+            writer.submit(b"closed")
+
+
+if __name__ == "__main__":
+    unittest.main()
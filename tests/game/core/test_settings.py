@@ -0,0 +1,129 @@
+import dataclasses
+import json
+import os
+import pathlib
+import tempfile
+import unittest
+from unittest.mock import Mock, patch
+
+import src.game.core.settings as settings_module
+from src.game.core.settings import Settings, get_settings, poll_settings, reload_settings, subscribe
+
+
+class SettingsTest(unittest.TestCase):
+    def setUp(self):
+        self.tmp = tempfile.TemporaryDirectory()
+        self.path = pathlib.Path(self.tmp.name) / "settings.json"
+        self.write({"fps": 40, "board_game_gui": {"board": {"height%": 0.9}}})
+
+        # -> lo stato globale del modulo viene rimesso com'era alla fine di ogni test
+        self.saved = (settings_module._current, settings_module._mtime, settings_module._last_poll,
+                      list(settings_module._subscribers))
+        # -> niente subscriber veri (tema, App) durante i test di reload
+        settings_module._subscribers[:] = []
+
+    def tearDown(self):
+        (settings_module._current, settings_module._mtime, settings_module._last_poll,
+         settings_module._subscribers[:]) = self.saved
+        self.tmp.cleanup()
+
+    def write(self, data: dict, mtime: int | None = None) -> None:
+        self.path.write_text(json.dumps(data), encoding="utf-8")
+        if mtime is not None:
+            os.utime(self.path, ns=(mtime, mtime))
+
+    # ======== PARSING ========
+    def test_from_dict_applies_defaults_and_types(self):
+        """I campi mancanti prendono i default, i colori diventano tuple, "height%" finisce in height_ratio."""
+        settings = Settings.from_dict({"fps": 40, "board_game_gui": {"background_color": [1, 2, 3],
+                                                                      "board": {"height%": 0.9}}})
+
+        self.assertEqual(settings.fps, 40)
+        self.assertEqual(settings.size, 430)
+        self.assertEqual(settings.board_game_gui.background_color, (1, 2, 3))
+        self.assertEqual(settings.board_game_gui.board.height_ratio, 0.9)
+        self.assertEqual(settings.board_game_gui.stats.text_color, (248, 248, 248))
+        self.assertFalse(settings.generator_pool.enabled)
+
+    def test_settings_are_immutable(self):
+        """Settings e le sue sezioni sono in sola lettura, anche il JSON in sections."""
+        settings = Settings.from_dict({"TENT": {"text": "T"}})
+
+        with self.assertRaises(dataclasses.FrozenInstanceError):
+            settings.fps = 1  # type: ignore
+        with self.assertRaises(TypeError):
+            settings.sections["TENT"]["text"] = "X"  # type: ignore
+        self.assertFalse(hasattr(settings, "__dict__"))
+
+    def test_bundled_settings_parse(self):
+        """Il settings.json del gioco deve diventare un Settings valido."""
+        settings = settings_module.load_settings()
+        self.assertGreater(settings.size, 0)
+        self.assertIn("TENT", settings.sections)
+
+    # ======== CACHE E RELOAD ========
+    def test_get_settings_reads_the_file_once(self):
+        """get_settings legge il file solo la prima volta."""
+        settings_module._current = None
+        with patch.object(settings_module, "read_settings", return_value={"fps": 12}) as mock_read:
+            first = get_settings()
+            second = get_settings()
+
+        mock_read.assert_called_once()
+        self.assertIs(first, second)
+        self.assertEqual(first.fps, 12)
+
+    def test_reload_only_when_mtime_changes(self):
+        """reload_settings rilegge solo se la data di modifica è cambiata, e avvisa i subscriber."""
+        callback = Mock()
+        unsubscribe = subscribe(callback)
+        settings_module.load_settings(self.path)
+
+        self.assertFalse(reload_settings(self.path))
+        callback.assert_not_called()
+
+        self.write({"fps": 50}, mtime=os.stat(self.path).st_mtime_ns + 1_000_000_000)
+        self.assertTrue(reload_settings(self.path))
+        callback.assert_called_once_with(get_settings())
+        self.assertEqual(get_settings().fps, 50)
+
+        unsubscribe()
+        self.assertTrue(reload_settings(self.path, force=True))
+        callback.assert_called_once()
+
+    def test_reload_keeps_settings_on_broken_file(self):
+        """Un settings.json non valido (salvato a metà) non rimette i default: restano le impostazioni correnti."""
+        callback = Mock()
+        subscribe(callback)
+        current = settings_module.load_settings(self.path)
+        mtime = os.stat(self.path).st_mtime_ns
+
+        with patch("builtins.print") as mock_print:
+            self.path.write_text('{"fps": 50, "board_game_gui": {', encoding="utf-8")
+            os.utime(self.path, ns=(mtime + 1_000_000_000,) * 2)
+            self.assertFalse(reload_settings(self.path))
+            self.path.unlink()
+            self.assertFalse(reload_settings(self.path, force=True))
+
+        self.assertIs(get_settings(), current)
+        self.assertEqual(get_settings().fps, 40)
+        callback.assert_not_called()
+        self.assertEqual(mock_print.call_count, 2)
+
+        self.write({"fps": 50}, mtime=mtime + 2_000_000_000)
+        self.assertTrue(reload_settings(self.path))
+        self.assertEqual(get_settings().fps, 50)
+
+    def test_poll_is_throttled(self):
+        """poll_settings controlla il file al massimo una volta per intervallo."""
+        settings_module.load_settings(self.path)
+        with patch.object(settings_module, "reload_settings", return_value=False) as mock_reload:
+            settings_module._last_poll = float("-inf")
+            poll_settings(interval=60, path=self.path)
+            poll_settings(interval=60, path=self.path)
+
+        mock_reload.assert_called_once_with(self.path)
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,98 @@
+import json
+import pathlib
+import sys
+import tempfile
+import unittest
+
+from src.game.core import startup_profile
+from src.game.core.startup_profile import StartupProfile, span
+
+
+class StartupProfileTest(unittest.TestCase):
+    def setUp(self):
+        self.tmp = tempfile.TemporaryDirectory()
+        self.folder = pathlib.Path(self.tmp.name)
+        sys.path.insert(0, self.tmp.name)
+
+    def tearDown(self):
+        sys.path.remove(self.tmp.name)
+        for name in ("tt_outer_mod", "tt_inner_mod"):
+            sys.modules.pop(name, None)
+        startup_profile.stop()
+        self.tmp.cleanup()
+
+    # ======== IMPORTS ========
+    def test_imports_are_timed_with_nesting(self):
+        """Ogni modulo nuovo ha tempo self e cumulativo; quello importato da un altro sta un livello più in basso."""
+        (self.folder / "tt_inner_mod.py").write_text("VALUE = sum(range(1000))\n", encoding="utf-8")
+        (self.folder / "tt_outer_mod.py").write_text("import tt_inner_mod\n", encoding="utf-8")
+
+        profile = StartupProfile()
+        profile.install()
+        try:
+            import tt_outer_mod  # noqa: F401
+        finally:
+            profile.uninstall()
+
+        entries = {entry["module"]: entry for entry in profile.imports}
+        outer, inner = entries["tt_outer_mod"], entries["tt_inner_mod"]
+        self.assertEqual(inner["depth"], outer["depth"] + 1)
+        self.assertGreaterEqual(outer["cumulative_ms"], inner["cumulative_ms"])
+        self.assertLessEqual(outer["self_ms"], outer["cumulative_ms"])
+        self.assertEqual(sys.modules["tt_inner_mod"].VALUE, 499500)
+        self.assertNotIn(profile._timer, sys.meta_path)
+
+    def test_failed_import_is_recorded(self):
+        """Un modulo che solleva durante l'import resta nel profilo, segnato come fallito."""
+        (self.folder / "tt_outer_mod.py").write_text("raise RuntimeError('boom')\n", encoding="utf-8")
+
+        profile = StartupProfile()
+        profile.install()
+        try:
+            with self.assertRaises(RuntimeError):
+                import tt_outer_mod  # noqa: F401
+        finally:
+            profile.uninstall()
+
+        self.assertTrue(profile.imports[-1]["failed"])
+
+    # ======== SPANS E REPORT ========
+    def test_span_is_a_no_op_without_profile(self):
+        """Senza profilo attivo span() non registra niente."""
+        startup_profile.stop()
+        with span("settings"):
+            pass
+        self.assertIsNone(startup_profile.PROFILE)
+
+    def test_report_and_json(self):
+        """Il report ordina le fasi per durata; il JSON contiene fasi, import e totali."""
+        ticks = iter([0.0, 1.0, 1.5, 2.0, 4.0, 5.0, 5.0, 5.0])
+        profile = StartupProfile(clock=lambda: next(ticks))
+        with profile.span("settings"):
+            pass
+        with profile.span("canvas"):
+            pass
+
+        report = profile.report()
+        self.assertLess(report.index("canvas"), report.index("settings"))
+
+        data = json.loads(profile.write(self.folder / "profile.json").read_text(encoding="utf-8"))
+        self.assertEqual([s["name"] for s in data["spans"]], ["settings", "canvas"])
+        self.assertEqual(data["spans"][1], {"name": "canvas", "start_ms": 2000.0, "ms": 2000.0})
+        self.assertEqual(data["total_ms"], 5000.0)
+        self.assertEqual(data["imports"], [])
+
+    def test_start_installs_once(self):
+        """start() crea un solo profilo; stop() lo toglie insieme al finder degli import."""
+        profile = startup_profile.start()
+        timer = profile._timer
+        self.assertIs(startup_profile.start(), profile)
+        self.assertEqual(sum(1 for finder in sys.meta_path if finder is timer), 1)
+
+        self.assertIs(startup_profile.stop(), profile)
+        self.assertIsNone(startup_profile.PROFILE)
+        self.assertNotIn(timer, sys.meta_path)
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -2,6 +2,9 @@ import unittest
 from unittest.mock import Mock, patch
 
 from src.game.gui.board import Board
+from src.game.gui.cell_grid import CellGrid
+from src.game.gui.viewport import Viewport
+from src.game.state.cell_state import CellState
 
 
 class BoardTest(unittest.TestCase):
@@ -29,11 +32,11 @@ class BoardTest(unittest.TestCase):
         self.assertIs(c1, c2)
 
     def test_cells_count_is_expected(self):
-        """Con cols=2, rows=2: griglia (3x3)"""
+        """Con cols=2, rows=2: solo angolo + 2 target di colonna + 2 target di riga."""
         with patch("src.game.gui.board.Cell") as CellMock:
             cells = self.board.cells
 
-        self.assertEqual(len(cells), 9)
+        self.assertEqual(len(cells), 5)
 
     def test_cells_targets_have_text(self):
         """Prima riga/colonna devono creare celle con testo dei target."""
@@ -47,51 +50,206 @@ class BoardTest(unittest.TestCase):
             self.assertIn("1", texts)
             self.assertIn("0", texts)
 
-    def test_grid_cell_command_calls_master_play(self):
-        """Una cella interna deve avere command che chiama master.play(x, y, None)."""
-        with patch("src.game.gui.board.Cell") as CellMock:
-            _ = self.board.cells
+    def test_grid_is_compact_and_built_once(self):
+        """Le celle di gioco non sono oggetti Cell ma una CellGrid, costruita una sola volta."""
+        grid = self.board.grid
+
+        self.assertIs(grid, self.board.grid)
+        self.assertIsInstance(grid, CellGrid)
+        self.assertEqual(len(grid), 4)
+        self.assertEqual(grid.xs[0], self.board.cell_xy(1, 0)[0])
+        self.assertEqual(grid.ys[1], self.board.cell_xy(0, 2)[1])
+
+    def test_cell_returns_view_or_chrome_cell(self):
+        """cell(x, y) ritorna una CellView per le celle di gioco e la Cell per angolo/target."""
+        chrome = [Mock() for _ in range(5)]
+        self.board._cells = chrome
 
-            # -> cerco una call di griglia: text=None e ha command
-            grid_kwargs = None
-            for args, kwargs in CellMock.call_args_list:
-                if kwargs.get("text") is None and kwargs.get("command") is not None:
-                    grid_kwargs = kwargs
-                    break
+        self.assertEqual(self.board.cell(1, 0).board_pos, (1, 0))
+        self.assertIs(self.board.cell(-1, -1), chrome[0])
+        self.assertIs(self.board.cell(1, -1), chrome[2])
+        self.assertIs(self.board.cell(-1, 0), chrome[3])
 
-            self.assertIsNotNone(grid_kwargs)
+    def test_grid_cell_click_calls_master_play(self):
+        """Il click su una cella di gioco deve chiamare master.play(x, y, None)."""
+        self.board._cells = [Mock() for _ in range(5)]
 
-            # -> eseguo il comando e verifico che chiami play(..., None)
-            cmd = grid_kwargs["command"]
-            cmd()
+        # -> cella (1, 1) della griglia disegnata = cella (0, 0) della board
+        self.board.tick(keys=["LeftButton"], cursor_pos=(50, 50))
 
-        self.master.play.assert_called()
-        args = self.master.play.call_args[0]
-        self.assertEqual(args[2], None)
+        self.master.play.assert_called_once_with(0, 0, None)
+        self.assertTrue(self.board.cell(0, 0).pressed)
 
     def test_render_info_collects_all_cells(self):
-        """render_info deve unire render_info() di tutte le celle."""
-        # -> evito di dipendere dal vero Cell: imposto _cells a mano
+        """render_info deve unire render_info() delle celle di contorno e il disegno della griglia."""
         c1 = Mock()
         c1.render_info.return_value = [{"type": "rect"}]
         c2 = Mock()
         c2.render_info.return_value = [{"type": "text"}]
         self.board._cells = [c1, c2]
+        self.master.get_cell_state.return_value = CellState.EMPTY
+        self.master.version = 0
 
         out = self.board.render_info()
 
-        self.assertEqual(out, [{"type": "rect"}, {"type": "text"}])
+        self.assertEqual(out[:2], [{"type": "rect"}, {"type": "text"}])
+        # -> 4 celle di gioco, rect + text ciascuna
+        self.assertEqual(len(out), 2 + 4 * 2)
 
-    def test_tick_propagates_to_all_cells(self):
-        """tick deve chiamare tick(keys, cursor_pos) su ogni cella."""
-        c1 = Mock()
-        c2 = Mock()
-        self.board._cells = [c1, c2]
+    def test_render_info_redraws_only_changed_grid_cells(self):
+        """A game invariato vengono ridisegnate solo le celle di gioco che cambiano hover."""
+        self.board._cells = []
+        self.master.get_cell_state.return_value = CellState.EMPTY
+        self.master.version = 0
+
+        self.board.render_info()
+        self.assertEqual(self.board.render_info(), [])
+
+        self.board.tick(keys=[], cursor_pos=(50, 50))
+        out = self.board.render_info()
+
+        self.assertEqual(len(out), 2)
+        self.assertEqual(out[0]["pos"], (self.board.grid.xs[0], self.board.grid.ys[0]))
+
+    def test_render_info_rescans_grid_on_version_change(self):
+        """Quando cambia master.version tutte le celle di gioco vengono ricontrollate."""
+        self.board._cells = []
+        self.master.get_cell_state.return_value = CellState.EMPTY
+        self.master.version = 0
+        self.board.render_info()
+
+        self.master.get_cell_state.side_effect = lambda x, y: CellState.TENT if (x, y) == (1, 1) else CellState.EMPTY
+        self.master.version = 1
+        out = self.board.render_info()
+
+        self.assertEqual(len(out), 2)
+        self.assertEqual(out[0]["pos"], (self.board.grid.xs[1], self.board.grid.ys[1]))
+
+    def test_cell_index_at_uses_grid_geometry(self):
+        """cell_index_at deve trovare la cella sotto il cursore solo con la geometria della griglia."""
+        # -> griglia 3x3, cella ~31.3px + padding 2px
+        self.assertEqual(self.board.cell_index_at((10, 10)), 0)
+        self.assertEqual(self.board.cell_index_at((50, 50)), 4)
+        self.assertEqual(self.board.cell_index_at((90, 10)), 2)
+        self.assertEqual(self.board.cell_index_at((10, 90)), 6)
+
+    def test_cell_index_at_outside_or_on_padding_is_none(self):
+        """Fuori dalla board o nel padding tra due celle non c'è nessuna cella."""
+        self.assertIsNone(self.board.cell_index_at((-5, 10)))
+        self.assertIsNone(self.board.cell_index_at((10, 150)))
+        self.assertIsNone(self.board.cell_index_at((32.5, 10)))
+
+    def test_tick_refreshes_all_cells_and_handles_only_hovered(self):
+        """tick deve aggiornare lo stato di tutte le celle di contorno ma gestire input solo sulla cella sotto il cursore."""
+        cells = [Mock() for _ in range(5)]
+        self.board._cells = cells
+
+        # -> (90, 10): target della colonna 1 = cells[2]
+        self.board.tick(keys=["LeftButton"], cursor_pos=(90, 10))
+
+        for cell in cells:
+            cell.refresh.assert_called_once_with()
+        cells[2].set_hovered.assert_called_once_with(True)
+        cells[2].handle_keys.assert_called_once_with(["LeftButton"])
+        for k, cell in enumerate(cells):
+            if k != 2:
+                cell.set_hovered.assert_not_called()
+                cell.handle_keys.assert_not_called()
+        self.master.play.assert_not_called()
+
+    def test_tick_clears_previous_hovered_cell(self):
+        """Quando il cursore si sposta, la cella hovered precedente deve perdere hover."""
+        cells = [Mock() for _ in range(5)]
+        self.board._cells = cells
+
+        self.board.tick(keys=["LeftButton"], cursor_pos=(50, 50))
+        self.board.tick(keys=[], cursor_pos=(10, 10))
+
+        view = self.board.cell(0, 0)
+        self.assertFalse(view.hovered)
+        self.assertFalse(view.pressed)
+        cells[0].set_hovered.assert_called_once_with(True)
+
+        self.board.tick(keys=[], cursor_pos=(10, 50))
+        cells[0].set_hovered.assert_called_with(False)
+
+    def test_tick_skips_keys_on_cell_in_cooldown(self):
+        """Una cella in cooldown (refresh -> False) non deve ricevere input."""
+        cells = [Mock() for _ in range(5)]
+        cells[2].refresh.return_value = False
+        self.board._cells = cells
+
+        self.board.tick(keys=["LeftButton"], cursor_pos=(90, 10))
+
+        cells[2].handle_keys.assert_not_called()
+
+
+class BoardViewportTest(unittest.TestCase):
+    def setUp(self):
+        # -> board 6x6, finestra 3x3: griglia disegnata 4x4 da 23px + padding 2px
+        self.master = Mock()
+        self.master.cols.return_value = 6
+        self.master.rows.return_value = 6
+        self.master.columns_targets = [0, 1, 2, 3, 4, 5]
+        self.master.rows_targets = [5, 4, 3, 2, 1, 0]
+        self.master.get_cell_state.return_value = CellState.EMPTY
+        self.master.inside.side_effect = lambda x, y: 0 <= x < 6 and 0 <= y < 6
+        self.master.version = 0
+
+        self.board = Board(
+            master=self.master,
+            x=0, y=0,
+            width=100, height=100,
+            padding=2,
+            viewport=Viewport(6, 6, visible_columns=3, visible_rows=3, min_visible=2)
+        )
+
+    def test_only_visible_cells_are_built_and_rendered(self):
+        """Vengono create e disegnate solo le celle della finestra, non tutta la board."""
+        with patch("src.game.gui.board.Cell") as CellMock:
+            cells = self.board.cells
+            out = self.board.render_info()
+
+        self.assertEqual(len(cells), 1 + 3 + 3)
+        self.assertEqual(len(self.board.grid), 9)
+        self.assertEqual(len([item for item in out if item["type"] == "rect"]), 9)
+
+    def test_pan_moves_targets_and_clicks(self):
+        """Dopo un pan target e click seguono la finestra."""
+        self.board.render_info()
+        self.board.tick(keys=["ArrowRight", "ArrowDown"], cursor_pos=(30, 30))
+
+        self.assertEqual(self.board.viewport.layout, (1, 1, 3, 3))
+        self.assertEqual(self.board.cells[1].board_pos, (1, -1))
+        self.assertEqual(self.board.cells[1].text, "1")
+        self.assertEqual(self.board.cells[4].text, "4")
+
+        self.board.tick(keys=["LeftButton"], cursor_pos=(30, 30))
+        self.master.play.assert_called_once_with(1, 1, None)
+
+        # -> tutte le celle di gioco vanno ridisegnate con le nuove posizioni
+        out = self.board.render_info()
+        grid = self.board.grid
+        grid_rects = [item for item in out if item["type"] == "rect" and item["pos"][0] >= grid.xs[0] and item["pos"][1] >= grid.ys[0]]
+        self.assertEqual(len(grid_rects), 9)
+
+    def test_zoom_rebuilds_cells_and_clears_area(self):
+        """Lo zoom cambia la dimensione delle celle: si ricostruiscono e l'area viene ripulita."""
+        old_cells = self.board.cells
+        self.board.render_info()
+
+        self.board.tick(keys=["-"], cursor_pos=(-10, -10))
+        out = self.board.render_info()
 
-        self.board.tick(keys=["LeftButton"], cursor_pos=(10, 10))
+        self.assertIsNot(self.board.cells, old_cells)
+        self.assertEqual(len(self.board.grid), 16)
+        self.assertEqual(out[0], {"type": "rect", "color": (0, 0, 0, 255), "pos": (0, 0), "size": (100, 100)})
 
-        c1.tick.assert_called_once_with(["LeftButton"], (10, 10))
-        c2.tick.assert_called_once_with(["LeftButton"], (10, 10))
+    def test_cell_outside_viewport_is_none(self):
+        """Le celle fuori dalla finestra non sono accessibili."""
+        self.assertIsNone(self.board.cell(4, 0))
+        self.assertIsNone(self.board.cell(4, -1))
+        self.assertEqual(self.board.cell(2, 2).board_pos, (2, 2))
 
 
 if __name__ == "__main__":
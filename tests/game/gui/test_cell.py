@@ -2,21 +2,23 @@ import unittest
 from unittest.mock import Mock, patch
 
 from src.game.gui.cell import Cell
+from src.game.gui.cell_style import compile_theme
+from src.game.state import CellState
 
 
 class CellTest(unittest.TestCase):
     def setUp(self):
         self.game = Mock()
-        self.game.get_cell_state.return_value = "EMPTY"
+        self.game.get_cell_state.return_value = CellState.EMPTY
         self.game.inside.return_value = True
 
     def test_init_uses_settings_text_when_text_is_none(self):
-        """Se text non è passato, lo prende da SETTINGS in base allo stato."""
+        """Se text non è passato, lo prende dal tema corrente in base allo stato."""
         fake_settings = {
             "EMPTY": {"text": ".", "background_color": (1, 2, 3), "hover_color": (4, 5, 6), "pressed_color": (7, 8, 9)}
         }
 
-        with patch("src.game.gui.cell.SETTINGS", fake_settings):
+        with patch("src.game.gui.cell_style.THEME", compile_theme(fake_settings)):
             cell = Cell(game=self.game, board_pos=(0, 0), text=None)
 
         self.assertEqual(cell.text, ".")
@@ -25,7 +27,7 @@ class CellTest(unittest.TestCase):
         """Se passo text manualmente (tipo target), non viene sovrascritto dallo stato."""
         fake_settings = {"EMPTY": {"text": "X"}}
 
-        with patch("src.game.gui.cell.SETTINGS", fake_settings):
+        with patch("src.game.gui.cell_style.THEME", compile_theme(fake_settings)):
             cell = Cell(game=self.game, board_pos=(0, 0), text="7")
 
         self.assertEqual(cell.text, "7")
@@ -56,7 +58,7 @@ class CellTest(unittest.TestCase):
             }
         }
 
-        with patch("src.game.gui.cell.SETTINGS", fake_settings):
+        with patch("src.game.gui.cell_style.THEME", compile_theme(fake_settings)):
             cell = Cell(game=self.game, board_pos=(0, 0), text=None)
 
             cell.update_hover = Mock()
@@ -72,6 +74,23 @@ class CellTest(unittest.TestCase):
         cell.update_hover.assert_called_once_with((5.0, 6.0))
         cell.handle_keys.assert_called_once_with(["LeftButton"])
 
+    def test_refresh_copies_colors_only_when_style_changes(self):
+        """Con lo stesso stile (stesso oggetto) refresh non deve riassegnare i colori."""
+        theme = compile_theme({"EMPTY": {"text": "."}, "TENT": {"text": "T", "background_color": (1, 1, 1)}})
+
+        with patch("src.game.gui.cell_style.THEME", theme):
+            cell = Cell(game=self.game, board_pos=(0, 0), text=None)
+            cell.refresh()
+            first = cell.background_color
+            cell.refresh()
+            self.assertIs(cell.background_color, first)
+
+            self.game.get_cell_state.return_value = CellState.TENT
+            cell.refresh()
+
+        self.assertEqual(cell.text, "T")
+        self.assertEqual(cell.background_color.rgba, (1, 1, 1, 255))
+
     def test_invoke_runs_command_and_sets_cooldown(self):
         """invoke deve chiamare command se enabled e impostare il cooldown."""
         cmd = Mock()
@@ -0,0 +1,71 @@
+import unittest
+
+from src.game.gui.cell_grid import CellGrid, CellView
+
+
+class CellGridTest(unittest.TestCase):
+    def setUp(self):
+        self.grid = CellGrid(columns=3, rows=2, xs=[0, 10, 20], ys=[0, 10], width=8, height=8)
+
+    def test_index_and_position_are_inverse(self):
+        """index(x, y) e position(index) devono essere una l'inversa dell'altra."""
+        for y in range(2):
+            for x in range(3):
+                self.assertEqual(self.grid.position(self.grid.index(x, y)), (x, y))
+        self.assertEqual(self.grid.index(2, 1), 5)
+
+    def test_arrays_are_one_byte_per_cell(self):
+        """hovered/pressed/drawn sono array compatti, una posizione per cella."""
+        self.assertEqual(len(self.grid), 6)
+        self.assertEqual(len(self.grid.hovered), 6)
+        self.assertEqual(len(self.grid.pressed), 6)
+        self.assertTrue(all(code == CellGrid.NOT_DRAWN for code in self.grid.drawn))
+        self.assertEqual(self.grid.nbytes, 3 * 6 + 8 * (3 + 2))
+
+    def test_wrong_coordinates_raise(self):
+        """xs/ys devono avere una coordinata per colonna/riga."""
+        with self.assertRaises(ValueError):
+            CellGrid(columns=3, rows=2, xs=[0, 10], ys=[0, 10], width=8, height=8)
+
+    def test_invalidate_forces_redraw(self):
+        """invalidate deve riportare tutte le celle a NOT_DRAWN."""
+        self.grid.drawn[3] = 7
+        self.grid.invalidate()
+        self.assertEqual(self.grid.drawn[3], CellGrid.NOT_DRAWN)
+
+    def test_draw_code_changes_with_state_hover_and_pressed(self):
+        """Il codice di disegno deve distinguere stato, hover e pressed."""
+        codes = {CellGrid.draw_code(s, h, p) for s in range(1, 6) for h in (0, 1) for p in (0, 1)}
+        self.assertEqual(len(codes), 5 * 2 * 2)
+        self.assertTrue(all(code < CellGrid.NOT_DRAWN for code in codes))
+
+
+class CellViewTest(unittest.TestCase):
+    def setUp(self):
+        self.grid = CellGrid(columns=3, rows=2, xs=[0, 10, 20], ys=[0, 10], width=8, height=8)
+
+    def test_view_reads_geometry_from_grid(self):
+        """La view non copia dati: posizione e dimensioni vengono dalla griglia."""
+        view = self.grid.view(2, 1)
+        self.assertEqual(view.board_pos, (2, 1))
+        self.assertEqual((view.x, view.y, view.width, view.height), (20, 10, 8, 8))
+
+    def test_view_writes_flags_into_grid(self):
+        """hovered/pressed della view scrivono negli array della griglia."""
+        view = self.grid.view(1, 0)
+        view.hovered = True
+        view.pressed = True
+        self.assertEqual(self.grid.hovered[1], 1)
+        self.assertEqual(self.grid.pressed[1], 1)
+        self.assertTrue(self.grid.view(1, 0).hovered)
+
+    def test_view_has_no_instance_dict(self):
+        """CellView usa __slots__: niente __dict__ per cella."""
+        view = self.grid.view(0, 0)
+        self.assertFalse(hasattr(view, "__dict__"))
+        self.assertEqual(view, CellView(self.grid, 0))
+        self.assertEqual(hash(view), hash(CellView(self.grid, 0)))
+
+
+if __name__ == "__main__":
+    unittest.main()
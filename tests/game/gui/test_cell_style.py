@@ -0,0 +1,49 @@
+import unittest
+from unittest.mock import patch
+
+from src.game.gui import cell_style
+from src.game.gui.cell_style import CellStyle, DEFAULT_STYLE, compile_theme, current_theme, set_theme
+from src.game.state import CellState
+
+
+class CellStyleTest(unittest.TestCase):
+    def setUp(self):
+        self.settings = {
+            "INDICATOR": {"correct": "ok", "incorrect": "no", "warning": "?"},
+            "TENT": {"text": "T", "background_color": [1, 2, 3], "hover_color": [4, 5, 6, 7], "pressed_color": [8, 9, 10]},
+        }
+
+    def test_compile_theme_indexes_styles_by_cell_state(self):
+        """Ogni CellState ha il suo stile, raggiungibile con un solo indice (state.value)."""
+        theme = compile_theme(self.settings)
+
+        style = theme.style(CellState.TENT)
+        self.assertIs(style, theme.styles[CellState.TENT.value])
+        self.assertEqual(style, CellStyle("T", (1, 2, 3, 255), (4, 5, 6, 7), (8, 9, 10, 255)))
+        self.assertEqual((theme.correct, theme.incorrect, theme.warning), ("ok", "no", "?"))
+
+    def test_missing_sections_use_default_style(self):
+        """Gli stati non presenti in settings usano lo stile di default."""
+        theme = compile_theme(self.settings)
+        self.assertEqual(theme.style(CellState.OUT), DEFAULT_STYLE)
+
+    def test_theme_is_immutable(self):
+        """Il tema e i suoi stili non si possono modificare: si sostituiscono."""
+        theme = compile_theme(self.settings)
+        with self.assertRaises(AttributeError):
+            theme.style(CellState.TENT).text = "X"
+        with self.assertRaises(TypeError):
+            theme.styles[0] = DEFAULT_STYLE
+
+    def test_set_theme_swaps_current_theme(self):
+        """set_theme deve sostituire il tema corrente con un'unica assegnazione."""
+        with patch.object(cell_style, "THEME", current_theme()):
+            old = current_theme()
+            new = set_theme(self.settings)
+
+            self.assertIsNot(old, new)
+            self.assertIs(current_theme(), new)
+
+
+if __name__ == "__main__":
+    unittest.main()
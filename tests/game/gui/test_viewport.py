@@ -0,0 +1,63 @@
+import unittest
+
+from src.game.gui.viewport import Viewport
+
+
+class ViewportTest(unittest.TestCase):
+    def setUp(self):
+        self.viewport = Viewport(columns=50, rows=40, visible_columns=10, visible_rows=10)
+
+    def test_default_shows_whole_board(self):
+        """Senza visible_columns/visible_rows la finestra copre tutta la board."""
+        viewport = Viewport(columns=8, rows=6)
+        self.assertEqual(viewport.layout, (0, 0, 8, 6))
+
+    def test_visible_is_clamped_to_board(self):
+        """La finestra non può essere più grande della board né più piccola di min_visible."""
+        viewport = Viewport(columns=8, rows=6, visible_columns=20, visible_rows=1, min_visible=3)
+        self.assertEqual((viewport.visible_columns, viewport.visible_rows), (8, 3))
+
+    def test_pan_moves_and_stays_inside_board(self):
+        """pan sposta la finestra ma non la fa uscire dalla board."""
+        self.assertTrue(self.viewport.pan(3, 2))
+        self.assertEqual((self.viewport.first_column, self.viewport.first_row), (3, 2))
+
+        self.viewport.pan(100, 100)
+        self.assertEqual((self.viewport.first_column, self.viewport.first_row), (40, 30))
+        self.assertFalse(self.viewport.pan(1, 1))
+
+        self.viewport.pan(-100, -100)
+        self.assertEqual((self.viewport.first_column, self.viewport.first_row), (0, 0))
+
+    def test_zoom_keeps_center(self):
+        """zoom cambia il numero di celle visibili mantenendo il centro."""
+        self.viewport.pan(20, 20)
+        self.assertTrue(self.viewport.zoom(-4))
+
+        self.assertEqual((self.viewport.visible_columns, self.viewport.visible_rows), (6, 6))
+        self.assertEqual((self.viewport.first_column, self.viewport.first_row), (22, 22))
+
+    def test_zoom_out_to_whole_board(self):
+        """Uno zoom out grande mostra tutta la board, riportando la finestra dentro i limiti."""
+        self.viewport.pan(30, 30)
+        self.viewport.zoom(100)
+        self.assertEqual(self.viewport.layout, (0, 0, 50, 40))
+        self.assertFalse(self.viewport.zoom(1))
+
+    def test_contains(self):
+        """contains dice se una cella della board è dentro la finestra."""
+        self.viewport.pan(5, 5)
+        self.assertTrue(self.viewport.contains(5, 14))
+        self.assertFalse(self.viewport.contains(4, 5))
+        self.assertFalse(self.viewport.contains(15, 5))
+
+    def test_invalid_values_raise(self):
+        """Dimensioni non intere o non positive non sono ammesse."""
+        with self.assertRaises(TypeError):
+            Viewport(columns=5.0, rows=5)
+        with self.assertRaises(ValueError):
+            Viewport(columns=0, rows=5)
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -53,9 +53,9 @@ class BoardGameGuiTest(unittest.TestCase):
         with patch("src.game.board_game_gui.g2d") as g2d:
             init_canvas(tick=tick, size=(10, 20), scale=2, fps=60)
 
-            g2d.init_canvas.assert_called_once_with(size=(10, 20), scale=2)
+            g2d.init_canvas.assert_called_once_with(size=(10, 20), scale=2, backend=None)
             g2d.clear_canvas.assert_called_once_with((0, 0, 0))
-            g2d.main_loop.assert_called_once_with(tick=tick, fps=60)
+            g2d.main_loop.assert_called_once_with(tick=tick, fps=60, busy=None, idle_wait=250)
 
     def test_close_canvas_calls_g2d(self):
         with patch("src.game.board_game_gui.g2d") as g2d:
@@ -120,6 +120,46 @@ class BoardGameGuiTest(unittest.TestCase):
             comp2.tick.assert_called_once_with(keys=["g", "x"], cursor_pos=(10, 10))
             rg.assert_called_once_with(clear_canvas_=False)
 
+    # ======== STATS ========
+    def test_gui_stats_is_built_once(self):
+        with patch("src.game.board_game_gui.clear_canvas"):
+            ui = BoardGameGui(game=self.game)
+
+        self.assertIs(ui.gui_stats, ui.gui_stats)
+
+    def test_update_stats_only_when_version_changes(self):
+        self.game.version = 1
+        with patch("src.game.board_game_gui.clear_canvas"):
+            ui = BoardGameGui(game=self.game)
+
+        _ = ui.gui_stats
+        self.assertEqual(self.game._status_mock.call_count, 1)
+
+        ui.update_stats()
+        self.assertEqual(self.game._status_mock.call_count, 1)
+
+        self.game.version = 2
+        self.game._status_mock.return_value = "CHANGED"
+        ui.update_stats()
+        self.assertEqual(self.game._status_mock.call_count, 2)
+        self.assertEqual(ui.gui_stats.text, "CHANGED")
+
+    def test_idle_after_render_without_items(self):
+        component = Mock()
+        component.render_info = Mock(return_value=[{"type": "rect"}])
+
+        with patch("src.game.board_game_gui.clear_canvas"), \
+             patch("src.game.board_game_gui.g2d"), \
+             patch.object(BoardGameGui, "gui", new_callable=PropertyMock, return_value=[component]):
+            ui = BoardGameGui(game=self.game)
+
+            ui.render_guis()
+            self.assertFalse(ui.idle)
+
+            component.render_info.return_value = []
+            ui.render_guis()
+            self.assertTrue(ui.idle)
+
     # ======== RENDERING ========
     def test_render_item_rect_and_text(self):
         with patch("src.game.board_game_gui.g2d") as g2d, patch("src.game.board_game_gui.clear_canvas"):
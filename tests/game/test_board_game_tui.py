@@ -0,0 +1,151 @@
+import unittest
+from unittest.mock import Mock, patch
+
+from src.game.board_game_tui import BoardGameTui, main
+from src.game.core.game import Game
+from src.game.state import Action
+
+
+class FakeScreen:
+    """Finestra curses finta: tiene le righe scritte e conta le chiamate ad addstr."""
+
+    def __init__(self, height: int = 12, width: int = 40, keys=()):
+        self.height, self.width = height, width
+        self.keys = list(keys)
+        self.calls = []
+
+    def getmaxyx(self):
+        return self.height, self.width
+
+    def addstr(self, y, x, text, attr=0):
+        self.calls.append((y, x, text, attr))
+
+    def erase(self):
+        pass
+
+    def refresh(self):
+        pass
+
+    def getkey(self):
+        return self.keys.pop(0)
+
+
+def make_game(size: int = 6) -> Game:
+    game = Game(size, size)
+    game.generate_board(seed=7)
+    return game
+
+
+class BoardGameTuiTest(unittest.TestCase):
+    def setUp(self):
+        self.game = make_game()
+        self.screen = FakeScreen()
+        self.tui = BoardGameTui(self.game, self.screen, cursor_attr=1)
+
+    # ======== RENDERING ========
+    def test_first_render_draws_everything_then_nothing(self):
+        """Il primo render scrive target, tutte le celle e le due righe in basso; il secondo non scrive niente."""
+        cells = self.game.cols() * self.game.rows()
+        targets = self.game.cols() + self.game.rows()
+
+        self.assertEqual(self.tui.render(), cells + targets + 2)
+        self.screen.calls.clear()
+        self.assertEqual(self.tui.render(), 0)
+        self.assertEqual(self.screen.calls, [])
+
+    def test_only_changed_cells_are_emitted(self):
+        """Dopo una mossa vengono riscritte solo la cella cambiata e la riga di stato."""
+        self.tui.render()
+        x, y = next((x, y) for y in range(self.game.rows()) for x in range(self.game.cols())
+                    if self.game.read(x, y) == "EMPTY")
+        self.tui.move_cursor(x, y)
+        self.tui.render()
+        self.screen.calls.clear()
+
+        self.tui.handle_key(" ")
+        self.assertEqual(self.game.read(x, y), "TENT")
+        self.tui.render()
+
+        written = [call for call in self.screen.calls if call[2].strip() in {".", "^", "T", ","}]
+        self.assertEqual(len(written), 1)
+        self.assertEqual(written[0][2].strip(), "^")
+        self.assertEqual(written[0][3], 1)                    # -> la cella sotto il cursore
+        self.assertEqual(len(self.screen.calls), 2)           # -> cella + stato
+
+    def test_cursor_move_redraws_two_cells_without_reading(self):
+        """Spostare il cursore riscrive solo la vecchia e la nuova cella, senza rileggere la board."""
+        self.tui.render()
+        self.screen.calls.clear()
+
+        with patch.object(self.game, "read", wraps=self.game.read) as mock_read:
+            self.tui.handle_key("KEY_RIGHT")
+            self.tui.render()
+
+        mock_read.assert_not_called()
+        cells = [call for call in self.screen.calls if call[2].strip() in {".", "^", "T", ","}]
+        self.assertEqual(len(cells), 2)
+        self.assertEqual(self.tui.cursor, (1, 0))
+
+    def test_viewport_follows_cursor_on_big_boards(self):
+        """Su una board più grande del terminale la finestra visibile segue il cursore e si leggono solo le celle visibili."""
+        game = make_game(30)
+        tui = BoardGameTui(game, FakeScreen(height=10, width=30))
+        tui.render()
+        _, _, visible_columns, visible_rows = tui.viewport.layout
+        self.assertLess(visible_columns, game.cols())
+        self.assertLess(visible_rows, game.rows())
+
+        for _ in range(visible_rows + 2):
+            tui.handle_key("j")
+        with patch.object(game, "read", wraps=game.read) as mock_read:
+            tui.render()
+
+        self.assertEqual(tui.viewport.first_row, 3)
+        self.assertEqual(mock_read.call_count, visible_columns * visible_rows)
+
+    def test_resize_forces_full_redraw(self):
+        """KEY_RESIZE rilegge la dimensione del terminale e riscrive tutto."""
+        first = self.tui.render()
+        self.screen.width = 60
+        self.tui.handle_key("KEY_RESIZE")
+        self.assertEqual(self.tui.render(), first)
+
+    # ======== INPUT ========
+    def test_action_keys_and_quit(self):
+        """t/g/a/s giocano le azioni della GUI sulla cella del cursore; q chiede di uscire."""
+        self.game.play = Mock()
+        self.tui.move_cursor(2, 3)
+
+        self.assertTrue(self.tui.handle_key("g"))
+        self.game.play.assert_called_with(2, 3, Action.PLACE_GRASS)
+        self.tui.handle_key("s")
+        self.game.play.assert_called_with(2, 3, Action.PLACE_SOLUTION)
+        self.assertFalse(self.tui.handle_key("q"))
+
+    def test_cursor_stays_inside_board(self):
+        """Il cursore non esce dalla board, nemmeno con PageDown."""
+        self.tui.render()
+        self.tui.handle_key("KEY_LEFT")
+        self.tui.handle_key("KEY_NPAGE")
+        self.tui.handle_key("KEY_NPAGE")
+        self.assertEqual(self.tui.cursor, (0, self.game.rows() - 1))
+
+    def test_run_and_main(self):
+        """run disegna e legge tasti finché non arriva q; main costruisce il game e passa run al wrapper."""
+        screen = FakeScreen(keys=["l", "t", "q"])
+        self.tui.run(screen)
+        self.assertEqual(self.tui.cursor, (1, 0))
+        self.assertEqual(screen.keys, [])
+
+        wrapper = Mock()
+        with patch("builtins.print"):
+            main(["--size", "6"], wrapper=wrapper)
+        wrapper.assert_called_once()
+
+    def test_invalid_game(self):
+        with self.assertRaises(TypeError):
+            BoardGameTui("game")  # type: ignore
+
+
+if __name__ == "__main__":
+    unittest.main()